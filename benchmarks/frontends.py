@@ -0,0 +1,173 @@
+"""
+Benchmark the CastXML and libclang front-ends.
+
+Wrappers are generated for a project with each front-end, the run times are
+reported, and the generated wrapper trees are compared. By default the
+project is `examples/cells`, which needs the PETSc, VTK and pybind11 headers
+to be passed with `--includes` e.g.
+
+python benchmarks/frontends.py --includes /usr/include/petsc /usr/include/vtk
+"""
+
+import argparse
+import filecmp
+import logging
+import os
+import tempfile
+import time
+from typing import Dict, List
+
+from cppwg import CppWrapperGenerator
+from cppwg.utils.constants import CPPWG_FRONTENDS
+
+CELLS_ROOT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "examples", "cells"
+)
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Returns
+    -------
+    argparse.Namespace
+        The parsed command line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark the cppwg C++ front-ends",
+    )
+
+    parser.add_argument(
+        "source_root",
+        type=str,
+        nargs="?",
+        default=os.path.join(CELLS_ROOT, "src", "cpp"),
+        help="Path to the root directory of the input C++ source code.",
+    )
+
+    parser.add_argument(
+        "-p",
+        "--package_info",
+        type=str,
+        default=os.path.join(CELLS_ROOT, "dynamic", "config.yaml"),
+        help="Path to the package info file.",
+    )
+
+    parser.add_argument(
+        "-i",
+        "--includes",
+        type=str,
+        nargs="*",
+        default=[],
+        help="List of paths to include directories, in addition to the source.",
+    )
+
+    parser.add_argument(
+        "-m",
+        "--castxml_compiler",
+        type=str,
+        help="Path to a compiler to be used by the front-ends.",
+    )
+
+    parser.add_argument("--std", type=str, default="c++17", help="C++ standard.")
+
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=3, help="Number of runs per front-end."
+    )
+
+    return parser.parse_args()
+
+
+def run(args: argparse.Namespace, frontend: str, wrapper_root: str) -> float:
+    """
+    Generate the wrappers once with a front-end.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The parsed command line arguments.
+    frontend : str
+        The front-end e.g. "libclang"
+    wrapper_root : str
+        The output directory for the wrappers
+
+    Returns
+    -------
+    float
+        The run time in seconds
+    """
+    source_includes = [
+        entry.path for entry in os.scandir(args.source_root) if entry.is_dir()
+    ]
+
+    start = time.perf_counter()
+    generator = CppWrapperGenerator(
+        source_root=args.source_root,
+        source_includes=source_includes + args.includes,
+        wrapper_root=wrapper_root,
+        package_info_path=args.package_info,
+        castxml_cflags=f"-std={args.std}",
+        castxml_compiler=args.castxml_compiler,
+        frontend=frontend,
+    )
+    generator.generate()
+    return time.perf_counter() - start
+
+
+def compare(left: str, right: str) -> List[str]:
+    """
+    Compare two wrapper trees.
+
+    Parameters
+    ----------
+    left : str
+        The first wrapper directory
+    right : str
+        The second wrapper directory
+
+    Returns
+    -------
+    List[str]
+        The relative paths of the files that differ or are in only one tree
+    """
+    differences = []
+
+    def walk(dircmp: filecmp.dircmp, prefix: str) -> None:
+        names = dircmp.diff_files + dircmp.left_only + dircmp.right_only
+        differences.extend(os.path.join(prefix, name) for name in names)
+        for name, sub_dircmp in dircmp.subdirs.items():
+            walk(sub_dircmp, os.path.join(prefix, name))
+
+    walk(filecmp.dircmp(left, right), "")
+    return sorted(differences)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    args = parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        wrapper_roots: Dict[str, str] = {}
+        for frontend in CPPWG_FRONTENDS:
+            wrapper_roots[frontend] = os.path.join(output_dir, frontend)
+            times = [
+                run(args, frontend, wrapper_roots[frontend]) for _ in range(args.repeat)
+            ]
+            print(
+                f"{frontend:>10}: best {min(times):.3f}s, "
+                f"mean {sum(times) / len(times):.3f}s over {len(times)} runs"
+            )
+
+        differences = compare(*wrapper_roots.values())
+        if differences:
+            print(f"{len(differences)} wrapper files differ:")
+            for path in differences:
+                print(f"  {path}")
+        else:
+            print("Generated wrappers are identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark the memory used by info objects.
+
+Info objects are created as they are for auto-discovered entities in a
+module using all classes and free functions, and the memory allocated per
+entity is reported e.g.
+
+python benchmarks/info_memory.py --entities 20000
+"""
+
+import argparse
+import gc
+import tracemalloc
+from typing import Callable, List
+
+from cppwg.info.class_info import CppClassInfo
+from cppwg.info.free_function_info import CppFreeFunctionInfo
+from cppwg.info.module_info import ModuleInfo
+from cppwg.info.package_info import PackageInfo
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Returns
+    -------
+    argparse.Namespace
+        The parsed command line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark the memory used by cppwg info objects",
+    )
+
+    parser.add_argument(
+        "-n",
+        "--entities",
+        type=int,
+        default=20000,
+        help="Number of entities of each kind to create.",
+    )
+
+    return parser.parse_args()
+
+
+def measure(create: Callable[[], List[object]]) -> int:
+    """
+    Measure the memory allocated by a function and kept alive by its result.
+
+    Parameters
+    ----------
+    create : Callable[[], List[object]]
+        The function creating the objects
+
+    Returns
+    -------
+    int
+        The number of bytes allocated
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = create()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return after - before
+
+
+def main() -> None:
+    """Run the benchmark."""
+    args = parse_args()
+
+    package_info = PackageInfo("package", {"source_root": "."})
+    module_info = ModuleInfo("module", {"use_all_classes": True})
+    package_info.add_module(module_info)
+
+    def create_classes() -> List[CppClassInfo]:
+        class_infos = []
+        for i in range(args.entities):
+            class_info = CppClassInfo(f"Class{i}")
+            class_info.update_names()
+            class_info.module_info = module_info
+            class_infos.append(class_info)
+        return class_infos
+
+    def create_free_functions() -> List[CppFreeFunctionInfo]:
+        ff_infos = []
+        for i in range(args.entities):
+            ff_info = CppFreeFunctionInfo(f"function{i}")
+            ff_info.module_info = module_info
+            ff_infos.append(ff_info)
+        return ff_infos
+
+    for kind, create in [
+        ("class", create_classes),
+        ("free function", create_free_functions),
+    ]:
+        size = measure(create)
+        print(
+            f"{kind:>14}: {size / args.entities:8.1f} bytes per entity "
+            f"({size / 2**20:.1f} MiB for {args.entities})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Benchmark generating method and constructor wrappers with a member table.
+
+A synthetic class template instantiation is built with many methods, whose
+arguments have default values that use the template parameters, and with
+exclusion settings at the package, module and class levels. The wrappers
+are generated with one member table shared by all the writers, and with a
+table built for each writer, which resolves the settings for every member
+as the writers used to e.g.
+
+python benchmarks/member_table.py --methods 2000
+"""
+
+import argparse
+import time
+from typing import Callable, List, Tuple
+
+from cppwg.info.class_info import CppClassInfo
+from cppwg.info.module_info import ModuleInfo
+from cppwg.info.package_info import PackageInfo
+from cppwg.ir.declarations import (
+    CppArgument,
+    CppClassDecl,
+    CppConstructorDecl,
+    CppLocation,
+    CppMemberFunctionDecl,
+    CppType,
+)
+from cppwg.ir.hierarchy import CppClassHierarchy
+from cppwg.templates import pybind11_default as wrapper_templates
+from cppwg.writers.constructor_writer import CppConstructorWrapperWriter
+from cppwg.writers.member_table import CppMemberTable
+from cppwg.writers.method_writer import CppMethodWrapperWriter
+
+ARG_TYPES = [
+    CppType("double", False, False, "double"),
+    CppType("unsigned int", False, False, "unsigned int"),
+    CppType("::std::string const &", False, True, "::std::string &"),
+    CppType("::Bar<2> *", True, False, "::Bar<2> *"),
+]
+
+DEFAULT_VALUES = ["(1)", "Foo::DIM_A", "DIM_B - 1", None]
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Returns
+    -------
+    argparse.Namespace
+        The parsed command line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark generating member wrappers with a member table",
+    )
+
+    parser.add_argument(
+        "-n", "--methods", type=int, default=2000, help="Number of methods."
+    )
+
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=5, help="Number of runs per measurement."
+    )
+
+    return parser.parse_args()
+
+
+def make_class(n_methods: int) -> CppClassInfo:
+    """
+    Create the info object for a synthetic class template instantiation.
+
+    Parameters
+    ----------
+    n_methods : int
+        The number of methods
+
+    Returns
+    -------
+    CppClassInfo
+        The class info, in a module and package with exclusion settings
+    """
+    location = CppLocation("Foo.hpp", 1)
+    class_decl = CppClassDecl("Foo<2,3>", location=location)
+
+    def arguments(i: int) -> Tuple[CppArgument, ...]:
+        return tuple(
+            CppArgument(
+                f"arg{j}",
+                ARG_TYPES[(i + j) % len(ARG_TYPES)],
+                DEFAULT_VALUES[(i + j) % len(DEFAULT_VALUES)],
+            )
+            for j in range(i % 4)
+        )
+
+    class_decl.member_functions = tuple(
+        CppMemberFunctionDecl(
+            f"Method{i}",
+            return_type=ARG_TYPES[i % len(ARG_TYPES)],
+            location=location,
+            parent=class_decl,
+            arguments=arguments(i),
+        )
+        for i in range(n_methods)
+    )
+
+    class_decl.constructors = tuple(
+        CppConstructorDecl(
+            "Foo", location=location, parent=class_decl, arguments=arguments(i)
+        )
+        for i in range(4)
+    )
+
+    package_info = PackageInfo(
+        "package",
+        {
+            "source_root": ".",
+            "calldef_excludes": ["::std::vector<int> const &", "int *"],
+            "return_type_excludes": ["::Baz *"],
+        },
+    )
+    module_info = ModuleInfo("module", {"calldef_excludes": ["long double"]})
+    package_info.add_module(module_info)
+
+    class_info = CppClassInfo(
+        "Foo",
+        {
+            "source_file": "Foo.hpp",
+            "excluded_methods": [f"Method{i}" for i in range(0, n_methods, 50)],
+            "constructor_arg_type_excludes": ["Qux"],
+        },
+    )
+    module_info.add_class(class_info)
+    class_info.template_params = ["DIM_A", "DIM_B"]
+    class_info.template_arg_lists = [[2, 3]]
+    class_info.decls = [class_decl]
+    class_info.cpp_names = ["Foo<2,3>"]
+    class_info.py_names = ["Foo_2_3"]
+
+    return class_info
+
+
+def generate(class_info: CppClassInfo, shared: bool) -> List[str]:
+    """
+    Generate the method and constructor wrappers of a class.
+
+    Parameters
+    ----------
+    class_info : CppClassInfo
+        The class info
+    shared : bool
+        Whether to share one member table between the writers
+
+    Returns
+    -------
+    List[str]
+        The wrapper code fragments
+    """
+    templates = wrapper_templates.template_collection
+    class_decl = class_info.decls[0]
+    class_hierarchy = CppClassHierarchy()
+    member_table = CppMemberTable(class_info, 0) if shared else None
+
+    fragments = [
+        CppConstructorWrapperWriter(
+            class_info, 0, constructor, templates, class_hierarchy, member_table
+        ).generate_wrapper()
+        for constructor in class_decl.constructors
+    ]
+    fragments.extend(
+        CppMethodWrapperWriter(
+            class_info, 0, method, templates, member_table
+        ).generate_wrapper()
+        for method in class_decl.member_functions
+    )
+    return fragments
+
+
+def best_time(run: Callable[[], object], repeat: int) -> Tuple[float, float]:
+    """
+    Time a function.
+
+    Parameters
+    ----------
+    run : Callable[[], object]
+        The function to time
+    repeat : int
+        The number of runs
+
+    Returns
+    -------
+    Tuple[float, float]
+        The best and mean times in seconds
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return min(times), sum(times) / len(times)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    args = parse_args()
+
+    class_info = make_class(args.methods)
+
+    results = {}
+    for name, shared in [("per member", False), ("shared", True)]:
+        best, mean = best_time(
+            lambda name=name, shared=shared: results.__setitem__(
+                name, generate(class_info, shared)
+            ),
+            args.repeat,
+        )
+        print(
+            f"{name:>10}: best {best * 1000:.1f}ms, mean {mean * 1000:.1f}ms "
+            f"({args.methods} methods)"
+        )
+
+    if results["per member"] == results["shared"]:
+        print("Generated wrappers are identical")
+    else:
+        print("Generated wrappers differ")
+
+
+if __name__ == "__main__":
+    main()
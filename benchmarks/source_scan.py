@@ -0,0 +1,271 @@
+"""
+Benchmark scanning C++ headers for class definitions.
+
+A synthetic set of headers is generated, and each header is scanned as it is
+for template extraction and unknown class logging: once for all classes, and
+once per class for each template signature. The single-pass lexer is
+compared with the chained regex strippers it replaced e.g.
+
+python benchmarks/source_scan.py --files 2000 --classes 10
+"""
+
+import argparse
+import os
+import re
+import tempfile
+import time
+from typing import Callable, List, Tuple
+
+from cppwg.utils.source_lexer import CppSourceIndex
+
+SIGNATURES = [
+    "<unsigned DIM>",
+    "<unsigned ELEMENT_DIM, unsigned SPACE_DIM = ELEMENT_DIM>",
+    "<typename T, int N>",
+]
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Returns
+    -------
+    argparse.Namespace
+        The parsed command line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark scanning C++ headers for class definitions",
+    )
+
+    parser.add_argument(
+        "-f", "--files", type=int, default=2000, help="Number of headers."
+    )
+
+    parser.add_argument(
+        "-c", "--classes", type=int, default=10, help="Number of classes per header."
+    )
+
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=3, help="Number of runs per scanner."
+    )
+
+    return parser.parse_args()
+
+
+def write_headers(directory: str, n_files: int, n_classes: int) -> List[str]:
+    """
+    Write synthetic headers.
+
+    Parameters
+    ----------
+    directory : str
+        The output directory
+    n_files : int
+        The number of headers
+    n_classes : int
+        The number of classes per header
+
+    Returns
+    -------
+    List[str]
+        The header paths
+    """
+    paths = []
+    for i in range(n_files):
+        lines = [
+            f"#ifndef HEADER_{i}_HPP_",
+            f"#define HEADER_{i}_HPP_",
+            "",
+            "#include <string>",
+            "#include <vector>",
+            "",
+            "/**",
+            " * A synthetic header.",
+            " */",
+            "namespace synthetic",
+            "{",
+        ]
+        for j in range(n_classes):
+            signature = SIGNATURES[j % len(SIGNATURES)]
+            lines += [
+                "",
+                f"/** Class {j} in header {i}. */",
+                f"template {signature}",
+                f"class Class{i}_{j} : public Base<{j}>",
+                "{",
+                "private:",
+                "    // The values",
+                "    std::vector<double> mValues;",
+                "",
+                "public:",
+                f"    Class{i}_{j}(double value = 1.0) : mValues(3, value)",
+                "    {",
+                "    }",
+                "",
+                "    double Sum() const; /* defined elsewhere */",
+                "",
+                "    struct Helper",
+                "    {",
+                "        int mCount;",
+                "    };",
+                "};",
+            ]
+        lines += ["", "}  // namespace synthetic", "", f"#endif // HEADER_{i}_HPP_"]
+
+        path = os.path.join(directory, f"Header{i}.hpp")
+        with open(path, "w") as header:
+            header.write("\n".join(lines) + "\n")
+        paths.append(path)
+
+    return paths
+
+
+def regex_strip(source_file_path: str) -> str:
+    """
+    Read and strip a source file with the chained regex strippers.
+
+    Parameters
+    ----------
+    source_file_path : str
+        The path to the source file
+
+    Returns
+    -------
+    str
+        The stripped source
+    """
+    with open(source_file_path, "r") as source_file:
+        source = "\n".join(line.rstrip() for line in source_file)
+
+    source = re.sub(r"//.*", "", source)
+    source = re.sub(r"/\*.*?\*/", " ", source, flags=re.DOTALL)
+    source = re.sub(r"#.*", "", source)
+    source = re.sub(r"[\r\n]", " ", source)
+    source = re.sub(r"\b\s+|\s+\b", " ", source)
+    source = re.sub(r"\B\s+|\s+\B", "", source)
+    return source
+
+
+def regex_find_classes(
+    source: str, class_name: str = None, template_signature: str = None
+) -> List[Tuple[str, str, str]]:
+    """
+    Find class definitions in stripped source with a regex built per call.
+
+    Parameters
+    ----------
+    source : str
+        The stripped source
+    class_name : str
+        The class name to search for; if None, all classes are returned.
+    template_signature : str
+        The template signature to search for.
+
+    Returns
+    -------
+    List[Tuple[str, str, str]]
+        A list of (struct/class, class_name, inheritance) tuples
+    """
+
+    def strip_whitespace(text: str) -> str:
+        text = re.sub(r"[\r\n]", " ", text)
+        text = re.sub(r"\b\s+|\s+\b", " ", text)
+        return re.sub(r"\B\s+|\s+\B", "", text)
+
+    regex = r"\b"
+    if template_signature:
+        signature = strip_whitespace(template_signature)
+        regex += r"template\s*" + re.escape(signature) + r"\s*"
+    regex += r"(class|struct)\s+"
+    if class_name:
+        regex += r"(" + re.escape(strip_whitespace(class_name)) + r")"
+    else:
+        regex += r"(\w+)"
+    regex += r"\s*(?::\s*([^{;]+))?\s*\{"
+    return re.findall(regex, source)
+
+
+def scan_regex(paths: List[str]) -> List[List[Tuple[str, str, str]]]:
+    """
+    Scan headers with the chained regex strippers.
+
+    Parameters
+    ----------
+    paths : List[str]
+        The header paths
+
+    Returns
+    -------
+    List[List[Tuple[str, str, str]]]
+        The classes found in each scan
+    """
+    results = []
+    for path in paths:
+        # Template extraction and unknown class logging each strip the file
+        for _ in range(2):
+            source = regex_strip(path)
+        classes = regex_find_classes(source)
+        results.append(classes)
+        for _, class_name, _ in classes:
+            for signature in SIGNATURES:
+                results.append(regex_find_classes(source, class_name, signature))
+    return results
+
+
+def scan_lexer(paths: List[str]) -> List[List[Tuple[str, str, str]]]:
+    """
+    Scan headers with the single-pass lexer.
+
+    Parameters
+    ----------
+    paths : List[str]
+        The header paths
+
+    Returns
+    -------
+    List[List[Tuple[str, str, str]]]
+        The classes found in each scan
+    """
+    results = []
+    for path in paths:
+        source_index = CppSourceIndex.from_file(path)
+        classes = source_index.find_classes()
+        results.append(classes)
+        for _, class_name, _ in classes:
+            for signature in SIGNATURES:
+                results.append(source_index.find_classes(class_name, signature))
+    return results
+
+
+def main() -> None:
+    """Run the benchmark."""
+    args = parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_headers(directory, args.files, args.classes)
+
+        results = {}
+        scanners: List[Tuple[str, Callable]] = [
+            ("regex", scan_regex),
+            ("lexer", scan_lexer),
+        ]
+        for name, scan in scanners:
+            times = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                results[name] = scan(paths)
+                times.append(time.perf_counter() - start)
+            print(
+                f"{name:>6}: best {min(times):.3f}s, "
+                f"mean {sum(times) / len(times):.3f}s over {len(times)} runs"
+            )
+
+        if results["regex"] == results["lexer"]:
+            print("Classes found are identical")
+        else:
+            print("Classes found differ")
+
+
+if __name__ == "__main__":
+    main()
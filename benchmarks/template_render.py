@@ -0,0 +1,142 @@
+"""
+Benchmark rendering the method and constructor wrapper templates.
+
+The default templates are rendered as strings with str.format, which parses
+the template on every call, and as compiled wrapper templates. Rendering
+throughput is reported for each, along with the time to compile and validate
+the default templates e.g.
+
+python benchmarks/template_render.py --renders 100000
+"""
+
+import argparse
+import time
+from typing import Any, Callable, Dict, Tuple
+
+from cppwg.templates import pybind11_default
+from cppwg.templates.engine import load_templates
+
+# Placeholder values for each template, as filled in by the writers
+TEMPLATE_VALUES: Dict[str, Dict[str, Any]] = {
+    "class_method": {
+        "def_adorn": "",
+        "method_name": "rGetData",
+        "return_type": "::std::vector<double> &",
+        "self_ptr": "Foo_2_2::*",
+        "arg_signature": "unsigned int, ::std::string const &",
+        "const_adorn": " const",
+        "class_py_name": "Foo_2_2",
+        "method_docs": '" "',
+        "default_args": ', py::arg("index"), py::arg("name") = "data"',
+        "call_policy": ", py::return_value_policy::reference_internal",
+    },
+    "constructor": {
+        "arg_signature": "::std::vector<double>, int",
+        "default_args": ', py::arg("data") = ::std::vector<double> {}, py::arg("n") = 1',
+    },
+}
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Returns
+    -------
+    argparse.Namespace
+        The parsed command line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark rendering the method and constructor templates",
+    )
+
+    parser.add_argument(
+        "-n",
+        "--renders",
+        type=int,
+        default=100000,
+        help="Number of renders per measurement.",
+    )
+
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=5, help="Number of runs per measurement."
+    )
+
+    return parser.parse_args()
+
+
+def best_time(run: Callable[[], object], repeat: int) -> Tuple[float, float]:
+    """
+    Time a function.
+
+    Parameters
+    ----------
+    run : Callable[[], object]
+        The function to time
+    repeat : int
+        The number of runs
+
+    Returns
+    -------
+    Tuple[float, float]
+        The best and mean times in seconds
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return min(times), sum(times) / len(times)
+
+
+def render_many(template: Any, values: Dict[str, Any], renders: int) -> None:
+    """
+    Render a template repeatedly.
+
+    Parameters
+    ----------
+    template : Any
+        The template, as a string or a compiled template
+    values : Dict[str, Any]
+        The placeholder values
+    renders : int
+        The number of renders
+    """
+    for _ in range(renders):
+        template.format(**values)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    args = parse_args()
+
+    best, _ = best_time(load_templates, args.repeat)
+    print(f"Compiled the default templates in {best * 1000:.2f}ms")
+
+    compiled_templates = load_templates()
+
+    for name, values in TEMPLATE_VALUES.items():
+        string_template = pybind11_default.template_collection[name]
+        compiled_template = compiled_templates[name]
+
+        if compiled_template.format(**values) != string_template.format(**values):
+            print(f"{name}: rendered code differs")
+
+        for kind, template in [
+            ("str.format", string_template),
+            ("compiled", compiled_template),
+        ]:
+            best, mean = best_time(
+                lambda template=template, values=values: render_many(
+                    template, values, args.renders
+                ),
+                args.repeat,
+            )
+            print(
+                f"{name:>13} {kind:>10}: {args.renders / best / 1e6:.2f}M renders/s "
+                f"(best {best * 1000:.1f}ms, mean {mean * 1000:.1f}ms)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""
+Benchmark writing the wrapper for a class with many methods.
+
+A synthetic class with overloaded, virtual and defaulted methods is built
+from compact declarations, and its wrapper is generated and written. The
+method wrapper fragments are also assembled on their own, by appending to a
+string attribute and by joining a fragment list, to show the cost of the
+intermediate copies e.g.
+
+python benchmarks/writer_strings.py --methods 2000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable, List, Tuple
+
+from cppwg.info.class_info import CppClassInfo
+from cppwg.info.module_info import ModuleInfo
+from cppwg.info.package_info import PackageInfo
+from cppwg.ir.declarations import (
+    CppArgument,
+    CppClassDecl,
+    CppConstructorDecl,
+    CppLocation,
+    CppMemberFunctionDecl,
+    CppType,
+)
+from cppwg.ir.hierarchy import CppClassHierarchy
+from cppwg.templates import pybind11_default as wrapper_templates
+from cppwg.writers.class_writer import CppClassWrapperWriter
+from cppwg.writers.method_writer import CppMethodWrapperWriter
+
+ARG_TYPES = [
+    CppType("double", False, False, "double"),
+    CppType("unsigned int", False, False, "unsigned int"),
+    CppType("::std::string const &", False, True, "::std::string &"),
+    CppType("::Bar<2> *", True, False, "::Bar<2> *"),
+]
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Returns
+    -------
+    argparse.Namespace
+        The parsed command line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark writing the wrapper for a class with many methods",
+    )
+
+    parser.add_argument(
+        "-n", "--methods", type=int, default=2000, help="Number of methods."
+    )
+
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=5, help="Number of runs per measurement."
+    )
+
+    return parser.parse_args()
+
+
+def make_class(n_methods: int) -> CppClassInfo:
+    """
+    Create the info object for a synthetic class.
+
+    Parameters
+    ----------
+    n_methods : int
+        The number of methods
+
+    Returns
+    -------
+    CppClassInfo
+        The class info, in a module and package
+    """
+    location = CppLocation("Foo.hpp", 1)
+    class_decl = CppClassDecl("Foo", location=location)
+
+    methods = []
+    for i in range(n_methods):
+        arguments = tuple(
+            CppArgument(
+                f"arg{j}",
+                ARG_TYPES[(i + j) % len(ARG_TYPES)],
+                (
+                    "1"
+                    if j == 2
+                    and ARG_TYPES[(i + j) % len(ARG_TYPES)].decl_string == "double"
+                    else None
+                ),
+            )
+            for j in range(i % 4)
+        )
+        methods.append(
+            CppMemberFunctionDecl(
+                f"Method{i // 3}",  # Overloads in threes
+                return_type=ARG_TYPES[i % len(ARG_TYPES)],
+                has_const=i % 2 == 0,
+                virtuality="virtual" if i % 10 == 0 else "not virtual",
+                location=location,
+                parent=class_decl,
+                arguments=arguments,
+            )
+        )
+    class_decl.member_functions = tuple(methods)
+
+    class_decl.constructors = tuple(
+        CppConstructorDecl(
+            "Foo",
+            location=location,
+            parent=class_decl,
+            arguments=tuple(
+                CppArgument(f"arg{j}", ARG_TYPES[j % len(ARG_TYPES)], None)
+                for j in range(i)
+            ),
+        )
+        for i in range(4)
+    )
+
+    package_info = PackageInfo("package", {"source_root": "."})
+    module_info = ModuleInfo("module")
+    package_info.add_module(module_info)
+
+    class_info = CppClassInfo("Foo", {"source_file": "Foo.hpp"})
+    module_info.add_class(class_info)
+    class_info.decls = [class_decl]
+    class_info.cpp_names = ["Foo"]
+    class_info.py_names = ["Foo"]
+
+    return class_info
+
+
+def method_fragments(class_info: CppClassInfo) -> List[str]:
+    """
+    Generate the method wrapper fragments of a class.
+
+    Parameters
+    ----------
+    class_info : CppClassInfo
+        The class info
+
+    Returns
+    -------
+    List[str]
+        The method wrapper code fragments
+    """
+    templates = wrapper_templates.template_collection
+    return [
+        CppMethodWrapperWriter(class_info, 0, method, templates).generate_wrapper()
+        for method in class_info.decls[0].member_functions
+    ]
+
+
+class AttributeAssembler:
+    """Assemble fragments by appending to a string attribute."""
+
+    def __init__(self) -> None:
+        self.cpp_string = ""
+
+    def assemble(self, fragments: List[str]) -> str:
+        """Append the fragments one at a time."""
+        self.cpp_string = ""
+        for fragment in fragments:
+            self.cpp_string += fragment
+        return self.cpp_string
+
+
+class ListAssembler:
+    """Assemble fragments by joining a fragment list."""
+
+    def __init__(self) -> None:
+        self.cpp_parts: List[str] = []
+
+    def assemble(self, fragments: List[str]) -> str:
+        """Collect the fragments and join them once."""
+        self.cpp_parts = []
+        for fragment in fragments:
+            self.cpp_parts.append(fragment)
+        return "".join(self.cpp_parts)
+
+
+def best_time(run: Callable[[], object], repeat: int) -> Tuple[float, float]:
+    """
+    Time a function.
+
+    Parameters
+    ----------
+    run : Callable[[], object]
+        The function to time
+    repeat : int
+        The number of runs
+
+    Returns
+    -------
+    Tuple[float, float]
+        The best and mean times in seconds
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return min(times), sum(times) / len(times)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    args = parse_args()
+
+    class_info = make_class(args.methods)
+    templates = wrapper_templates.template_collection
+
+    with tempfile.TemporaryDirectory() as work_dir:
+
+        def write_class() -> None:
+            # Remove the previous output so every run writes the files
+            for file_name in os.listdir(work_dir):
+                os.remove(os.path.join(work_dir, file_name))
+            class_writer = CppClassWrapperWriter(
+                class_info, templates, {}, CppClassHierarchy()
+            )
+            class_writer.write(work_dir)
+
+        best, mean = best_time(write_class, args.repeat)
+        size = sum(
+            os.path.getsize(os.path.join(work_dir, file_name))
+            for file_name in os.listdir(work_dir)
+        )
+        print(
+            f"{'writer':>10}: best {best:.3f}s, mean {mean:.3f}s "
+            f"({args.methods} methods, {size / 1024:.0f} KiB written)"
+        )
+
+    fragments = method_fragments(class_info) * 10
+    results = {}
+    for name, assembler in [
+        ("attribute", AttributeAssembler()),
+        ("list", ListAssembler()),
+    ]:
+        best, mean = best_time(
+            lambda name=name, assembler=assembler: results.__setitem__(
+                name, assembler.assemble(fragments)
+            ),
+            args.repeat,
+        )
+        print(
+            f"{name:>10}: best {best * 1000:.1f}ms, mean {mean * 1000:.1f}ms "
+            f"({len(fragments)} fragments)"
+        )
+
+    if results["attribute"] == results["list"]:
+        print("Assembled strings are identical")
+    else:
+        print("Assembled strings differ")
+
+
+if __name__ == "__main__":
+    main()
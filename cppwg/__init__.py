@@ -7,6 +7,8 @@ generators
     Contains the main interface for generating Python wrappers.
 input
     Contains information structures for C++ code to be wrapped.
+ir
+    Contains a compact representation of the C++ declarations to be wrapped.
 parsers
     Contains parsers for C++ code and input yaml.
 templates
@@ -4,6 +4,7 @@ import argparse
 import logging
 
 from cppwg import CppWrapperGenerator
+from cppwg.utils.constants import CPPWG_FRONTENDS
 from cppwg.version import __version__
 
 
@@ -38,6 +39,14 @@ def parse_args() -> argparse.Namespace:
         "-p", "--package_info", type=str, help="Path to the package info file."
     )
 
+    parser.add_argument(
+        "--frontend",
+        type=str,
+        choices=CPPWG_FRONTENDS,
+        default="castxml",
+        help="C++ front-end to parse the source code with.",
+    )
+
     parser.add_argument(
         "-c",
         "--castxml_binary",
@@ -69,6 +78,59 @@ def parse_args() -> argparse.Namespace:
         help="List of paths to include directories.",
     )
 
+    parser.add_argument(
+        "--modules",
+        type=str,
+        nargs="*",
+        help="Names of the modules to generate wrappers for; defaults to all modules.",
+    )
+
+    parser.add_argument(
+        "--template_packs",
+        type=str,
+        nargs="*",
+        help="Built-in names (e.g. 'chaste') or yaml files of wrapper templates to use.",
+    )
+
+    parser.add_argument(
+        "--cache_dir",
+        type=str,
+        help="Path to a directory for caching parsed C++ declarations.",
+    )
+
+    parser.add_argument(
+        "--cache_max_size",
+        type=int,
+        help="Maximum size of the parse cache in MB.",
+    )
+
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reparse only headers changed since the last cached parse.",
+    )
+
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of parallel processes for parsing and writing wrappers.",
+    )
+
+    parser.add_argument(
+        "--pch_includes",
+        type=str,
+        nargs="*",
+        help="List of stable includes to precompile for castxml e.g. '<vector>'.",
+    )
+
+    parser.add_argument(
+        "--restrict_to_source",
+        action="store_true",
+        help="Only load declarations from outside the source tree that are needed.",
+    )
+
     parser.add_argument(
         "-q",
         "--quiet",
@@ -120,6 +182,15 @@ def generate(args: argparse.Namespace) -> None:
         castxml_binary=args.castxml_binary,
         castxml_cflags=castxml_cflags,
         castxml_compiler=args.castxml_compiler,
+        cache_dir=args.cache_dir,
+        cache_max_size=args.cache_max_size,
+        incremental=args.incremental,
+        jobs=args.jobs,
+        pch_includes=args.pch_includes,
+        restrict_to_source=args.restrict_to_source,
+        frontend=args.frontend,
+        module_names=args.modules,
+        template_packs=args.template_packs,
     )
 
     generator.generate()
@@ -1,25 +1,34 @@
 """The main interface for generating Python wrappers."""
 
+import hashlib
 import logging
 import os
 import re
 import shutil
 import subprocess
+import tempfile
 import uuid
-from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 import pygccxml
 
 from cppwg.info.package_info import PackageInfo
+from cppwg.ir.declarations import CppDecl
+from cppwg.ir.extractor import CppDeclExtractor
+from cppwg.ir.hierarchy import CppClassHierarchy
+from cppwg.parsers.clang_parser import CppClangParser
+from cppwg.parsers.decl_index import CppDeclIndex
 from cppwg.parsers.package_info_parser import PackageInfoParser
+from cppwg.parsers.parse_cache import CppParseCache
+from cppwg.parsers.precompiled_header import CppPrecompiledHeader
 from cppwg.parsers.source_parser import CppSourceParser
-from cppwg.templates import pybind11_default as wrapper_templates
-from cppwg.utils import utils
+from cppwg.templates.engine import WrapperTemplate, load_templates
 from cppwg.utils.constants import (
     CPPWG_DEFAULT_WRAPPER_DIR,
+    CPPWG_FRONTENDS,
     CPPWG_HEADER_COLLECTION_FILENAME,
 )
+from cppwg.utils.output_manifest import OutputManifest
 from cppwg.version import __version__ as cppwg_version
 from cppwg.writers.header_collection_writer import CppHeaderCollectionWriter
 from cppwg.writers.package_writer import CppPackageWrapperWriter
@@ -37,18 +46,51 @@ class CppWrapperGenerator:
         The list of source include paths
     wrapper_root : str
         The output directory for the wrapper code
+    frontend : str
+        The C++ front-end to parse the headers with: "castxml" or "libclang"
     castxml_binary : str
         The path to the castxml binary
     castxml_cflags : str
         Optional cflags to be passed to castxml e.g. "-std=c++17"
     castxml_compiler : str
         Optional compiler path to be passed to CastXML
+    castxml_version : str
+        The version string reported by the castxml binary
+    parse_cache : Optional[CppParseCache]
+        An on-disk cache of parsed declarations, if a cache directory is set
+    incremental : bool
+        Reparse only headers changed since the last cached parse
+    jobs : int
+        The number of parallel processes to parse the headers with (CastXML
+        only) and to generate the class wrappers with
+    pch_includes : List[str]
+        Stable includes to precompile into a clang precompiled header for CastXML
+    pch_dir : str
+        The directory to keep the precompiled header in; in the parse cache
+        directory if set, or else in the system temporary directory
+    restrict_to_source : bool
+        Only load declarations from outside the source tree that are needed
     package_info_path : str
         The path to the package info yaml config file; defaults to "package_info.yaml"
+    module_names : Optional[List[str]]
+        The names of the modules to generate wrappers for; all modules if None
+    template_packs : List[str]
+        Built-in template pack names or template pack file paths, applied
+        after those set in the package info
+    wrapper_templates : Dict[str, WrapperTemplate]
+        The compiled templates for generating wrapper code
     source_ns : pygccxml.declarations.namespace_t
         The namespace containing C++ declarations parsed from the source tree
+    source_decls : List[CppDecl]
+        Compact declarations parsed from the source tree by the libclang front-end
+    decl_index : CppDeclIndex
+        An index for looking up declarations in the source namespace
+    class_hierarchy : CppClassHierarchy
+        Hierarchy data for the classes to be wrapped, shared by the writers
     package_info : PackageInfo
         A data structure containing the information parsed from package_info_path
+    output_manifest : Optional[OutputManifest]
+        The record of the wrapper files generated in the wrapper root
     """
 
     def __init__(
@@ -60,44 +102,33 @@ class CppWrapperGenerator:
         package_info_path: Optional[str] = None,
         castxml_cflags: Optional[str] = None,
         castxml_compiler: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        cache_max_size: Optional[int] = None,
+        incremental: bool = False,
+        jobs: int = 1,
+        pch_includes: Optional[List[str]] = None,
+        restrict_to_source: bool = False,
+        frontend: str = "castxml",
+        module_names: Optional[List[str]] = None,
+        template_packs: Optional[List[str]] = None,
     ):
         logger = logging.getLogger()
 
         logger.info(f"cppwg version {cppwg_version}")
 
-        # Check that castxml_binary exists and is executable
-        self.castxml_binary: str = ""
-
-        if castxml_binary:
-            if os.path.isfile(castxml_binary) and os.access(castxml_binary, os.X_OK):
-                self.castxml_binary = castxml_binary
-            else:
-                logger.warning(
-                    "Could not find specified castxml binary. Searching on path."
-                )
-
-        # Search for castxml_binary
-        if not self.castxml_binary:
-            path_to_castxml, _ = pygccxml.utils.find_xml_generator(name="castxml")
-
-            if path_to_castxml:
-                self.castxml_binary = path_to_castxml
-                logger.info(f"Found castxml binary: {self.castxml_binary}")
-            else:
-                logger.error("Could not find a castxml binary.")
-                raise FileNotFoundError()
+        # Check the front-end
+        self.frontend: str = frontend
+        if self.frontend not in CPPWG_FRONTENDS:
+            logger.error(
+                f"Unknown front-end {frontend} - expected one of {CPPWG_FRONTENDS}"
+            )
+            raise ValueError(frontend)
 
-        # Check castxml and pygccxml versions
-        castxml_version: str = (
-            subprocess.check_output([self.castxml_binary, "--version"])
-            .decode("ascii")
-            .strip()
-        )
-        castxml_version = re.search(
-            r"castxml version \d+\.\d+\.\d+", castxml_version
-        ).group(0)
-        logger.info(castxml_version)
-        logger.info(f"pygccxml version {pygccxml.__version__}")
+        self.castxml_binary: str = ""
+        self.castxml_version: str = ""
+        self.castxml_clang_version: Optional[str] = None
+        if self.frontend == "castxml":
+            self.find_castxml(castxml_binary)
 
         # Sanitize castxml_cflags
         self.castxml_cflags = "-w"
@@ -170,23 +201,108 @@ class CppWrapperGenerator:
             else:
                 logger.warning("No package info file found - using default settings.")
 
+        self.module_names: Optional[List[str]] = module_names
+
+        self.template_packs: List[str] = template_packs or []
+        self.wrapper_templates: Dict[str, WrapperTemplate] = {}
+
+        # Set up the parse cache
+        self.parse_cache: Optional[CppParseCache] = None
+        if cache_dir:
+            self.parse_cache = CppParseCache(cache_dir, cache_max_size)
+            logger.info(f"Using parse cache: {self.parse_cache.cache_dir}")
+
+        self.incremental: bool = incremental
+        if self.incremental and not self.parse_cache:
+            logger.warning("Incremental parsing needs a cache directory - ignoring.")
+            self.incremental = False
+
+        self.jobs: int = max(1, jobs or 1)
+
+        # Keep the precompiled header with the parse cache if there is one, or
+        # in a temporary directory for this wrapper root, not in the wrappers
+        self.pch_includes: List[str] = pch_includes or []
+        if self.parse_cache:
+            self.pch_dir: str = os.path.join(self.parse_cache.cache_dir, "pch")
+        else:
+            wrapper_root_key = hashlib.sha1(self.wrapper_root.encode()).hexdigest()
+            self.pch_dir = os.path.join(
+                tempfile.gettempdir(), f"cppwg_pch_{wrapper_root_key[:12]}"
+            )
+
+        self.restrict_to_source: bool = restrict_to_source
+
+        if self.frontend != "castxml" and (
+            self.parse_cache or self.pch_includes or restrict_to_source
+        ):
+            logger.info(
+                "Parse caching, --pch_includes and --restrict_to_source "
+                "only apply to the castxml front-end - ignoring."
+            )
+
         # Initialize remaining attributes
         self.source_ns: Optional[pygccxml.declarations.namespace_t] = None
+        self.source_decls: List[CppDecl] = []
+        self.decl_index: Optional[CppDeclIndex] = None
+        self.class_hierarchy: Optional[CppClassHierarchy] = None
 
         self.package_info: Optional[PackageInfo] = None
+        self.output_manifest: Optional[OutputManifest] = None
 
         self.header_collection_filepath: str = os.path.join(
             self.wrapper_root, CPPWG_HEADER_COLLECTION_FILENAME
         )
 
+    def find_castxml(self, castxml_binary: Optional[str] = None) -> None:
+        """
+        Find the castxml binary and check its version.
+
+        Parameters
+        ----------
+        castxml_binary : Optional[str]
+            The path to the castxml binary; searched for on the path if not set
+        """
+        logger = logging.getLogger()
+
+        # Check that castxml_binary exists and is executable
+        if castxml_binary:
+            if os.path.isfile(castxml_binary) and os.access(castxml_binary, os.X_OK):
+                self.castxml_binary = castxml_binary
+            else:
+                logger.warning(
+                    "Could not find specified castxml binary. Searching on path."
+                )
+
+        # Search for castxml_binary
+        if not self.castxml_binary:
+            path_to_castxml, _ = pygccxml.utils.find_xml_generator(name="castxml")
+
+            if path_to_castxml:
+                self.castxml_binary = path_to_castxml
+                logger.info(f"Found castxml binary: {self.castxml_binary}")
+            else:
+                logger.error("Could not find a castxml binary.")
+                raise FileNotFoundError()
+
+        # Check castxml and pygccxml versions
+        castxml_version: str = (
+            subprocess.check_output([self.castxml_binary, "--version"])
+            .decode("ascii")
+            .strip()
+        )
+        self.castxml_version = re.search(
+            r"castxml version \d+\.\d+\.\d+", castxml_version
+        ).group(0)
+        self.castxml_clang_version = CppPrecompiledHeader.clang_version(castxml_version)
+        logger.info(self.castxml_version)
+        logger.info(f"pygccxml version {pygccxml.__version__}")
+
     def log_unknown_classes(self) -> None:
         """
         Log unwrapped classes.
         """
         logger = logging.getLogger()
 
-        all_class_decls = self.source_ns.classes(allow_empty=True)
-
         seen_class_names = set()
         for module_info in self.package_info.module_collection:
             for class_info in module_info.class_collection:
@@ -194,11 +310,13 @@ class CppWrapperGenerator:
                 if class_info.decls:
                     seen_class_names.update(decl.name for decl in class_info.decls)
 
-        for decl in all_class_decls:
+        for decl in self.decl_index.classes:
             if decl.name in seen_class_names:
                 continue
 
-            if Path(self.source_root) not in Path(decl.location.file_name).parents:
+            if not self.package_info.path_index.contains(
+                decl.location.file_name, self.source_root
+            ):
                 continue
 
             seen_class_names.add(decl.name)  # e.g. Foo<2,2>
@@ -208,44 +326,179 @@ class CppWrapperGenerator:
             )
 
         # Check for uninstantiated class templates not parsed by pygccxml
+        source_cache = self.package_info.source_cache
         for hpp_file_path in self.package_info.source_hpp_files:
-            class_list = utils.find_classes_in_source_file(hpp_file_path)
+            class_list = source_cache.index(hpp_file_path).find_classes()
 
             for _, class_name, _ in class_list:
                 if class_name not in seen_class_names:
                     seen_class_names.add(class_name)
                     logger.info(f"Unknown class {class_name} from {hpp_file_path}")
 
+    def extract_declarations(self) -> None:
+        """
+        Replace the parsed declarations with compact declarations for the writers.
+
+        The info objects' pygccxml declarations are converted into compact
+        declarations holding only what the writers need, and the source
+        namespace and its index are released. The class hierarchy is then
+        computed once for all the writers.
+        """
+        logger = logging.getLogger()
+        logger.info("Extracting declarations for wrapping.")
+
+        extractor = CppDeclExtractor()
+        extractor.extract_package(self.package_info)
+
+        self.class_hierarchy = CppClassHierarchy()
+        self.class_hierarchy.add_package(self.package_info)
+
+        self.source_ns = None
+        self.source_decls = []
+        self.decl_index = None
+
     def parse_headers(self) -> None:
         """
         Parse the hpp files to collect C++ declarations.
 
         Parse the headers with pygccxml and castxml to populate the source
-        namespace with C++ declarations collected from the source tree.
+        namespace with C++ declarations collected from the source tree. If
+        more than one job is requested, the header collection is split into
+        shards that are parsed in parallel.
+
+        With the libclang front-end, the headers are parsed in-process into
+        compact source declarations instead.
         """
-        source_parser = CppSourceParser(
-            self.source_root,
-            self.header_collection_filepath,
-            self.castxml_binary,
-            self.source_includes,
+        logger = logging.getLogger()
+
+        if self.frontend == "libclang":
+            source_parser = CppClangParser(
+                self.source_root,
+                self.header_collection_filepath,
+                self.source_includes,
+                self.castxml_cflags,
+                self.castxml_compiler or shutil.which("c++"),
+            )
+            self.source_decls = source_parser.parse()
+            return
+
+        precompiled_header = self.build_precompiled_header()
+
+        with tempfile.TemporaryDirectory() as shard_dir:
+            shard_collections = None
+            if self.jobs > 1:
+                header_collection_writer = CppHeaderCollectionWriter(
+                    self.package_info,
+                    self.wrapper_root,
+                    self.header_collection_filepath,
+                )
+                shard_collections = header_collection_writer.write_shards(
+                    self.jobs, shard_dir
+                )
+
+            source_parser = CppSourceParser(
+                self.source_root,
+                self.header_collection_filepath,
+                self.castxml_binary,
+                self.source_includes,
+                self.castxml_cflags,
+                self.castxml_compiler,
+                castxml_version=self.castxml_version,
+                parse_cache=self.parse_cache,
+                incremental=self.incremental,
+                shard_collections=shard_collections,
+                precompiled_header=precompiled_header,
+                restrict_to_source=self.restrict_to_source,
+            )
+
+            try:
+                self.source_ns = source_parser.parse()
+            except RuntimeError:
+                if not precompiled_header:
+                    raise
+                logger.warning(
+                    "Parsing with the precompiled header failed - "
+                    "retrying without it."
+                )
+                source_parser.precompiled_header = None
+                self.source_ns = source_parser.parse()
+
+    def build_precompiled_header(self) -> Optional[str]:
+        """
+        Build a precompiled header for the stable includes, if any are set.
+
+        A previously built precompiled header is reused if none of its inputs
+        have changed.
+
+        Returns
+        -------
+        Optional[str]
+            The path to the precompiled header, or None if not available
+        """
+        logger = logging.getLogger()
+
+        if not self.pch_includes:
+            return None
+
+        # The precompiled header must be built by clang, as CastXML can't write one
+        clang_binary = self.castxml_compiler
+        if not clang_binary or "clang" not in os.path.basename(clang_binary):
+            clang_binary = shutil.which("clang++")
+
+        if not clang_binary or not self.castxml_clang_version:
+            logger.warning("Could not find clang++ - skipping precompiled header.")
+            return None
+
+        precompiled_header = CppPrecompiledHeader(
+            self.pch_includes,
+            self.pch_dir,
+            clang_binary,
             self.castxml_cflags,
-            self.castxml_compiler,
+            self.source_includes,
+            self.castxml_clang_version,
         )
-        self.source_ns = source_parser.parse()
+        return precompiled_header.build()
 
     def parse_package_info(self) -> None:
         """
         Parse the package info file to create a PackageInfo object.
+
+        All modules are kept, even with a module filter, as the header
+        collection and the parsed declarations cover the whole package. Only
+        the options needed for the header collection are resolved for the
+        modules in include files that aren't selected.
         """
+        logger = logging.getLogger()
+
         if self.package_info_path:
             # If a package info file exists, parse it to create a PackageInfo object
-            info_parser = PackageInfoParser(self.package_info_path, self.source_root)
+            info_parser = PackageInfoParser(
+                self.package_info_path,
+                self.source_root,
+                cache_dir=self.parse_cache.cache_dir if self.parse_cache else None,
+                module_names=self.module_names,
+            )
             self.package_info = info_parser.parse()
 
         else:
             # If no package info file exists, create a PackageInfo object with default settings
             self.package_info = PackageInfo("cppwg_package", self.source_root)
 
+        # Check the module filter against the package
+        if self.module_names is not None:
+            found_names = {m.name for m in self.package_info.module_collection}
+            for name in self.module_names:
+                if name not in found_names:
+                    logger.warning(f"Module {name} not found in package info.")
+
+    def load_templates(self) -> None:
+        """
+        Load and validate the wrapper templates, applying any template packs.
+        """
+        self.wrapper_templates = load_templates(
+            list(self.package_info.template_packs) + self.template_packs
+        )
+
     def write_header_collection(self) -> None:
         """
         Write the header collection to file.
@@ -254,6 +507,7 @@ class CppWrapperGenerator:
             self.package_info,
             self.wrapper_root,
             self.header_collection_filepath,
+            self.output_manifest,
         )
         header_collection_writer.write()
 
@@ -262,7 +516,13 @@ class CppWrapperGenerator:
         Write the wrapper code for the package.
         """
         package_writer = CppPackageWrapperWriter(
-            self.package_info, wrapper_templates.template_collection, self.wrapper_root
+            self.package_info,
+            self.wrapper_templates,
+            self.wrapper_root,
+            self.class_hierarchy,
+            jobs=self.jobs,
+            output_manifest=self.output_manifest,
+            module_names=self.module_names,
         )
         package_writer.write()
 
@@ -270,9 +530,19 @@ class CppWrapperGenerator:
         """
         Parse yaml configuration and C++ source to generate Python wrappers.
         """
+        logger = logging.getLogger()
+
         # Parse the input yaml for package, module, and class information
         self.parse_package_info()
 
+        # Compile the wrapper templates, checking them before parsing
+        self.load_templates()
+
+        # Only write changed files, and track the files written. With a module
+        # filter, wrappers are only written, and stale files only removed, for
+        # the filtered modules.
+        self.output_manifest = OutputManifest(self.wrapper_root, self.module_names)
+
         # Collect header files (skip wrappers), and update info
         self.package_info.init(restricted_paths=[self.wrapper_root])
 
@@ -282,11 +552,25 @@ class CppWrapperGenerator:
         # Parse the headers with pygccxml (+ castxml)
         self.parse_headers()
 
-        # Update info objects with data from the parsed source namespace
-        self.package_info.update_from_ns(self.source_ns)
+        # Index the parsed declarations for lookups
+        self.decl_index = CppDeclIndex(self.source_ns)
+        self.decl_index.add_decls(self.source_decls)
+
+        # Update info objects with data from the parsed declarations
+        self.package_info.update_from_index(self.decl_index)
 
         # Log list of unknown classes in the source root
         self.log_unknown_classes()
 
+        # Convert declarations for the writers and release the source namespace
+        self.extract_declarations()
+
+        # Resolve the configuration inherited through the info tree
+        self.package_info.resolve_config()
+
         #  Write the wrapper code for the package
         self.write_wrappers()
+
+        # Remove stale wrapper files and save the manifest
+        self.output_manifest.save()
+        logger.info(self.output_manifest.summary())
@@ -6,7 +6,28 @@ import os
 import sys
 from abc import ABC, abstractmethod
 from numbers import Number
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence
+
+from cppwg.utils.constants import CPPWG_INHERITED_CONFIG
+
+# Default name replacements, shared by all info objects
+DEFAULT_NAME_REPLACEMENTS: Mapping[str, str] = MappingProxyType(
+    {
+        "double": "Double",
+        "unsigned int": "Unsigned",
+        "Unsigned int": "Unsigned",
+        "unsigned": "Unsigned",
+        "std::vector": "Vector",
+        "std::pair": "Pair",
+        "std::map": "Map",
+        "std::string": "String",
+        "boost::shared_ptr": "SharedPtr",
+        "*": "Ptr",
+        "c_vector": "CVector",
+        "std::set": "Set",
+    }
+)
 
 
 class BaseInfo(ABC):
@@ -65,8 +86,54 @@ class BaseInfo(ABC):
 
     custom_generator_instance : cppwg_custom.Custom
         An instance of the custom generator class.
+
+    Notes
+    -----
+    Values looked up through the info tree are memoized per object in a
+    resolved configuration table. Assigning a public attribute on any info
+    object invalidates the tables of all info objects. Config values mutated
+    in place, e.g. appending to an exclusion list, are not detected, so
+    `invalidate_config` must be called after such changes.
+
+    Info objects use slots to keep large packages compact. Unset config
+    values are shared immutable defaults e.g. empty tuples, so they should
+    be replaced rather than mutated in place.
     """
 
+    __slots__ = (
+        "_gathered_config",
+        "_resolved_config",
+        "_resolved_version",
+        "arg_type_excludes",
+        "calldef_excludes",
+        "constructor_arg_type_excludes",
+        "constructor_signature_excludes",
+        "custom_generator",
+        "custom_generator_instance",
+        "excluded",
+        "excluded_methods",
+        "excluded_variables",
+        "extra_code",
+        "name",
+        "name_replacements",
+        "pointer_call_policy",
+        "prefix_code",
+        "prefix_text",
+        "reference_call_policy",
+        "return_type_excludes",
+        "smart_ptr_type",
+        "source_includes",
+        "source_root",
+        "suffix_code",
+        "template_substitutions",
+    )
+
+    # Incremented whenever the configuration of any info object changes
+    _config_version: int = 0
+
+    # Attributes rebuilt rather than pickled
+    _unpickled_attributes: FrozenSet[str] = frozenset({"custom_generator_instance"})
+
     def __init__(self, name: str, info_config: Optional[Dict[str, Any]] = None) -> None:
         """
         Create a base info object from a config dict.
@@ -78,21 +145,25 @@ class BaseInfo(ABC):
         info_config : Dict[str, Any]
             A dictionary of configuration settings
         """
+        self._resolved_version: int = -1
+        self._resolved_config: Optional[Dict[str, Any]] = None
+        self._gathered_config: Optional[Dict[str, List[Any]]] = None
+
         self.name: str = name
 
         # Paths
-        self.source_includes: List[str] = []
+        self.source_includes: Sequence[str] = ()
         self.source_root: str = ""
 
         # Exclusions
-        self.arg_type_excludes: List[str] = []
-        self.calldef_excludes: List[str] = []
-        self.constructor_arg_type_excludes: List[str] = []
-        self.constructor_signature_excludes: List[List[str]] = []
+        self.arg_type_excludes: Sequence[str] = ()
+        self.calldef_excludes: Sequence[str] = ()
+        self.constructor_arg_type_excludes: Sequence[str] = ()
+        self.constructor_signature_excludes: Sequence[List[str]] = ()
         self.excluded: bool = False
-        self.excluded_methods: List[str] = []
-        self.excluded_variables: List[str] = []
-        self.return_type_excludes: List[str] = []
+        self.excluded_methods: Sequence[str] = ()
+        self.excluded_variables: Sequence[str] = ()
+        self.return_type_excludes: Sequence[str] = ()
 
         # Pointers
         self.pointer_call_policy: str = ""
@@ -100,26 +171,14 @@ class BaseInfo(ABC):
         self.smart_ptr_type: str = ""
 
         # Substitutions
-        self.template_substitutions: Dict[str, List[Any]] = []
-        self.name_replacements: Dict[str, str] = {
-            "double": "Double",
-            "unsigned int": "Unsigned",
-            "Unsigned int": "Unsigned",
-            "unsigned": "Unsigned",
-            "std::vector": "Vector",
-            "std::pair": "Pair",
-            "std::map": "Map",
-            "std::string": "String",
-            "boost::shared_ptr": "SharedPtr",
-            "*": "Ptr",
-            "c_vector": "CVector",
-            "std::set": "Set",
-        }
+        self.template_substitutions: Sequence[Dict[str, Any]] = ()
+        self.name_replacements: Mapping[str, str] = DEFAULT_NAME_REPLACEMENTS
 
         # Custom Code
-        self.extra_code: List[str] = []
-        self.prefix_code: List[str] = []
+        self.extra_code: Sequence[str] = ()
+        self.prefix_code: Sequence[str] = ()
         self.prefix_text: str = ""
+        self.suffix_code: Sequence[str] = ()
         self.custom_generator: str = ""
 
         self.custom_generator_instance: "templates.custom.Custom" = None  # noqa: F821
@@ -152,6 +211,50 @@ class BaseInfo(ABC):
 
         self.load_custom_generator()
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        """
+        Set an attribute, invalidating resolved configuration if it is public.
+        """
+        super().__setattr__(name, value)
+        if not name.startswith("_"):
+            BaseInfo._config_version += 1
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        Get the state for pickling, leaving out the resolved configuration.
+
+        Shared defaults are stored as None, as mapping proxies can't be
+        pickled, and are restored on unpickling. Custom generators are loaded
+        from file, so they are left out and loaded again on unpickling.
+        """
+        state = {}
+        for cls in type(self).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                if name.startswith("_") or not hasattr(self, name):
+                    continue
+                if name in self._unpickled_attributes:
+                    continue
+                value = getattr(self, name)
+                if value is DEFAULT_NAME_REPLACEMENTS:
+                    value = None
+                state[name] = value
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """
+        Restore the state from pickling.
+        """
+        self._resolved_version = -1
+        self._resolved_config = None
+        self._gathered_config = None
+        self.custom_generator_instance = None
+        for name, value in state.items():
+            setattr(self, name, value)
+        if self.name_replacements is None:
+            self.name_replacements = DEFAULT_NAME_REPLACEMENTS
+
+        self.load_custom_generator()
+
     @property
     @abstractmethod
     def parent(self) -> Optional["BaseInfo"]:
@@ -194,12 +297,55 @@ class BaseInfo(ABC):
         # Instantiate the custom generator from the provided class
         self.custom_generator_instance = CustomGeneratorClass()
 
+    @staticmethod
+    def invalidate_config() -> None:
+        """
+        Invalidate the resolved configuration of all info objects.
+
+        Call this after mutating a config value in place, e.g. appending to
+        an exclusion list. Assigning attributes invalidates automatically.
+        """
+        BaseInfo._config_version += 1
+
+    def _config_tables(self) -> None:
+        """
+        Clear this object's resolved configuration tables if they are stale.
+        """
+        if self._resolved_version != BaseInfo._config_version:
+            self._resolved_config = {}
+            self._gathered_config = {}
+            self._resolved_version = BaseInfo._config_version
+
+    def resolve_config(
+        self, attribute_names: Iterable[str] = CPPWG_INHERITED_CONFIG
+    ) -> None:
+        """
+        Resolve configuration values from the info tree up front.
+
+        Parameters
+        ----------
+        attribute_names : Iterable[str]
+            The attribute names to resolve; defaults to the inherited config
+        """
+        for attribute_name in attribute_names:
+            self.hierarchy_attribute(attribute_name)
+            self.hierarchy_attribute_gather(attribute_name)
+
+    @property
+    def resolved_config(self) -> Mapping[str, Any]:
+        """
+        Returns a read-only view of the values resolved from the info tree.
+        """
+        self._config_tables()
+        return MappingProxyType(self._resolved_config)
+
     def hierarchy_attribute(self, attribute_name: str) -> Any:
         """
         Get the attribute value from this object or one further up the info tree.
 
         Ascend the info tree hierarchy searching for the attribute and return
-        the first value found for it.
+        the first value found for it. The value is memoized until the
+        configuration changes.
 
         Parameters
         ----------
@@ -211,22 +357,30 @@ class BaseInfo(ABC):
         Any
             The attribute value, or None if not found.
         """
-        value = getattr(self, attribute_name, None)
-        if value or isinstance(value, bool) or isinstance(value, Number):
-            return value
+        self._config_tables()
+        try:
+            return self._resolved_config[attribute_name]
+        except KeyError:
+            pass
 
-        if self.parent is None:
-            # Reached the top of the hierarchy (i.e. PackageInfo)
-            return None
+        value = getattr(self, attribute_name, None)
+        if not (value or isinstance(value, bool) or isinstance(value, Number)):
+            if self.parent is None:
+                # Reached the top of the hierarchy (i.e. PackageInfo)
+                value = None
+            else:
+                value = self.parent.hierarchy_attribute(attribute_name)
 
-        return self.parent.hierarchy_attribute(attribute_name)
+        self._resolved_config[attribute_name] = value
+        return value
 
     def hierarchy_attribute_gather(self, attribute_name: str) -> List[Any]:
         """
         Get a list of attribute values from this object and others in the info tree.
 
         Ascend the info tree hierarchy searching for the attribute and return
-        a list of all the values found for it.
+        a list of all the values found for it. The values are memoized until
+        the configuration changes.
 
         Parameters
         ----------
@@ -238,15 +392,19 @@ class BaseInfo(ABC):
         List[Any]
             The list of attribute values.
         """
-        value_list: List[Any] = []
+        self._config_tables()
+        value_list = self._gathered_config.get(attribute_name)
+        if value_list is not None:
+            return list(value_list)
+
+        value_list = []
 
         value = getattr(self, attribute_name, None)
         if value or isinstance(value, bool) or isinstance(value, Number):
             value_list.append(value)
 
-        if self.parent is None:
-            # Reached the top of the hierarchy (i.e. PackageInfo)
-            return value_list
+        if self.parent is not None:
+            value_list.extend(self.parent.hierarchy_attribute_gather(attribute_name))
 
-        value_list.extend(self.parent.hierarchy_attribute_gather(attribute_name))
-        return value_list
+        self._gathered_config[attribute_name] = value_list
+        return list(value_list)
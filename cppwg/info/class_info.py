@@ -3,13 +3,18 @@
 import logging
 import os
 import re
-from typing import Any, Dict, List, Optional
+import warnings
+from typing import Any, Dict, List, Optional, Sequence
 
 from pygccxml.declarations.matchers import access_type_matcher_t
 from pygccxml.declarations.runtime_errors import declaration_not_found_t
 
 from cppwg.info.cpp_entity_info import CppEntityInfo
-from cppwg.utils import utils
+from cppwg.ir.declarations import CppClassDecl
+from cppwg.parsers.decl_index import CppDeclIndex
+from cppwg.utils.file_name_index import FileNameIndex
+from cppwg.utils.source_cache import SourceCache
+from cppwg.utils.source_lexer import CppSourceIndex
 
 
 class CppClassInfo(CppEntityInfo):
@@ -26,20 +31,29 @@ class CppClassInfo(CppEntityInfo):
         The Python names of the class e.g. ["Foo_2_2", "Foo_3_3"]
     """
 
+    __slots__ = ("base_decls", "cpp_names", "py_names")
+
     def __init__(self, name: str, class_config: Optional[Dict[str, Any]] = None):
         super().__init__(name, class_config)
 
-        self.base_decls: List["declaration_t"] = []  # noqa: F821
+        self.base_decls: Sequence["declaration_t"] = ()  # noqa: F821
         self.cpp_names: List[str] = []
         self.py_names: List[str] = []
 
-    def extract_templates_from_source(self) -> None:
+    def extract_templates_from_source(
+        self, source_cache: Optional[SourceCache] = None
+    ) -> None:
         """
         Extract template args from the associated source file.
 
         Search the source file for a class signature matching one of the
         template signatures defined in `template_substitutions`. If a match
         is found, set the corresponding template arg replacements for the class.
+
+        Parameters
+        ----------
+        source_cache : Optional[SourceCache]
+            A cache of stripped source files to read the source file from
         """
         # Skip if there are template args attached directly to the class
         if self.template_arg_lists:
@@ -64,20 +78,17 @@ class CppClassInfo(CppEntityInfo):
         if not substitutions:
             return
 
-        source = utils.read_source_file(
-            source_path,
-            strip_comments=True,
-            strip_preprocessor=True,
-            strip_whitespace=True,
-        )
+        if source_cache is not None:
+            source_index = source_cache.index(source_path)
+        else:
+            source_index = CppSourceIndex.from_file(source_path)
 
         # Search for template signatures in the source file
         for substitution in substitutions:
             # Signature e.g. <int A, int B>
             signature = substitution["signature"].strip()
 
-            class_list = utils.find_classes_in_source(
-                source,
+            class_list = source_index.find_classes(
                 class_name=self.name,
                 template_signature=signature,
             )
@@ -89,6 +100,7 @@ class CppClassInfo(CppEntityInfo):
                 self.template_arg_lists = substitution["replacement"]
 
                 # Extract parameters ["A", "B"] from "<int A, int B = A>"
+                template_params = []
                 for part in signature.split(","):
                     param = (
                         part.strip()
@@ -98,7 +110,8 @@ class CppClassInfo(CppEntityInfo):
                         .split("=")[0]
                         .strip()
                     )
-                    self.template_params.append(param)
+                    template_params.append(param)
+                self.template_params = template_params
                 break
 
     def extends(self, other: "ClassInfo") -> bool:  # noqa: F821
@@ -119,7 +132,43 @@ class CppClassInfo(CppEntityInfo):
             return False
         if not other.decls:
             return False
-        return any(decl in other.decls for decl in self.base_decls)
+
+        other_keys = {CppDeclIndex.class_key(decl) for decl in other.decls}
+        return any(
+            CppDeclIndex.class_key(decl) in other_keys for decl in self.base_decls
+        )
+
+    def argument_type_strings(self) -> List[str]:
+        """
+        Get the argument types used in public method signatures of this class.
+
+        Returns
+        -------
+        List[str]
+            The argument type decl strings of the public member functions and
+            constructors of all the class declarations
+        """
+        query = access_type_matcher_t("public")
+
+        type_strings = []
+        for class_decl in self.decls:
+            if isinstance(class_decl, CppClassDecl):
+                calldef_decls = [
+                    calldef_decl
+                    for calldef_decl in class_decl.member_functions
+                    + class_decl.constructors
+                    if calldef_decl.access_type == "public"
+                ]
+            else:
+                calldef_decls = list(
+                    class_decl.member_functions(function=query, allow_empty=True)
+                ) + list(class_decl.constructors(function=query, allow_empty=True))
+
+            for calldef_decl in calldef_decls:
+                for arg_type in calldef_decl.argument_types:
+                    type_strings.append(arg_type.decl_string)
+
+        return type_strings
 
     def requires(self, other: "ClassInfo") -> bool:  # noqa: F821
         """
@@ -138,34 +187,42 @@ class CppClassInfo(CppEntityInfo):
         if not self.decls:
             return False
 
-        query = access_type_matcher_t("public")
         name_regex = re.compile(r"\b" + re.escape(other.name) + r"\b")
-
-        for class_decl in self.decls:
-            method_decls = class_decl.member_functions(function=query, allow_empty=True)
-            for method_decl in method_decls:
-                for arg_type in method_decl.argument_types:
-                    if name_regex.search(arg_type.decl_string):
-                        return True
-
-            ctor_decls = class_decl.constructors(function=query, allow_empty=True)
-            for ctor_decl in ctor_decls:
-                for arg_type in ctor_decl.argument_types:
-                    if name_regex.search(arg_type.decl_string):
-                        return True
-        return False
+        return any(
+            name_regex.search(type_string)
+            for type_string in self.argument_type_strings()
+        )
 
     def update_from_ns(self, source_ns: "namespace_t") -> None:  # noqa: F821
         """
         Update class with information from the source namespace.
 
-        Adds the class declarations and base class declarations.
+        Deprecated: index the namespace with `CppDeclIndex` and call
+        `update_from_index` instead, to share the index between updates.
 
         Parameters
         ----------
         source_ns : pygccxml.declarations.namespace_t
             The source namespace
         """
+        warnings.warn(
+            "update_from_ns is deprecated - use update_from_index",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        self.update_from_index(CppDeclIndex(source_ns))
+
+    def update_from_index(self, decl_index: "CppDeclIndex") -> None:  # noqa: F821
+        """
+        Update class with information from the parsed declarations.
+
+        Adds the class declarations and base class declarations.
+
+        Parameters
+        ----------
+        decl_index : CppDeclIndex
+            The index of parsed source declarations
+        """
         logger = logging.getLogger()
 
         # Skip excluded classes
@@ -174,8 +231,7 @@ class CppClassInfo(CppEntityInfo):
 
         for class_cpp_name, class_py_name in zip(self.cpp_names, self.py_names):
             try:
-                cpp_name = class_cpp_name.replace(" ", "")  # e.g. Foo<2,2,1>
-                class_decl = source_ns.class_(cpp_name)
+                class_decl = decl_index.find_class(class_cpp_name)  # e.g. Foo<2,2,1>
 
             except declaration_not_found_t:
                 # Parsed names for templated classes which have default args
@@ -185,8 +241,7 @@ class CppClassInfo(CppEntityInfo):
                 # the parsed name for Foo<2,2,1> could be Foo<2,2>, or Foo<2>
                 # but the typedef name will always be Foo_2_2_1
                 py_name = class_py_name.replace(" ", "")  # e.g. Foo_2_2_1
-                typedef_decl = source_ns.typedef(py_name)
-                class_decl = typedef_decl.decl_type.declaration
+                class_decl = decl_index.find_typedef_class(py_name)
 
                 logger.info(f"Found {class_decl.name} for {class_cpp_name}")
                 class_decl.name = class_cpp_name
@@ -200,17 +255,25 @@ class CppClassInfo(CppEntityInfo):
 
         # Update the base class declarations
         self.base_decls = [
-            base.related_class for decl in self.decls for base in decl.bases
+            base_decl
+            for decl in self.decls
+            for base_decl in decl_index.base_classes(decl)
         ]
 
-    def update_from_source(self, source_file_paths: List[str]) -> None:
+    def update_from_source(
+        self,
+        file_name_index: FileNameIndex,
+        source_cache: Optional[SourceCache] = None,
+    ) -> None:
         """
         Update class with information from the source headers.
 
         Parameters
         ----------
-        source_file_paths : List[str]
-            A list of source file paths
+        file_name_index : FileNameIndex
+            An index of the source file paths by file name
+        source_cache : Optional[SourceCache]
+            A cache of stripped source files to read the source file from
         """
         # Skip excluded classes
         if self.excluded:
@@ -220,18 +283,28 @@ class CppClassInfo(CppEntityInfo):
         if self.source_file_path:
             self.source_file = os.path.basename(self.source_file_path)
         else:
-            for file_path in source_file_paths:
-                file_name = os.path.basename(file_path)
-                # Match file name if set
-                if self.source_file == file_name:
-                    self.source_file_path = file_path
-                # Match class name, assuming the file name is the class name
-                elif self.name == os.path.splitext(file_name)[0]:
-                    self.source_file = file_name
-                    self.source_file_path = file_path
+            # Match file name if set, or else match class name, assuming the
+            # file name is the class name
+            file_paths = []
+            if self.source_file:
+                file_paths = file_name_index.paths_by_name(self.source_file)
+            if not file_paths:
+                file_paths = file_name_index.paths_by_stem(self.name)
+
+            if file_paths:
+                if len(file_paths) > 1:
+                    logger = logging.getLogger()
+                    logger.warning(
+                        f"Class {self.name} matches several source files: "
+                        + ", ".join(file_paths)
+                        + f" - using {file_paths[-1]}. Set source_file_path "
+                        + "for the class to choose one."
+                    )
+                self.source_file_path = file_paths[-1]
+                self.source_file = os.path.basename(self.source_file_path)
 
         # Extract template args from the source file
-        self.extract_templates_from_source()
+        self.extract_templates_from_source(source_cache)
 
         # Update the C++ and Python class names
         self.update_names()
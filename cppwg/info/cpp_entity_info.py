@@ -1,6 +1,6 @@
 """C++ entity information structure."""
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 from cppwg.info.base_info import BaseInfo
 
@@ -21,8 +21,10 @@ class CppEntityInfo(BaseInfo):
     module_info : ModuleInfo
         The module info object that this entity belongs to
 
-    decls : pygccxml.declarations.declaration_t
-        The pygccxml declarations associated with this entity, one per template arg if templated
+    decls : List[declaration_t]
+        The declarations associated with this entity, one per template arg if
+        templated. These are pygccxml declarations until they are extracted
+        into compact declarations (cppwg.ir) for the writers.
     template_arg_lists : List[List[Any]]
         List of template replacement arguments e.g. [[2, 2], [3, 3]]
     template_params : List[str]
@@ -31,6 +33,17 @@ class CppEntityInfo(BaseInfo):
         The template signature of the entity e.g. "<unsigned DIM_A, unsigned DIM_B = DIM_A>"
     """
 
+    __slots__ = (
+        "decls",
+        "module_info",
+        "name_override",
+        "source_file",
+        "source_file_path",
+        "template_arg_lists",
+        "template_params",
+        "template_signature",
+    )
+
     def __init__(self, name: str, entity_config: Optional[Dict[str, Any]] = None):
         super().__init__(name, entity_config)
 
@@ -41,8 +54,8 @@ class CppEntityInfo(BaseInfo):
         self.module_info: Optional["ModuleInfo"] = None  # noqa: F821
 
         self.decls: List["declaration_t"] = []  # noqa: F821
-        self.template_arg_lists: List[List[Any]] = []
-        self.template_params: List[str] = []
+        self.template_arg_lists: Sequence[List[Any]] = ()
+        self.template_params: Sequence[str] = ()
         self.template_signature: str = ""
 
         if entity_config:
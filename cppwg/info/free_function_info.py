@@ -1,13 +1,17 @@
 """Free function information structure."""
 
+import warnings
 from typing import Any, Dict, Optional
 
 from cppwg.info.cpp_entity_info import CppEntityInfo
+from cppwg.parsers.decl_index import CppDeclIndex
 
 
 class CppFreeFunctionInfo(CppEntityInfo):
     """An information structure for individual free functions to be wrapped."""
 
+    __slots__ = ()
+
     def __init__(
         self, name: str, free_function_config: Optional[Dict[str, Any]] = None
     ):
@@ -17,12 +21,31 @@ class CppFreeFunctionInfo(CppEntityInfo):
         """
         Update with information from the source namespace.
 
-        Adds the free function declaration.
+        Deprecated: index the namespace with `CppDeclIndex` and call
+        `update_from_index` instead, to share the index between updates.
 
         Parameters
         ----------
         source_ns : pygccxml.declarations.namespace_t
             The source namespace
         """
-        ff_decls = source_ns.free_functions(self.name, allow_empty=True)
+        warnings.warn(
+            "update_from_ns is deprecated - use update_from_index",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        self.update_from_index(CppDeclIndex(source_ns))
+
+    def update_from_index(self, decl_index: "CppDeclIndex") -> None:  # noqa: F821
+        """
+        Update with information from the parsed declarations.
+
+        Adds the free function declaration.
+
+        Parameters
+        ----------
+        decl_index : CppDeclIndex
+            The index of parsed source declarations
+        """
+        ff_decls = decl_index.find_free_functions(self.name)
         self.decls = [ff_decls[0]]
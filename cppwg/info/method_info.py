@@ -15,6 +15,8 @@ class CppMethodInfo(CppEntityInfo):
         The class info object that holds this method.
     """
 
+    __slots__ = ("class_info",)
+
     def __init__(self, name: str, _) -> None:
         super().__init__(name)
 
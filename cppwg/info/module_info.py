@@ -1,11 +1,17 @@
 """Module information structure."""
 
-from pathlib import Path
-from typing import Any, Dict, List, Optional
+import logging
+import re
+import warnings
+from typing import Any, Dict, List, Optional, Sequence, Set, Union
 
 from cppwg.info.base_info import BaseInfo
 from cppwg.info.class_info import CppClassInfo
 from cppwg.info.free_function_info import CppFreeFunctionInfo
+from cppwg.parsers.decl_index import CppDeclIndex
+from cppwg.utils.dependency_graph import DependencyGraph
+from cppwg.utils.file_name_index import FileNameIndex
+from cppwg.utils.source_cache import SourceCache
 
 
 class ModuleInfo(BaseInfo):
@@ -34,6 +40,17 @@ class ModuleInfo(BaseInfo):
         A list of variable info objects that belong to this module
     """
 
+    __slots__ = (
+        "class_collection",
+        "free_function_collection",
+        "package_info",
+        "source_locations",
+        "use_all_classes",
+        "use_all_free_functions",
+        "use_all_variables",
+        "variable_collection",
+    )
+
     def __init__(
         self, name: str, module_config: Optional[Dict[str, Any]] = None
     ) -> None:
@@ -49,7 +66,7 @@ class ModuleInfo(BaseInfo):
         """
         super().__init__(name, module_config)
 
-        self.source_locations: List[str] = []
+        self.source_locations: Sequence[str] = ()
         self.use_all_classes: bool = False
         self.use_all_free_functions: bool = False
         self.use_all_variables: bool = False
@@ -122,8 +139,9 @@ class ModuleInfo(BaseInfo):
         if not self.source_locations:
             return True
 
+        matches = self.package_info.path_index.matches(decl.location.file_name)
         for location in self.source_locations:
-            if Path(location) in Path(decl.location.file_name).parents:
+            if location in matches:
                 return True
 
         return False
@@ -131,135 +149,182 @@ class ModuleInfo(BaseInfo):
     def sort_classes(self) -> None:
         """
         Sort the class info collection in order of dependence.
+
+        A class depends on the classes it extends, and on the classes it
+        uses in public method signatures unless they also use it. The
+        referenced type names of each class are collected once, and classes
+        are ordered by a topological sort starting from name order.
         """
-        cache = dict()
-
-        def compare(a: CppClassInfo, b: CppClassInfo) -> int:
-            """
-            Compare two class info objects for dependence order.
-
-            Parameters
-            ----------
-            a : CppClassInfo
-            b : CppClassInfo
-
-            Returns
-            -------
-            int
-                -1 if a comes before b (b depends on a)
-                 0 if there is no dependence
-                 1 if a comes after b (a depends on b)
-            """
-            order = cache.get((a, b), None)
-            if order is not None:
-                return order
-
-            a_req_b = a.requires(b)
-            b_req_a = b.requires(a)
-            if a.extends(b) or (a_req_b and not b_req_a):
-                # a comes after b (ignore cyclic dependencies)
-                cache[(a, b)] = 1
-                cache[(b, a)] = -1
-                return 1
-            elif b.extends(a) or (b_req_a and not a_req_b):
-                # a comes before b (ignore cyclic dependencies)
-                cache[(a, b)] = -1
-                cache[(b, a)] = 1
-                return -1
-
-            # Order doesn't matter
-            cache[(a, b)] = 0
-            cache[(b, a)] = 0
-            return 0
+        logger = logging.getLogger()
 
         self.class_collection.sort(key=lambda x: x.name)
+        graph = DependencyGraph(self.class_collection)
+
+        # Index classes by name and base declaration
+        classes_by_name: Dict[str, List[CppClassInfo]] = {}
+        classes_by_decl: Dict[Union[str, int], List[CppClassInfo]] = {}
+        for class_info in self.class_collection:
+            classes_by_name.setdefault(class_info.name, []).append(class_info)
+            for decl in class_info.decls:
+                key = CppDeclIndex.class_key(decl)
+                classes_by_decl.setdefault(key, []).append(class_info)
+
+        # Names that aren't single words e.g. "ns::Foo" need a regex search
+        other_names = {
+            name: re.compile(r"\b" + re.escape(name) + r"\b")
+            for name in classes_by_name
+            if not re.fullmatch(r"\w+", name)
+        }
+
+        # Collect the classes each class extends and requires
+        extends: Dict[CppClassInfo, Set[CppClassInfo]] = {}
+        requires: Dict[CppClassInfo, Set[CppClassInfo]] = {}
+        for class_info in self.class_collection:
+            extends[class_info] = {
+                base_info
+                for decl in class_info.base_decls
+                for base_info in classes_by_decl.get(CppDeclIndex.class_key(decl), [])
+            }
+
+            requires[class_info] = set()
+            if not class_info.decls:
+                continue
+
+            type_strings = class_info.argument_type_strings()
+            type_names = {
+                name
+                for type_string in type_strings
+                for name in re.findall(r"\w+", type_string)
+            }
+            type_names.update(
+                name
+                for name, name_regex in other_names.items()
+                if any(name_regex.search(type_string) for type_string in type_strings)
+            )
+            for name in type_names:
+                requires[class_info].update(classes_by_name.get(name, []))
+
+        # Base classes come first, then classes used by other classes, but
+        # classes that use each other can be in any order
+        for class_info in self.class_collection:
+            for base_info in extends[class_info]:
+                graph.add_dependency(class_info, base_info)
+
+            for other in requires[class_info]:
+                if class_info not in requires[other] and class_info not in (
+                    extends[other]
+                ):
+                    graph.add_dependency(class_info, other)
+
+        for cycle in graph.cycles():
+            logger.warning(
+                f"Cyclic class dependencies in module {self.name}: "
+                + ", ".join(class_info.name for class_info in cycle)
+                + " - ordering by name within the cycle."
+            )
 
-        i = 0
-        n = len(self.class_collection)
-        while i < n - 1:
-            cls_i = self.class_collection[i]
-            ii = i  # Tracks destination of cls_i
-            j_pos = []  # Tracks positions of cls_i's dependents
-
-            for j in range(i + 1, n):
-                cls_j = self.class_collection[j]
-                order = compare(cls_i, cls_j)
-                if order == 1:
-                    # Position cls_i after all classes it depends on
-                    ii = j
-                elif order == -1:
-                    # Collect positions of cls_i's dependents
-                    j_pos.append(j)
-
-            if ii <= i:
-                i += 1
-                continue  # No change in position
-
-            # Move cls_i into new position ii
-            cls_i = self.class_collection.pop(i)
-            self.class_collection.insert(ii, cls_i)
-
-            # Move dependents into positions after ii
-            for idx, j in enumerate(j_pos):
-                if j > ii:
-                    break  # Rest of dependents are already positioned after ii
-                cls_j = self.class_collection.pop(j - 1 - idx)
-                self.class_collection.insert(ii + idx, cls_j)
+        self.class_collection = graph.sorted()
 
     def update_from_ns(self, source_ns: "namespace_t") -> None:  # noqa: F821
         """
         Update module with information from the source namespace.
 
+        Deprecated: index the namespace with `CppDeclIndex` and call
+        `update_from_index` instead, to share the index between updates.
+
         Parameters
         ----------
         source_ns : pygccxml.declarations.namespace_t
             The source namespace
         """
+        warnings.warn(
+            "update_from_ns is deprecated - use update_from_index",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        self.update_from_index(CppDeclIndex(source_ns))
+
+    def update_from_index(
+        self,
+        decl_index: "CppDeclIndex",  # noqa: F821
+        class_decls: Optional[List["class_t"]] = None,  # noqa: F821
+        free_function_decls: Optional[List["free_function_t"]] = None,  # noqa: F821
+    ) -> None:
+        """
+        Update module with information from the parsed declarations.
+
+        Parameters
+        ----------
+        decl_index : CppDeclIndex
+            The index of parsed source declarations
+        class_decls : Optional[List[class_t]]
+            The class declarations assigned to this module if it uses all
+            classes. If None, the indexed classes in the module's source
+            locations are used.
+        free_function_decls : Optional[List[free_function_t]]
+            The free function declarations assigned to this module if it uses
+            all free functions. If None, the indexed free functions in the
+            module's source locations are used.
+        """
         # Add discovered classes: if `use_all_classes` is True, this module
-        # has no class info objects. Use class declarations from the
-        # source namespace to create class info objects.
+        # has no class info objects. Use the parsed class declarations to
+        # create class info objects.
         if self.use_all_classes:
-            class_decls = source_ns.classes(allow_empty=True)
+            if class_decls is None:
+                class_decls = [
+                    decl
+                    for decl in decl_index.classes
+                    if self.is_decl_in_source_path(decl)
+                ]
             for class_decl in class_decls:
-                if self.is_decl_in_source_path(class_decl):
-                    class_info = CppClassInfo(class_decl.name)
-                    class_info.update_names()
-                    class_info.module_info = self
-                    self.class_collection.append(class_info)
+                class_info = CppClassInfo(class_decl.name)
+                class_info.update_names()
+                class_info.module_info = self
+                self.class_collection.append(class_info)
 
-        # Update classes with information from source namespace.
+        # Update classes with information from the parsed declarations.
         for class_info in self.class_collection:
-            class_info.update_from_ns(source_ns)
+            class_info.update_from_index(decl_index)
 
         # Sort classes by dependence
         self.sort_classes()
 
         # Add discovered free functions: if `use_all_free_functions` is True,
-        # this module has no free function info objects. Use free function
-        # decls from the source namespace to create free function info objects.
+        # this module has no free function info objects. Use the parsed free
+        # function declarations to create free function info objects.
         if self.use_all_free_functions:
-            free_functions = source_ns.free_functions(allow_empty=True)
-            for free_function in free_functions:
-                if self.is_decl_in_source_path(free_function):
-                    ff_info = CppFreeFunctionInfo(free_function.name)
-                    ff_info.module_info = self
-                    self.free_function_collection.append(ff_info)
-
-        # Update free functions with information from source namespace.
+            if free_function_decls is None:
+                free_function_decls = [
+                    decl
+                    for decl in decl_index.free_functions
+                    if self.is_decl_in_source_path(decl)
+                ]
+            for free_function in free_function_decls:
+                ff_info = CppFreeFunctionInfo(free_function.name)
+                ff_info.module_info = self
+                self.free_function_collection.append(ff_info)
+
+        # Update free functions with information from the parsed declarations.
         for ff_info in self.free_function_collection:
-            ff_info.update_from_ns(source_ns)
+            ff_info.update_from_index(decl_index)
 
-    def update_from_source(self, source_file_paths: List[str]) -> None:
+    def update_from_source(
+        self,
+        file_name_index: FileNameIndex,
+        source_cache: Optional[SourceCache] = None,
+    ) -> None:
         """
         Update module with information from the source headers.
 
         Parameters
         ----------
-        source_files : List[str]
-            A list of source file paths.
+        file_name_index : FileNameIndex
+            An index of the source file paths by file name
+        source_cache : Optional[SourceCache]
+            A cache of stripped source files to read headers from
         """
         for class_info in self.class_collection:
-            class_info.update_from_source(source_file_paths)
+            class_info.update_from_source(file_name_index, source_cache)
 
         self.class_collection.sort(key=lambda x: x.name)
         self.free_function_collection.sort(key=lambda x: x.name)
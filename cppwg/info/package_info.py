@@ -1,13 +1,17 @@
 """Package information structure."""
 
-import fnmatch
 import logging
 import os
-from pathlib import Path
-from typing import Any, Dict, List, Optional
+import warnings
+from typing import Any, Dict, Iterable, List, Optional, Sequence
 
 from cppwg.info.base_info import BaseInfo
-from cppwg.utils.constants import CPPWG_EXT
+from cppwg.parsers.decl_index import CppDeclIndex
+from cppwg.utils.constants import CPPWG_INHERITED_CONFIG
+from cppwg.utils.file_name_index import FileNameIndex
+from cppwg.utils.path_index import PathIndex
+from cppwg.utils.source_cache import SourceCache
+from cppwg.utils.source_walker import find_source_files
 
 
 class PackageInfo(BaseInfo):
@@ -24,13 +28,39 @@ class PackageInfo(BaseInfo):
         The name of the package
     source_hpp_patterns : List[str]
         A list of source file patterns to include
+    source_ignore_files : List[str]
+        Names of ignore files e.g. [".cppwgignore"], listing patterns for
+        files and directories to skip when collecting source headers
+    template_packs : List[str]
+        Built-in template pack names or template pack file paths, overriding
+        the default wrapper templates in order
 
     module_collection : List[ModuleInfo]
         A list of module info objects associated with this package
     source_hpp_files : List[str]
         A list of source file names to include
+    path_index : PathIndex
+        An index for checking if files are in the source root or module
+        source locations
+    source_cache : SourceCache
+        A cache of the stripped source of header files
     """
 
+    __slots__ = (
+        "common_include_file",
+        "exclude_default_args",
+        "module_collection",
+        "path_index",
+        "source_cache",
+        "source_hpp_files",
+        "source_hpp_patterns",
+        "source_ignore_files",
+        "template_packs",
+    )
+
+    # The source cache is only needed before the wrappers are written
+    _unpickled_attributes = BaseInfo._unpickled_attributes | {"source_cache"}
+
     def __init__(
         self, name: str, package_config: Optional[Dict[str, Any]] = None
     ) -> None:
@@ -48,10 +78,14 @@ class PackageInfo(BaseInfo):
 
         self.common_include_file: bool = False
         self.exclude_default_args: bool = False
-        self.source_hpp_patterns: List[str] = ["*.hpp"]
+        self.source_hpp_patterns: Sequence[str] = ("*.hpp",)
+        self.source_ignore_files: Sequence[str] = ()
+        self.template_packs: Sequence[str] = ()
 
         self.module_collection: List["ModuleInfo"] = []  # noqa: F821
         self.source_hpp_files: List[str] = []
+        self.path_index: PathIndex = PathIndex([])
+        self.source_cache: SourceCache = SourceCache()
 
         if package_config:
             self.common_include_file = package_config.get(
@@ -63,6 +97,19 @@ class PackageInfo(BaseInfo):
             self.source_hpp_patterns = package_config.get(
                 "source_hpp_patterns", self.source_hpp_patterns
             )
+            self.source_ignore_files = package_config.get(
+                "source_ignore_files", self.source_ignore_files
+            )
+            self.template_packs = package_config.get(
+                "template_packs", self.template_packs
+            )
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """
+        Restore the state from pickling, with an empty source cache.
+        """
+        super().__setstate__(state)
+        self.source_cache = SourceCache()
 
     @property
     def parent(self) -> None:
@@ -83,6 +130,28 @@ class PackageInfo(BaseInfo):
         self.module_collection.append(module_info)
         module_info.parent = self
 
+    def resolve_config(
+        self, attribute_names: Iterable[str] = CPPWG_INHERITED_CONFIG
+    ) -> None:
+        """
+        Resolve configuration values for the package and the info objects in it.
+
+        Parameters
+        ----------
+        attribute_names : Iterable[str]
+            The attribute names to resolve; defaults to the inherited config
+        """
+        attribute_names = tuple(attribute_names)
+        super().resolve_config(attribute_names)
+        for module_info in self.module_collection:
+            module_info.resolve_config(attribute_names)
+            for info in (
+                module_info.class_collection
+                + module_info.free_function_collection
+                + module_info.variable_collection
+            ):
+                info.resolve_config(attribute_names)
+
     def init(self, restricted_paths: List[str]) -> None:
         """
         Initialise - collect header files and update info.
@@ -92,15 +161,27 @@ class PackageInfo(BaseInfo):
         restricted_paths : List[str]
             A list of restricted paths to skip when collecting header files.
         """
+        self.index_source_paths()
         self.collect_source_headers(restricted_paths)
         self.update_from_source()
 
+    def index_source_paths(self) -> None:
+        """
+        Index the source root and module source locations for path lookups.
+        """
+        directories = [self.source_root] if self.source_root else []
+        for module_info in self.module_collection:
+            if module_info.source_locations:
+                directories.extend(module_info.source_locations)
+        self.path_index = PathIndex(directories)
+
     def collect_source_headers(self, restricted_paths: List[str]) -> None:
         """
         Collect header files from the source root.
 
         Walk through the source root and add any files matching the provided
-        source file patterns e.g. "*.hpp".
+        source file patterns e.g. "*.hpp". Restricted directories, and those
+        excluded by any ignore files, are not walked.
 
         Parameters
         ----------
@@ -109,22 +190,14 @@ class PackageInfo(BaseInfo):
         """
         logger = logging.getLogger()
 
-        for root, _, filenames in os.walk(self.source_root, followlinks=True):
-            for pattern in self.source_hpp_patterns:
-                for filename in fnmatch.filter(filenames, pattern):
-                    filepath = os.path.abspath(os.path.join(root, filename))
-
-                    # Skip files in restricted paths
-                    for restricted_path in restricted_paths:
-                        if Path(restricted_path) in Path(filepath).parents:
-                            continue
-
-                    # Skip files with the extensions like .cppwg.hpp
-                    suffix = os.path.splitext(os.path.splitext(filename)[0])[1]
-                    if suffix == CPPWG_EXT:
-                        continue
-
-                    self.source_hpp_files.append(filepath)
+        self.source_hpp_files.extend(
+            find_source_files(
+                self.source_root,
+                self.source_hpp_patterns,
+                restricted_paths=restricted_paths,
+                ignore_file_names=self.source_ignore_files,
+            )
+        )
 
         # Check if any source files were found
         if not self.source_hpp_files:
@@ -137,18 +210,114 @@ class PackageInfo(BaseInfo):
     def update_from_source(self) -> None:
         """
         Update with data from the source headers.
+
+        The headers are loaded into the source cache in parallel first, as
+        they are all scanned for templates and unknown classes. Classes are
+        mapped to headers through an index of the header file names.
         """
+        self.source_cache.prefetch(self.source_hpp_files)
+        file_name_index = FileNameIndex(self.source_hpp_files)
+
         for module_info in self.module_collection:
-            module_info.update_from_source(self.source_hpp_files)
+            module_info.update_from_source(file_name_index, self.source_cache)
 
     def update_from_ns(self, source_ns: "namespace_t") -> None:  # noqa: F821
         """
         Update modules with information from the parsed source namespace.
 
+        Deprecated: index the namespace with `CppDeclIndex` and call
+        `update_from_index` instead, to share the index between updates.
+
         Parameters
         ----------
         source_ns : pygccxml.declarations.namespace_t
             The source namespace
         """
+        warnings.warn(
+            "update_from_ns is deprecated - use update_from_index",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        self.update_from_index(CppDeclIndex(source_ns))
+
+    def update_from_index(self, decl_index: "CppDeclIndex") -> None:  # noqa: F821
+        """
+        Update modules with information from the parsed declarations.
+
+        Parameters
+        ----------
+        decl_index : CppDeclIndex
+            The index of parsed source declarations
+        """
+        # Assign discovered declarations to modules using all classes or all
+        # free functions in a single pass over the declarations
+        class_partition = self.partition_decls(
+            decl_index.classes,
+            [m for m in self.module_collection if m.use_all_classes],
+        )
+        free_function_partition = self.partition_decls(
+            decl_index.free_functions,
+            [m for m in self.module_collection if m.use_all_free_functions],
+        )
+
         for module_info in self.module_collection:
-            module_info.update_from_ns(source_ns)
+            module_info.update_from_index(
+                decl_index,
+                class_decls=class_partition.get(id(module_info), []),
+                free_function_decls=free_function_partition.get(id(module_info), []),
+            )
+
+    def partition_decls(
+        self,
+        decls: List["declaration_t"],  # noqa: F821
+        module_infos: List["ModuleInfo"],  # noqa: F821
+    ) -> Dict[int, List["declaration_t"]]:  # noqa: F821
+        """
+        Assign declarations to the modules whose source locations contain them.
+
+        Each declaration is assigned to the module with the longest source
+        location containing the declaration's file. Modules without source
+        locations are assigned every declaration.
+
+        Parameters
+        ----------
+        decls : List[declaration_t]
+            The declarations to assign
+        module_infos : List[ModuleInfo]
+            The modules to assign declarations to
+
+        Returns
+        -------
+        Dict[int, List[declaration_t]]
+            The declarations assigned to each module, keyed by module id
+        """
+        partition: Dict[int, List["declaration_t"]] = {  # noqa: F821
+            id(module_info): [] for module_info in module_infos
+        }
+
+        # Map source locations to modules; the first module listing a
+        # location owns it
+        modules_by_location: Dict[str, "ModuleInfo"] = {}  # noqa: F821
+        unlocated_modules: List["ModuleInfo"] = []  # noqa: F821
+        for module_info in module_infos:
+            if not module_info.source_locations:
+                unlocated_modules.append(module_info)
+            for location in module_info.source_locations or []:
+                modules_by_location.setdefault(location, module_info)
+
+        for decl in decls:
+            for module_info in unlocated_modules:
+                partition[id(module_info)].append(decl)
+
+            if not decl.location:
+                continue
+
+            # Matches are ordered deepest first, so the first owned match is
+            # the longest matching source location
+            for location in self.path_index.matches(decl.location.file_name):
+                module_info = modules_by_location.get(location)
+                if module_info:
+                    partition[id(module_info)].append(decl)
+                    break
+
+        return partition
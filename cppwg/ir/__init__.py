@@ -0,0 +1 @@
+"""Contains a compact representation of the C++ declarations to be wrapped."""
@@ -0,0 +1,324 @@
+"""Compact declarations for the C++ entities to be wrapped."""
+
+from typing import List, NamedTuple, Optional, Tuple
+
+
+class CppLocation(NamedTuple):
+    """
+    The location of a declaration in a source file.
+
+    Attributes
+    ----------
+    file_name : str
+        The path to the file
+    line : int
+        The line number in the file
+    """
+
+    file_name: str
+    line: int
+
+
+class CppType(NamedTuple):
+    """
+    A C++ type, as used in argument and return types.
+
+    Attributes
+    ----------
+    decl_string : str
+        The full type string e.g. "::std::vector<unsigned int> const &"
+    is_pointer : bool
+        Whether the type is a pointer
+    is_reference : bool
+        Whether the type is a reference
+    nonconst_decl_string : str
+        The type string with any top level const removed
+    """
+
+    decl_string: str
+    is_pointer: bool
+    is_reference: bool
+    nonconst_decl_string: str
+
+    def __str__(self) -> str:
+        """
+        Return the type string without a leading global scope e.g. "std::string".
+        """
+        if self.decl_string[:2] == "::":
+            return self.decl_string[2:]
+        return self.decl_string
+
+
+class CppArgument(NamedTuple):
+    """
+    A function argument.
+
+    Attributes
+    ----------
+    name : str
+        The argument name
+    decl_type : CppType
+        The argument type
+    default_value : Optional[str]
+        The default value, or None if there isn't one
+    """
+
+    name: str
+    decl_type: CppType
+    default_value: Optional[str]
+
+
+class CppBase(NamedTuple):
+    """
+    A base class specifier.
+
+    Attributes
+    ----------
+    related_class : CppClassDecl
+        The base class
+    access_type : str
+        The inheritance access e.g. "public"
+    is_virtual : bool
+        Whether the inheritance is virtual
+    """
+
+    related_class: "CppClassDecl"
+    access_type: str
+    is_virtual: bool
+
+
+class CppEnumeration(NamedTuple):
+    """
+    An enumeration.
+
+    Attributes
+    ----------
+    name : str
+        The enumeration name
+    values : Tuple[Tuple[str, int], ...]
+        The enumeration's (name, value) pairs
+    """
+
+    name: str
+    values: Tuple[Tuple[str, int], ...]
+
+
+class CppDecl:
+    """
+    Base for compact declarations.
+
+    Attributes
+    ----------
+    name : str
+        The declaration name e.g. "Foo<2>"
+    location : Optional[CppLocation]
+        The location of the declaration
+    parent : Optional[CppClassDecl]
+        The class containing the declaration, if any
+    """
+
+    __slots__ = ("name", "location", "parent")
+
+    def __init__(
+        self,
+        name: str,
+        location: Optional[CppLocation] = None,
+        parent: Optional["CppClassDecl"] = None,
+    ) -> None:
+        self.name: str = name
+        self.location: Optional[CppLocation] = location
+        self.parent: Optional["CppClassDecl"] = parent
+
+    def __repr__(self) -> str:
+        """
+        Return a short description of the declaration.
+        """
+        return f"{self.__class__.__name__}({self.name!r})"
+
+
+class CppCalldefDecl(CppDecl):
+    """
+    Base for function-like declarations.
+
+    Attributes
+    ----------
+    arguments : Tuple[CppArgument, ...]
+        The function arguments
+    access_type : str
+        The member access e.g. "public"
+    is_artificial : bool
+        Whether the function was added by the compiler
+    """
+
+    __slots__ = ("arguments", "access_type", "is_artificial")
+
+    def __init__(
+        self,
+        name: str,
+        location: Optional[CppLocation] = None,
+        parent: Optional["CppClassDecl"] = None,
+        arguments: Tuple[CppArgument, ...] = (),
+        access_type: str = "public",
+        is_artificial: bool = False,
+    ) -> None:
+        super().__init__(name, location, parent)
+        self.arguments: Tuple[CppArgument, ...] = arguments
+        self.access_type: str = access_type
+        self.is_artificial: bool = is_artificial
+
+    @property
+    def argument_types(self) -> List[CppType]:
+        """
+        Returns the argument types.
+        """
+        return [arg.decl_type for arg in self.arguments]
+
+
+class CppConstructorDecl(CppCalldefDecl):
+    """
+    A constructor declaration.
+
+    Attributes
+    ----------
+    is_copy_constructor : bool
+        Whether this is a copy constructor
+    """
+
+    __slots__ = ("is_copy_constructor",)
+
+    def __init__(self, name: str, is_copy_constructor: bool = False, **kwargs) -> None:
+        super().__init__(name, **kwargs)
+        self.is_copy_constructor: bool = is_copy_constructor
+
+
+class CppFreeFunctionDecl(CppCalldefDecl):
+    """
+    A free function declaration.
+
+    Attributes
+    ----------
+    return_type : CppType
+        The return type
+    """
+
+    __slots__ = ("return_type",)
+
+    def __init__(self, name: str, return_type: CppType, **kwargs) -> None:
+        super().__init__(name, **kwargs)
+        self.return_type: CppType = return_type
+
+
+class CppMemberFunctionDecl(CppCalldefDecl):
+    """
+    A member function declaration.
+
+    Attributes
+    ----------
+    return_type : CppType
+        The return type
+    has_static : bool
+        Whether the method is static
+    has_const : bool
+        Whether the method is const
+    virtuality : str
+        One of "not virtual", "virtual" or "pure virtual"
+    """
+
+    __slots__ = ("return_type", "has_static", "has_const", "virtuality")
+
+    def __init__(
+        self,
+        name: str,
+        return_type: CppType,
+        has_static: bool = False,
+        has_const: bool = False,
+        virtuality: str = "not virtual",
+        **kwargs,
+    ) -> None:
+        super().__init__(name, **kwargs)
+        self.return_type: CppType = return_type
+        self.has_static: bool = has_static
+        self.has_const: bool = has_const
+        self.virtuality: str = virtuality
+
+
+class CppClassDecl(CppDecl):
+    """
+    A class declaration.
+
+    Member lists include members of nested classes, as in a recursive
+    pygccxml query; a member's `parent` is the class that declares it.
+
+    Attributes
+    ----------
+    class_type : str
+        One of "class", "struct" or "union"
+    is_abstract : bool
+        Whether the class is abstract
+    bases : Tuple[CppBase, ...]
+        The direct base classes
+    constructors : Tuple[CppConstructorDecl, ...]
+        The constructors
+    member_functions : Tuple[CppMemberFunctionDecl, ...]
+        The member functions
+    enumerations : Tuple[CppEnumeration, ...]
+        The enumerations
+    """
+
+    __slots__ = (
+        "class_type",
+        "is_abstract",
+        "bases",
+        "constructors",
+        "member_functions",
+        "enumerations",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        location: Optional[CppLocation] = None,
+        parent: Optional["CppClassDecl"] = None,
+        class_type: str = "class",
+        is_abstract: bool = False,
+    ) -> None:
+        super().__init__(name, location, parent)
+        self.class_type: str = class_type
+        self.is_abstract: bool = is_abstract
+        self.bases: Tuple[CppBase, ...] = ()
+        self.constructors: Tuple[CppConstructorDecl, ...] = ()
+        self.member_functions: Tuple[CppMemberFunctionDecl, ...] = ()
+        self.enumerations: Tuple[CppEnumeration, ...] = ()
+
+    @property
+    def recursive_bases(self) -> List[CppBase]:
+        """
+        Returns all the direct and indirect base classes.
+        """
+        to_go = list(self.bases)
+        all_bases = []
+        while to_go:
+            base = to_go.pop()
+            if base not in all_bases:
+                all_bases.append(base)
+                to_go.extend(base.related_class.bases)
+        return all_bases
+
+
+class CppTypedefDecl(CppDecl):
+    """
+    A typedef declaration.
+
+    Attributes
+    ----------
+    declaration : Optional[CppClassDecl]
+        The class named by the typedef, if it names a class
+    """
+
+    __slots__ = ("declaration",)
+
+    def __init__(
+        self, name: str, declaration: Optional[CppClassDecl] = None, **kwargs
+    ) -> None:
+        super().__init__(name, **kwargs)
+        self.declaration: Optional[CppClassDecl] = declaration
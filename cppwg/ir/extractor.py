@@ -0,0 +1,281 @@
+"""Extraction of compact declarations from pygccxml declarations."""
+
+from typing import Dict, Optional, Tuple, Union
+
+from pygccxml.declarations import class_t, type_traits, type_traits_classes
+
+from cppwg.ir.declarations import (
+    CppArgument,
+    CppBase,
+    CppClassDecl,
+    CppConstructorDecl,
+    CppEnumeration,
+    CppFreeFunctionDecl,
+    CppLocation,
+    CppMemberFunctionDecl,
+    CppType,
+)
+
+
+class CppDeclExtractor:
+    """
+    Convert pygccxml declarations into compact declarations.
+
+    Each pygccxml class is converted once, so identity checks between
+    extracted classes (e.g. a class and its derived classes' bases) behave as
+    they did for the pygccxml declarations. Classes which are only referred to
+    (e.g. base classes from outside the source tree) are extracted without
+    their members.
+
+    Attributes
+    ----------
+    classes : Dict[int, CppClassDecl]
+        Extracted classes, keyed by the id of the pygccxml declaration
+    full_classes : Dict[int, CppClassDecl]
+        Extracted classes which have had their members extracted
+    types : Dict[str, CppType]
+        Extracted types, keyed by type string
+    """
+
+    def __init__(self) -> None:
+        self.classes: Dict[int, CppClassDecl] = {}
+        self.full_classes: Dict[int, CppClassDecl] = {}
+        self.types: Dict[str, CppType] = {}
+
+    def extract_package(self, package_info: "PackageInfo") -> None:  # noqa: F821
+        """
+        Replace the pygccxml declarations in a package's info objects.
+
+        Parameters
+        ----------
+        package_info : PackageInfo
+            The package info, updated from the source namespace
+        """
+        for module_info in package_info.module_collection:
+            for class_info in module_info.class_collection:
+                class_info.decls = [
+                    self.extract_class(decl, members=True) for decl in class_info.decls
+                ]
+                class_info.base_decls = [
+                    self.extract_class(decl) for decl in class_info.base_decls
+                ]
+
+            for ff_info in module_info.free_function_collection:
+                ff_info.decls = [
+                    self.extract_free_function(decl) for decl in ff_info.decls
+                ]
+
+    def extract_location(
+        self, decl: "declaration_t"  # noqa: F821
+    ) -> Optional[CppLocation]:
+        """
+        Extract the location of a declaration.
+
+        Parameters
+        ----------
+        decl : declaration_t
+            The pygccxml declaration
+
+        Returns
+        -------
+        Optional[CppLocation]
+            The location, or None if the declaration has no location
+        """
+        if decl.location is None:
+            return None
+        return CppLocation(decl.location.file_name, decl.location.line)
+
+    def extract_type(self, decl_type: "type_t") -> CppType:  # noqa: F821
+        """
+        Extract a type, sharing the result between equal types.
+
+        Parameters
+        ----------
+        decl_type : type_t
+            The pygccxml type
+
+        Returns
+        -------
+        CppType
+            The type
+        """
+        decl_string = decl_type.decl_string
+        cpp_type = self.types.get(decl_string)
+        if cpp_type is None:
+            cpp_type = CppType(
+                decl_string,
+                type_traits.is_pointer(decl_type),
+                type_traits.is_reference(decl_type),
+                type_traits.remove_const(decl_type).decl_string,
+            )
+            self.types[decl_string] = cpp_type
+        return cpp_type
+
+    def extract_arguments(
+        self, calldef: "calldef_t"  # noqa: F821
+    ) -> Tuple[CppArgument, ...]:
+        """
+        Extract the arguments of a function.
+
+        Parameters
+        ----------
+        calldef : calldef_t
+            The pygccxml function declaration
+
+        Returns
+        -------
+        Tuple[CppArgument, ...]
+            The arguments
+        """
+        return tuple(
+            CppArgument(arg.name, self.extract_type(arg.decl_type), arg.default_value)
+            for arg in calldef.arguments
+        )
+
+    def extract_class(
+        self, decl: Union["class_t", CppClassDecl], members: bool = False  # noqa: F821
+    ) -> CppClassDecl:
+        """
+        Extract a class, reusing a previous extraction of the same class.
+
+        Parameters
+        ----------
+        decl : Union[class_t, CppClassDecl]
+            The pygccxml class declaration, or an already compact declaration
+        members : bool
+            Whether to extract the class members
+
+        Returns
+        -------
+        CppClassDecl
+            The class
+        """
+        # Front-ends emitting compact declarations need no conversion
+        if isinstance(decl, CppClassDecl):
+            return decl
+
+        class_decl = self.classes.get(id(decl))
+
+        if class_decl is None:
+            parent = None
+            if isinstance(decl.parent, class_t):
+                parent = self.extract_class(decl.parent)
+
+            class_decl = CppClassDecl(
+                decl.name,
+                location=self.extract_location(decl),
+                parent=parent,
+                class_type=getattr(decl, "class_type", "class"),
+                is_abstract=bool(getattr(decl, "is_abstract", False)),
+            )
+            self.classes[id(decl)] = class_decl
+
+            class_decl.bases = tuple(
+                CppBase(
+                    self.extract_class(base.related_class),
+                    base.access_type,
+                    base.is_virtual,
+                )
+                for base in getattr(decl, "bases", [])
+            )
+
+        if members and id(decl) not in self.full_classes:
+            self.full_classes[id(decl)] = class_decl
+
+            class_decl.constructors = tuple(
+                self.extract_constructor(ctor)
+                for ctor in decl.constructors(allow_empty=True)
+            )
+            class_decl.member_functions = tuple(
+                self.extract_member_function(method)
+                for method in decl.member_functions(allow_empty=True)
+            )
+            class_decl.enumerations = tuple(
+                CppEnumeration(enum.name, tuple(tuple(value) for value in enum.values))
+                for enum in decl.enumerations(allow_empty=True)
+            )
+
+        return class_decl
+
+    def extract_constructor(
+        self, decl: "constructor_t"  # noqa: F821
+    ) -> CppConstructorDecl:
+        """
+        Extract a constructor.
+
+        Parameters
+        ----------
+        decl : constructor_t
+            The pygccxml constructor declaration
+
+        Returns
+        -------
+        CppConstructorDecl
+            The constructor
+        """
+        return CppConstructorDecl(
+            decl.name,
+            is_copy_constructor=type_traits_classes.is_copy_constructor(decl),
+            location=self.extract_location(decl),
+            parent=self.extract_class(decl.parent),
+            arguments=self.extract_arguments(decl),
+            access_type=decl.access_type,
+            is_artificial=bool(decl.is_artificial),
+        )
+
+    def extract_member_function(
+        self, decl: "member_function_t"  # noqa: F821
+    ) -> CppMemberFunctionDecl:
+        """
+        Extract a member function.
+
+        Parameters
+        ----------
+        decl : member_function_t
+            The pygccxml member function declaration
+
+        Returns
+        -------
+        CppMemberFunctionDecl
+            The member function
+        """
+        return CppMemberFunctionDecl(
+            decl.name,
+            return_type=self.extract_type(decl.return_type),
+            has_static=bool(decl.has_static),
+            has_const=bool(decl.has_const),
+            virtuality=decl.virtuality,
+            location=self.extract_location(decl),
+            parent=self.extract_class(decl.parent),
+            arguments=self.extract_arguments(decl),
+            access_type=decl.access_type,
+            is_artificial=bool(decl.is_artificial),
+        )
+
+    def extract_free_function(
+        self, decl: Union["free_function_t", CppFreeFunctionDecl]  # noqa: F821
+    ) -> CppFreeFunctionDecl:
+        """
+        Extract a free function.
+
+        Parameters
+        ----------
+        decl : Union[free_function_t, CppFreeFunctionDecl]
+            The pygccxml free function declaration, or an already compact
+            declaration
+
+        Returns
+        -------
+        CppFreeFunctionDecl
+            The free function
+        """
+        if isinstance(decl, CppFreeFunctionDecl):
+            return decl
+
+        return CppFreeFunctionDecl(
+            decl.name,
+            return_type=self.extract_type(decl.return_type),
+            location=self.extract_location(decl),
+            arguments=self.extract_arguments(decl),
+            is_artificial=bool(decl.is_artificial),
+        )
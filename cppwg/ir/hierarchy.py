@@ -0,0 +1,192 @@
+"""Class hierarchy data shared by the wrapper writers."""
+
+from typing import Dict, Iterable, List, NamedTuple, Set, Tuple
+
+from cppwg.ir.declarations import CppClassDecl, CppMemberFunctionDecl
+
+
+class CppClassNode(NamedTuple):
+    """
+    Hierarchy data for a class.
+
+    Attributes
+    ----------
+    bases : Tuple[CppClassDecl, ...]
+        The direct base classes
+    recursive_bases : Tuple[CppClassDecl, ...]
+        The direct and indirect base classes
+    is_abstract : bool
+        Whether the class is abstract
+    has_abstract_base : bool
+        Whether any direct or indirect base class is abstract
+    has_private_pure_virtual : bool
+        Whether the class has a private pure virtual method
+    virtual_methods : Tuple[CppMemberFunctionDecl, ...]
+        The virtual methods declared in the class, which need trampoline
+        overrides; see `CppClassHierarchy.inherited_virtual_methods` for
+        those inherited from base classes
+    """
+
+    bases: Tuple[CppClassDecl, ...]
+    recursive_bases: Tuple[CppClassDecl, ...]
+    is_abstract: bool
+    has_abstract_base: bool
+    has_private_pure_virtual: bool
+    virtual_methods: Tuple[CppMemberFunctionDecl, ...]
+
+
+class CppClassHierarchy:
+    """
+    Hierarchy data for the classes to be wrapped, computed once per class.
+
+    The writers query the hierarchy for each class instead of walking its
+    bases and rescanning its member functions for every constructor and
+    method. Classes are keyed by identity, as compact declarations are
+    unique. Classes not added up front are added on first lookup.
+    """
+
+    def __init__(self) -> None:
+        self._nodes: Dict[int, CppClassNode] = {}
+
+    def add_package(self, package_info: "PackageInfo") -> None:  # noqa: F821
+        """
+        Add the classes of a package, after their declarations are extracted.
+
+        Parameters
+        ----------
+        package_info : PackageInfo
+            The package info
+        """
+        for module_info in package_info.module_collection:
+            for class_info in module_info.class_collection:
+                self.add_classes(class_info.decls)
+
+    def add_classes(self, class_decls: Iterable[CppClassDecl]) -> None:
+        """
+        Add classes to the hierarchy.
+
+        Parameters
+        ----------
+        class_decls : Iterable[CppClassDecl]
+            The class declarations
+        """
+        for class_decl in class_decls:
+            self.node(class_decl)
+
+    def node(self, class_decl: CppClassDecl) -> CppClassNode:
+        """
+        Get the hierarchy data for a class.
+
+        Parameters
+        ----------
+        class_decl : CppClassDecl
+            The class declaration
+
+        Returns
+        -------
+        CppClassNode
+            The hierarchy data
+        """
+        node = self._nodes.get(id(class_decl))
+        if node is None:
+            node = self._build_node(class_decl)
+            self._nodes[id(class_decl)] = node
+        return node
+
+    def _build_node(self, class_decl: CppClassDecl) -> CppClassNode:
+        """
+        Compute the hierarchy data for a class.
+
+        Parameters
+        ----------
+        class_decl : CppClassDecl
+            The class declaration
+
+        Returns
+        -------
+        CppClassNode
+            The hierarchy data
+        """
+        bases = tuple(base.related_class for base in class_decl.bases)
+
+        recursive_bases: List[CppClassDecl] = []
+        seen_ids: Set[int] = set()
+        for base in bases:
+            for decl in (base,) + self.node(base).recursive_bases:
+                if id(decl) not in seen_ids:
+                    seen_ids.add(id(decl))
+                    recursive_bases.append(decl)
+
+        virtual_methods = tuple(
+            method
+            for method in class_decl.member_functions
+            if method.virtuality in ("virtual", "pure virtual")
+        )
+
+        return CppClassNode(
+            bases=bases,
+            recursive_bases=tuple(recursive_bases),
+            is_abstract=class_decl.is_abstract,
+            has_abstract_base=any(base.is_abstract for base in recursive_bases),
+            has_private_pure_virtual=any(
+                method.virtuality == "pure virtual" and method.access_type == "private"
+                for method in class_decl.member_functions
+            ),
+            virtual_methods=virtual_methods,
+        )
+
+    def inherited_virtual_methods(
+        self, class_decl: CppClassDecl
+    ) -> Tuple[CppMemberFunctionDecl, ...]:
+        """
+        Get the virtual methods of base classes which a class doesn't override.
+
+        Together with the class's own virtual methods, these are the methods
+        a trampoline could override. They are computed on request, as the
+        writers only override the methods each class declares. Only base
+        classes extracted with their members contribute methods.
+
+        Parameters
+        ----------
+        class_decl : CppClassDecl
+            The class declaration
+
+        Returns
+        -------
+        Tuple[CppMemberFunctionDecl, ...]
+            The inherited virtual methods, nearest base classes first
+        """
+        signatures: Set[Tuple] = {
+            self.signature(method) for method in class_decl.member_functions
+        }
+        inherited_virtual_methods = []
+        for base in self.node(class_decl).recursive_bases:
+            for method in base.member_functions:
+                if method.parent is not base or method.virtuality == "not virtual":
+                    continue
+                signature = self.signature(method)
+                if signature not in signatures:
+                    signatures.add(signature)
+                    inherited_virtual_methods.append(method)
+        return tuple(inherited_virtual_methods)
+
+    @staticmethod
+    def signature(method: CppMemberFunctionDecl) -> Tuple:
+        """
+        Get the signature of a method, for finding overrides.
+
+        Parameters
+        ----------
+        method : CppMemberFunctionDecl
+            The method declaration
+
+        Returns
+        -------
+        Tuple
+            The method name, argument types and constness
+        """
+        return (
+            method.name,
+            tuple(arg_type.decl_string for arg_type in method.argument_types),
+            method.has_const,
+        )
@@ -0,0 +1,148 @@
+"""Filter for restricting CastXML output to declarations from given files."""
+
+import os
+import re
+from typing import Callable, Dict, List, Set, Tuple
+from xml.etree import ElementTree
+from xml.sax.saxutils import quoteattr
+
+# Matches element ids in attribute values e.g. "_12", "_12c", "public:_12"
+CASTXML_ID_REGEX = re.compile(r"_\d+\w*")
+
+# Attributes which don't need to be followed when collecting references
+CASTXML_UNFOLLOWED_ATTRIBUTES = ("id", "members", "file", "name", "mangled")
+
+
+def filter_castxml_output(
+    xml_path: str, out_path: str, keep_file: Callable[[str], bool]
+) -> Tuple[List[str], int, int]:
+    """
+    Write a copy of a CastXML output file restricted to declarations from some files.
+
+    Declarations located in files accepted by `keep_file` are kept along with
+    everything they refer to (types, enclosing scopes, base classes etc.), so
+    that the declaration tree still links. Scopes from other files are kept as
+    shells holding only the referenced members, so e.g. a `std::vector<double>`
+    argument keeps `std::vector<double>` but none of its methods. Classes that
+    are direct or indirect bases of classes in the kept files keep all their
+    members, so that inherited pure virtual methods can still be seen.
+
+    The file is read twice as a stream; the full element tree is never built.
+
+    Parameters
+    ----------
+    xml_path : str
+        The path to the CastXML output file
+    out_path : str
+        The path to write the filtered file to
+    keep_file : Callable[[str], bool]
+        Returns True if declarations from the given (absolute) file path are kept
+
+    Returns
+    -------
+    Tuple[List[str], int, int]
+        All the files seen by CastXML, and the number of elements kept and read
+    """
+    # First pass: collect each top-level element's references and file
+    references: Dict[str, Tuple[str, ...]] = {}
+    element_files: Dict[str, str] = {}
+    file_names: Dict[str, str] = {}
+    class_members: Dict[str, Tuple[str, ...]] = {}
+    class_bases: Dict[str, List[str]] = {}
+
+    depth = 0
+    root = None
+    element_id = None
+    element_refs: Set[str] = set()
+
+    for event, elem in ElementTree.iterparse(xml_path, events=("start", "end")):
+        if event == "start":
+            depth += 1
+            if depth == 1:
+                root = elem
+            elif depth == 2:
+                element_id = elem.get("id")
+                element_refs = set()
+                if elem.tag == "File":
+                    file_names[element_id] = os.path.abspath(elem.get("name", ""))
+                elif "file" in elem.attrib:
+                    element_files[element_id] = elem.get("file")
+                if elem.tag in ("Class", "Struct"):
+                    class_members[element_id] = tuple(elem.get("members", "").split())
+                    class_bases[element_id] = []
+            elif depth == 3 and elem.tag == "Base" and element_id in class_bases:
+                class_bases[element_id].append(elem.get("type"))
+
+            if depth >= 2:
+                for attr, value in elem.attrib.items():
+                    if attr not in CASTXML_UNFOLLOWED_ATTRIBUTES:
+                        element_refs.update(CASTXML_ID_REGEX.findall(value))
+            continue
+
+        depth -= 1
+        if depth == 1:
+            if element_id:
+                references[element_id] = tuple(element_refs)
+            root.clear()
+
+    kept_file_ids = {
+        file_id for file_id, file_name in file_names.items() if keep_file(file_name)
+    }
+    roots = [
+        element_id
+        for element_id, file_id in element_files.items()
+        if file_id in kept_file_ids
+    ]
+
+    # Keep the members of the bases of classes in the kept files
+    base_stack = [element_id for element_id in roots if element_id in class_bases]
+    seen_class_ids = set(base_stack)
+    while base_stack:
+        for base_id in class_bases[base_stack.pop()]:
+            if base_id in class_bases and base_id not in seen_class_ids:
+                seen_class_ids.add(base_id)
+                base_stack.append(base_id)
+                roots.append(base_id)
+                roots.extend(class_members[base_id])
+
+    # Keep the declarations in the kept files, and everything they refer to
+    kept_ids: Set[str] = set(file_names)
+    stack = roots
+    while stack:
+        element_id = stack.pop()
+        if element_id in kept_ids or element_id not in references:
+            continue
+        kept_ids.add(element_id)
+        stack.extend(references[element_id])
+
+    # Second pass: write the kept elements
+    num_read = len(references)
+    with open(out_path, "wb") as out_file:
+        out_file.write(b'<?xml version="1.0"?>\n')
+
+        depth = 0
+        for event, elem in ElementTree.iterparse(xml_path, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                if depth == 1:
+                    root = elem
+                    root_tag = elem.tag
+                    root_attrs = "".join(
+                        f" {attr}={quoteattr(value)}"
+                        for attr, value in elem.attrib.items()
+                    )
+                    out_file.write(f"<{root_tag}{root_attrs}>\n".encode("utf-8"))
+                continue
+
+            depth -= 1
+            if depth == 1:
+                if elem.get("id") in kept_ids:
+                    elem.tail = "\n"
+                    out_file.write(
+                        ElementTree.tostring(elem, encoding="unicode").encode("utf-8")
+                    )
+                root.clear()
+            elif depth == 0:
+                out_file.write(f"</{root_tag}>\n".encode("utf-8"))
+
+    return sorted(set(file_names.values())), len(kept_ids), num_read
@@ -0,0 +1,1660 @@
+"""Parser for C++ source code using libclang in-process."""
+
+import ctypes
+import logging
+import os
+import shlex
+import struct
+import subprocess
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from cppwg.ir.declarations import (
+    CppArgument,
+    CppBase,
+    CppClassDecl,
+    CppConstructorDecl,
+    CppDecl,
+    CppEnumeration,
+    CppFreeFunctionDecl,
+    CppLocation,
+    CppMemberFunctionDecl,
+    CppType,
+    CppTypedefDecl,
+)
+from cppwg.utils.constants import CPPWG_EXT
+from cppwg.utils.path_index import PathIndex
+
+try:
+    from clang import cindex
+except ImportError:
+    cindex = None
+
+# Prefix for the names of declarations written to the probe file
+CLANG_PROBE_PREFIX = "__cppwg_probe"
+
+# Fundamental type names, as spelled by CastXML
+CLANG_FUNDAMENTAL_TYPES = {
+    "VOID": "void",
+    "BOOL": "bool",
+    "CHAR_U": "char",
+    "CHAR_S": "char",
+    "SCHAR": "signed char",
+    "UCHAR": "unsigned char",
+    "WCHAR": "wchar_t",
+    "CHAR16": "char16_t",
+    "CHAR32": "char32_t",
+    "SHORT": "short int",
+    "USHORT": "short unsigned int",
+    "INT": "int",
+    "UINT": "unsigned int",
+    "LONG": "long int",
+    "ULONG": "long unsigned int",
+    "LONGLONG": "long long int",
+    "ULONGLONG": "long long unsigned int",
+    "INT128": "__int128",
+    "UINT128": "unsigned __int128",
+    "FLOAT": "float",
+    "DOUBLE": "double",
+    "LONGDOUBLE": "long double",
+    "NULLPTR": "::std::nullptr_t",
+}
+
+# Literal suffixes by type, as printed by clang
+CLANG_INTEGER_SUFFIXES = {
+    "UINT": "U",
+    "LONG": "L",
+    "ULONG": "UL",
+    "LONGLONG": "LL",
+    "ULONGLONG": "ULL",
+}
+CLANG_FLOAT_SUFFIXES = {"FLOAT": "F", "LONGDOUBLE": "L"}
+
+# CXEvalResultKind values from clang-c/Index.h
+CLANG_EVAL_INT = 1
+CLANG_EVAL_FLOAT = 2
+
+
+class CppClangParser:
+    """
+    Parser for C++ source code using the libclang Python bindings.
+
+    The header collection is parsed in-process and the declarations from the
+    source tree are emitted directly as compact declarations, without the
+    XML round trip through CastXML and pygccxml. Declarations are converted
+    following CastXML's conventions (type strings, default values, compiler
+    added constructors), so the info objects and writers see the same
+    declarations from either front-end.
+
+    libclang doesn't visit the members of template instantiations. To get at
+    them, the header collection is parsed once to find the instantiations,
+    then reparsed with a probe file that names their members through using
+    declarations and typedefs.
+
+    Attributes
+    ----------
+    cflags : str
+        Optional cflags to be passed to clang e.g. "-std=c++17"
+    compiler : str
+        Optional compiler path to take system include paths from
+    source_includes : List[str]
+        The list of source include paths
+    source_root : str
+        The root directory of the source code
+    source_path_index : PathIndex
+        An index for checking if files are in the source root
+    wrapper_header_collection : str
+        The path to the header collection file
+    probe_path : str
+        The path to the (unsaved) probe file which includes the header collection
+    """
+
+    def __init__(
+        self,
+        source_root: str,
+        wrapper_header_collection: str,
+        source_includes: List[str],
+        cflags: str = "",
+        compiler: Optional[str] = None,
+    ):
+        self.source_root: str = source_root
+        self.wrapper_header_collection: str = wrapper_header_collection
+        self.source_includes: List[str] = source_includes
+        self.cflags: str = cflags
+        self.compiler: Optional[str] = compiler
+
+        self.source_path_index: PathIndex = PathIndex([self.source_root])
+
+        self.probe_path: str = os.path.join(
+            os.path.dirname(self.wrapper_header_collection),
+            f"probe.{CPPWG_EXT}.cpp",
+        )
+
+        # Probe names, keyed by the spelling of the probed class
+        self._probe_names: Dict[Tuple[str, bool], str] = {}
+        self._probe_code: List[str] = []
+
+        # Probe declarations from the reparse, and the probes for each class
+        self._probe_decls: Dict[str, "cindex.Cursor"] = {}
+        self._probes_by_class: Dict[str, List[str]] = {}
+
+        # Converted declarations
+        self._classes: Dict[str, CppClassDecl] = {}
+        self._full_classes: Set[str] = set()
+        self._types: Dict[Tuple[str, bool], CppType] = {}
+        self._decls: List[CppDecl] = []
+
+        # Template arguments of the class whose members are being extracted
+        self._template_arguments: Dict[str, str] = {}
+
+    @staticmethod
+    def system_include_paths(compiler: str) -> List[str]:
+        """
+        Get the system include paths searched by a compiler.
+
+        The libclang wheels don't ship with the compiler's system headers, so
+        the include paths are taken from the compiler's verbose output.
+
+        Parameters
+        ----------
+        compiler : str
+            The path to the compiler e.g. "/usr/bin/g++"
+
+        Returns
+        -------
+        List[str]
+            The system include paths, in search order
+        """
+        logger = logging.getLogger()
+
+        try:
+            result = subprocess.run(
+                [compiler, "-x", "c++", "-E", "-v", "-"],
+                input="",
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+        except (OSError, subprocess.CalledProcessError):
+            logger.warning(f"Could not get system include paths from {compiler}.")
+            return []
+
+        include_paths = []
+        in_search_list = False
+        for line in result.stderr.splitlines():
+            if line.startswith("#include <...> search starts here:"):
+                in_search_list = True
+            elif line.startswith("End of search list."):
+                break
+            elif in_search_list:
+                include_paths.append(line.split(" (")[0].strip())
+
+        return include_paths
+
+    def clang_args(self) -> List[str]:
+        """
+        Get the command line arguments for clang.
+
+        Returns
+        -------
+        List[str]
+            The arguments e.g. ["-x", "c++", "-std=c++17", "-I/path/to/src"]
+        """
+        args = ["-x", "c++"] + shlex.split(self.cflags)
+
+        args += [f"-I{include_path}" for include_path in self.source_includes]
+
+        if self.compiler:
+            system_include_paths = self.system_include_paths(self.compiler)
+            if system_include_paths:
+                args.append("-nostdinc")
+                args += [f"-isystem{path}" for path in system_include_paths]
+
+        return args
+
+    def parse(self) -> List[CppDecl]:
+        """
+        Parse the C++ source code from the header collection using libclang.
+
+        Returns
+        -------
+        List[CppDecl]
+            The class, free function and typedef declarations from the source
+            tree and the header collection
+
+        Raises
+        ------
+        ImportError
+            If the libclang Python bindings aren't installed
+        RuntimeError
+            If clang reports errors in the source code
+        """
+        logger = logging.getLogger()
+
+        if cindex is None:
+            logger.error(
+                "Could not import the libclang Python bindings. "
+                "Install them with `pip install libclang`."
+            )
+            raise ImportError("clang.cindex")
+
+        self.register_functions()
+
+        options = (
+            cindex.TranslationUnit.PARSE_INCOMPLETE
+            | cindex.TranslationUnit.PARSE_PRECOMPILED_PREAMBLE
+            | cindex.TranslationUnit.PARSE_SKIP_FUNCTION_BODIES
+        )
+        include_line = f'#include "{self.wrapper_header_collection}"\n'
+
+        logger.info("Parsing source code for declarations with libclang.")
+        index = cindex.Index.create()
+        translation_unit = index.parse(
+            self.probe_path,
+            args=self.clang_args(),
+            unsaved_files=[(self.probe_path, include_line)],
+            options=options,
+        )
+        self.check_diagnostics(translation_unit)
+
+        # Reparse with a probe for the members of template instantiations
+        probe_code = self.write_probes(translation_unit)
+        if probe_code:
+            logger.info("Reparsing with probes for template instantiations.")
+            translation_unit.reparse(
+                unsaved_files=[(self.probe_path, include_line + probe_code)],
+                options=options,
+            )
+            self.check_diagnostics(translation_unit)
+
+        logger.info("Extracting source declarations.")
+        return self.extract(translation_unit)
+
+    @staticmethod
+    def register_functions() -> None:
+        """
+        Register libclang functions not wrapped by the Python bindings.
+        """
+        lib = cindex.conf.lib
+
+        lib.clang_Cursor_isInlineNamespace.argtypes = [cindex.Cursor]
+        lib.clang_Cursor_isInlineNamespace.restype = ctypes.c_uint
+
+        lib.clang_Cursor_Evaluate.argtypes = [cindex.Cursor]
+        lib.clang_Cursor_Evaluate.restype = ctypes.c_void_p
+        lib.clang_EvalResult_getKind.argtypes = [ctypes.c_void_p]
+        lib.clang_EvalResult_getKind.restype = ctypes.c_int
+        lib.clang_EvalResult_isUnsignedInt.argtypes = [ctypes.c_void_p]
+        lib.clang_EvalResult_isUnsignedInt.restype = ctypes.c_uint
+        lib.clang_EvalResult_getAsLongLong.argtypes = [ctypes.c_void_p]
+        lib.clang_EvalResult_getAsLongLong.restype = ctypes.c_longlong
+        lib.clang_EvalResult_getAsUnsigned.argtypes = [ctypes.c_void_p]
+        lib.clang_EvalResult_getAsUnsigned.restype = ctypes.c_ulonglong
+        lib.clang_EvalResult_getAsDouble.argtypes = [ctypes.c_void_p]
+        lib.clang_EvalResult_getAsDouble.restype = ctypes.c_double
+        lib.clang_EvalResult_dispose.argtypes = [ctypes.c_void_p]
+        lib.clang_EvalResult_dispose.restype = None
+
+    def check_diagnostics(self, translation_unit: "cindex.TranslationUnit") -> None:
+        """
+        Raise an error if clang reported errors outside the probe file.
+
+        Errors in the probe file are expected e.g. for using declarations of
+        private members, and don't stop the members being found.
+
+        Parameters
+        ----------
+        translation_unit : cindex.TranslationUnit
+            The parsed translation unit
+        """
+        logger = logging.getLogger()
+
+        errors = [
+            diagnostic
+            for diagnostic in translation_unit.diagnostics
+            if diagnostic.severity >= cindex.Diagnostic.Error
+            and not (
+                diagnostic.location.file
+                and diagnostic.location.file.name == self.probe_path
+            )
+        ]
+        for diagnostic in errors:
+            logger.error(str(diagnostic))
+
+        if errors:
+            raise RuntimeError(f"libclang failed to parse {self.probe_path}")
+
+    def is_in_source(self, cursor: "cindex.Cursor") -> bool:
+        """
+        Check if a declaration is in the source tree or the header collection.
+
+        Parameters
+        ----------
+        cursor : cindex.Cursor
+            The declaration
+
+        Returns
+        -------
+        bool
+            True if the declaration's file is in the source tree or is the
+            header collection
+        """
+        if not cursor.location.file:
+            return False
+        file_name = cursor.location.file.name
+        return (
+            file_name == self.wrapper_header_collection
+            or self.source_path_index.contains(file_name)
+        )
+
+    def walk_scopes(self, cursor: "cindex.Cursor") -> Iterator["cindex.Cursor"]:
+        """
+        Walk the declarations in a scope and its nested namespaces.
+
+        Parameters
+        ----------
+        cursor : cindex.Cursor
+            The scope e.g. the translation unit
+
+        Yields
+        ------
+        cindex.Cursor
+            The declarations, in order
+        """
+        for child in cursor.get_children():
+            if child.kind in (
+                cindex.CursorKind.NAMESPACE,
+                cindex.CursorKind.LINKAGE_SPEC,
+            ):
+                yield from self.walk_scopes(child)
+            else:
+                yield child
+
+    @staticmethod
+    def is_record(cursor: Optional["cindex.Cursor"]) -> bool:
+        """
+        Check if a cursor is a class, struct or union.
+        """
+        return cursor is not None and cursor.kind in (
+            cindex.CursorKind.CLASS_DECL,
+            cindex.CursorKind.STRUCT_DECL,
+            cindex.CursorKind.UNION_DECL,
+        )
+
+    def spelling(self, cursor: "cindex.Cursor") -> str:
+        """
+        Get the canonical spelling of a class or enum e.g. "Foo<int, 2>::Bar".
+
+        clang leaves out default template arguments of enclosing classes when
+        spelling a nested type, so nested types are spelled from the spelling
+        of their enclosing class.
+
+        Parameters
+        ----------
+        cursor : cindex.Cursor
+            The class or enum declaration
+
+        Returns
+        -------
+        str
+            The spelling, without a leading "::"
+        """
+        spelling = cursor.type.get_canonical().spelling
+        if not self.is_record(cursor.semantic_parent):
+            return spelling
+
+        # Find the last "::" outside template arguments
+        depth = 0
+        name_start = 0
+        for i, char in enumerate(spelling):
+            if char == "<":
+                depth += 1
+            elif char == ">":
+                depth -= 1
+            elif depth == 0 and spelling.startswith("::", i):
+                name_start = i + 2
+
+        return f"{self.spelling(cursor.semantic_parent)}::{spelling[name_start:]}"
+
+    def instantiated_from(self, cursor: "cindex.Cursor") -> Optional["cindex.Cursor"]:
+        """
+        Get the template pattern of a class instantiation.
+
+        Parameters
+        ----------
+        cursor : cindex.Cursor
+            The class declaration
+
+        Returns
+        -------
+        Optional[cindex.Cursor]
+            The pattern the class members are instantiated from, or None if the
+            class members are written out e.g. in a plain class or an explicit
+            specialization
+        """
+        pattern = cindex.conf.lib.clang_getSpecializedCursorTemplate(cursor)
+        if pattern is None:
+            return None
+
+        for child in cursor.get_children():
+            if (
+                child.kind.is_declaration()
+                or child.kind == cindex.CursorKind.CXX_BASE_SPECIFIER
+            ):
+                return None
+
+        return pattern
+
+    def write_probes(self, translation_unit: "cindex.TranslationUnit") -> str:
+        """
+        Write probe code for the members and bases of template instantiations.
+
+        Parameters
+        ----------
+        translation_unit : cindex.TranslationUnit
+            The translation unit parsed without probes
+
+        Returns
+        -------
+        str
+            The probe code, to be appended to the probe file
+        """
+        for cursor in self.walk_scopes(translation_unit.cursor):
+            if not self.is_record(cursor) or not self.is_in_source(cursor):
+                continue
+
+            pattern = self.instantiated_from(cursor)
+            if pattern is not None:
+                self.probe_class(self.spelling(cursor), pattern, members=True)
+            elif cursor.is_definition():
+                self.probe_bases(cursor)
+
+        return "".join(self._probe_code)
+
+    def probe_class(
+        self, spelling: str, pattern: "cindex.Cursor", members: bool
+    ) -> None:
+        """
+        Write probe code for a template instantiation.
+
+        A typedef names the instantiated class. If members are needed, a
+        struct derived from the class has a using declaration for each member
+        name in the pattern, which makes clang instantiate the members. Each
+        dependent base class is named by a typedef of its injected class name.
+
+        Parameters
+        ----------
+        spelling : str
+            A C++ name for the instantiated class e.g. "Foo<2>"
+        pattern : cindex.Cursor
+            The template pattern the class is instantiated from
+        members : bool
+            Whether to probe the class members as well as its bases
+        """
+        if (spelling, members) in self._probe_names:
+            return
+
+        probe_name = f"{CLANG_PROBE_PREFIX}_{len(self._probe_names)}"
+        self._probe_names[(spelling, members)] = probe_name
+        self._probe_code.append(f"typedef {spelling} {probe_name};\n")
+
+        if members and pattern.kind != cindex.CursorKind.UNION_DECL:
+            class_name = pattern.spelling
+            member_names = [class_name]
+
+            for child in pattern.get_children():
+                if child.kind == cindex.CursorKind.CXX_METHOD:
+                    if not child.spelling.startswith("operator"):
+                        member_names.append(child.spelling)
+
+                elif child.kind == cindex.CursorKind.ENUM_DECL:
+                    if not child.is_anonymous():
+                        member_names.append(child.spelling)
+                    elif not child.is_scoped_enum():
+                        member_names += [
+                            value.spelling for value in child.get_children()
+                        ]
+
+                elif self.is_record(child) and child.is_definition():
+                    self.probe_class(f"{probe_name}::{child.spelling}", child, True)
+
+            using_lines = "".join(
+                f"  using {probe_name}::{name};\n"
+                for name in dict.fromkeys(member_names)
+            )
+            self._probe_code.append(
+                f"struct {probe_name}_members : {probe_name}\n{{\n{using_lines}}};\n"
+            )
+
+        self.probe_bases(pattern, probe_name)
+
+    def probe_bases(
+        self, pattern: "cindex.Cursor", probe_name: Optional[str] = None
+    ) -> None:
+        """
+        Write probe code for the base classes of a class.
+
+        Base classes which are template instantiations are probed for their
+        own bases.
+
+        Parameters
+        ----------
+        pattern : cindex.Cursor
+            The class declaration, or the template pattern of an instantiation
+        probe_name : Optional[str]
+            The name of the instantiation's probe typedef, used to name its
+            dependent base classes
+        """
+        logger = logging.getLogger()
+
+        base_specifiers = [
+            child
+            for child in pattern.get_children()
+            if child.kind == cindex.CursorKind.CXX_BASE_SPECIFIER
+        ]
+        for i, base_specifier in enumerate(base_specifiers):
+            base_decl = base_specifier.type.get_canonical().get_declaration()
+
+            # Non-dependent base classes are resolved directly
+            if self.is_record(base_decl):
+                base_pattern = self.instantiated_from(base_decl)
+                if base_pattern is not None:
+                    base_spelling = self.spelling(base_decl)
+                    self.probe_class(base_spelling, base_pattern, members=False)
+                continue
+
+            # Dependent base classes are named by their injected class name
+            template_refs = [
+                child
+                for child in base_specifier.get_children()
+                if child.kind == cindex.CursorKind.TEMPLATE_REF
+            ]
+            if not template_refs or probe_name is None:
+                logger.warning(
+                    f"Could not resolve base class {base_specifier.spelling} "
+                    f"of {pattern.spelling}"
+                )
+                continue
+
+            base_template = template_refs[-1].referenced
+            base_name = f"{probe_name}_base_{i}"
+            self._probe_code.append(
+                f"typedef {probe_name}::{base_template.spelling} {base_name};\n"
+            )
+            self.probe_class(base_name, base_template, members=False)
+
+    def extract(self, translation_unit: "cindex.TranslationUnit") -> List[CppDecl]:
+        """
+        Convert the parsed declarations into compact declarations.
+
+        Parameters
+        ----------
+        translation_unit : cindex.TranslationUnit
+            The translation unit, reparsed with probes
+
+        Returns
+        -------
+        List[CppDecl]
+            The class, free function and typedef declarations from the source
+            tree and the header collection
+        """
+        # Collect the probe declarations
+        for cursor in translation_unit.cursor.get_children():
+            if cursor.spelling.startswith(CLANG_PROBE_PREFIX):
+                self._probe_decls[cursor.spelling] = cursor
+
+        for probe_name in self._probe_names.values():
+            probe = self._probe_decls.get(probe_name)
+            if probe is not None:
+                class_type = probe.underlying_typedef_type.get_canonical()
+                class_spelling = self.spelling(class_type.get_declaration())
+                self._probes_by_class.setdefault(class_spelling, []).append(probe_name)
+
+        free_function_usrs = set()
+
+        for cursor in self.walk_scopes(translation_unit.cursor):
+            if not self.is_in_source(cursor):
+                continue
+
+            if self.is_record(cursor):
+                if cursor.is_definition() or self.instantiated_from(cursor):
+                    self.extract_class(cursor, members=True)
+
+            elif cursor.kind == cindex.CursorKind.FUNCTION_DECL:
+                usr = cursor.get_usr()
+                if usr in free_function_usrs or not self.is_wrappable_function(cursor):
+                    continue
+                free_function_usrs.add(usr)
+                self._decls.append(self.extract_free_function(cursor))
+
+            elif cursor.kind in (
+                cindex.CursorKind.TYPEDEF_DECL,
+                cindex.CursorKind.TYPE_ALIAS_DECL,
+            ):
+                self._decls.append(self.extract_typedef(cursor))
+
+        return self._decls
+
+    def extract_location(self, cursor: "cindex.Cursor") -> Optional[CppLocation]:
+        """
+        Extract the location of a declaration.
+
+        Parameters
+        ----------
+        cursor : cindex.Cursor
+            The declaration
+
+        Returns
+        -------
+        Optional[CppLocation]
+            The location, or None if the declaration has no location
+        """
+        location = cursor.location
+        if not location.file:
+            return None
+        return CppLocation(location.file.name, location.line)
+
+    def qualified_name(self, cursor: "cindex.Cursor") -> str:
+        """
+        Get the qualified name of a declaration e.g. "std::size_t".
+
+        Parameters
+        ----------
+        cursor : cindex.Cursor
+            The declaration
+
+        Returns
+        -------
+        str
+            The qualified name, without a leading "::"
+        """
+        parts = [cursor.spelling]
+
+        parent = cursor.semantic_parent
+        while parent is not None and parent.kind != cindex.CursorKind.TRANSLATION_UNIT:
+            if self.is_record(parent):
+                parts.append(self.spelling(parent))
+                break
+
+            if parent.kind == cindex.CursorKind.NAMESPACE:
+                if parent.spelling and not (
+                    cindex.conf.lib.clang_Cursor_isInlineNamespace(parent)
+                ):
+                    parts.append(parent.spelling)
+
+            elif parent.kind != cindex.CursorKind.LINKAGE_SPEC:
+                parts.append(parent.spelling)
+
+            parent = parent.semantic_parent
+
+        return "::".join(reversed(parts))
+
+    def class_name(self, cursor: "cindex.Cursor") -> str:
+        """
+        Get the name of a class e.g. "Foo<2, 2>" for an instantiation.
+
+        Parameters
+        ----------
+        cursor : cindex.Cursor
+            The class declaration
+
+        Returns
+        -------
+        str
+            The class name, without its enclosing scopes
+        """
+        full_name = self.spelling(cursor)
+
+        scope = self.qualified_name(cursor)[: -len(cursor.spelling) or None]
+        if self.is_record(cursor.semantic_parent):
+            scope = self.spelling(cursor.semantic_parent) + "::"
+
+        if scope and full_name.startswith(scope):
+            return full_name.replace(scope, "", 1)
+        return full_name
+
+    def type_string(self, clang_type: "cindex.Type", remove_const=False) -> str:
+        """
+        Get the CastXML type string of a type e.g. "::std::vector<int> const &".
+
+        Parameters
+        ----------
+        clang_type : cindex.Type
+            The type
+        remove_const : bool
+            Whether to remove a top level const
+
+        Returns
+        -------
+        str
+            The type string
+        """
+        kind = clang_type.kind
+        TypeKind = cindex.TypeKind
+
+        if kind == TypeKind.ELABORATED:
+            type_string = self.type_string(clang_type.get_named_type())
+        elif kind == TypeKind.POINTER:
+            type_string = self.type_string(clang_type.get_pointee()) + " *"
+        elif kind == TypeKind.LVALUEREFERENCE:
+            type_string = self.type_string(clang_type.get_pointee()) + " &"
+        elif kind == TypeKind.RVALUEREFERENCE:
+            type_string = self.type_string(clang_type.get_pointee()) + " &&"
+        elif kind == TypeKind.TYPEDEF:
+            type_string = "::" + self.qualified_name(clang_type.get_declaration())
+        elif kind in (TypeKind.RECORD, TypeKind.ENUM):
+            declaration = clang_type.get_declaration()
+            type_string = "::" + self.spelling(declaration)
+        elif kind == TypeKind.CONSTANTARRAY:
+            element_string = self.type_string(clang_type.element_type)
+            type_string = f"{element_string}[{clang_type.element_count}]"
+        elif kind == TypeKind.INCOMPLETEARRAY:
+            type_string = self.type_string(clang_type.element_type) + "[]"
+        elif kind.name in CLANG_FUNDAMENTAL_TYPES:
+            type_string = CLANG_FUNDAMENTAL_TYPES[kind.name]
+        else:
+            # Type sugar e.g. substituted template parameters
+            canonical_type = clang_type.get_canonical()
+            if canonical_type.kind != kind:
+                return self.type_string(canonical_type, remove_const)
+            return canonical_type.spelling
+
+        if clang_type.is_const_qualified() and not remove_const:
+            type_string += " const"
+        if clang_type.is_volatile_qualified():
+            type_string += " volatile"
+
+        return type_string
+
+    def extract_type(self, clang_type: "cindex.Type") -> CppType:
+        """
+        Extract a type, sharing the result between equal types.
+
+        Parameters
+        ----------
+        clang_type : cindex.Type
+            The type
+
+        Returns
+        -------
+        CppType
+            The type
+        """
+        decl_string = self.type_string(clang_type)
+        canonical_kind = clang_type.get_canonical().kind
+
+        cpp_type = self._types.get(decl_string)
+        if cpp_type is None:
+            cpp_type = CppType(
+                decl_string,
+                canonical_kind == cindex.TypeKind.POINTER,
+                canonical_kind == cindex.TypeKind.LVALUEREFERENCE,
+                self.type_string(clang_type, remove_const=True),
+            )
+            self._types[decl_string] = cpp_type
+        return cpp_type
+
+    def evaluate(self, cursor: "cindex.Cursor") -> Optional[object]:
+        """
+        Evaluate a constant expression.
+
+        Parameters
+        ----------
+        cursor : cindex.Cursor
+            The expression
+
+        Returns
+        -------
+        Optional[object]
+            The int or float value, or None if it can't be evaluated
+        """
+        lib = cindex.conf.lib
+
+        result = lib.clang_Cursor_Evaluate(cursor)
+        if not result:
+            return None
+
+        value = None
+        kind = lib.clang_EvalResult_getKind(result)
+        if kind == CLANG_EVAL_INT:
+            if lib.clang_EvalResult_isUnsignedInt(result):
+                value = lib.clang_EvalResult_getAsUnsigned(result)
+            else:
+                value = lib.clang_EvalResult_getAsLongLong(result)
+        elif kind == CLANG_EVAL_FLOAT:
+            value = lib.clang_EvalResult_getAsDouble(result)
+
+        lib.clang_EvalResult_dispose(result)
+        return value
+
+    @staticmethod
+    def float_string(value: float, type_kind: str) -> str:
+        """
+        Print a floating point literal as clang does e.g. "0." or "2.5F".
+
+        Parameters
+        ----------
+        value : float
+            The literal value
+        type_kind : str
+            The literal's type kind e.g. "DOUBLE"
+
+        Returns
+        -------
+        str
+            The literal
+        """
+        literal = repr(value)
+        if type_kind == "FLOAT":
+            # Use the shortest representation which round trips as a float
+            single = struct.unpack("f", struct.pack("f", value))[0]
+            for precision in range(1, 10):
+                literal = f"{single:.{precision}g}"
+                if struct.unpack("f", struct.pack("f", float(literal)))[0] == single:
+                    break
+
+        if "e" in literal:
+            mantissa, exponent = literal.split("e")
+            if "." not in mantissa:
+                mantissa += ".0"
+            literal = f"{mantissa}E{int(exponent)}"
+        elif literal.endswith(".0"):
+            literal = literal[:-1]
+        elif "." not in literal and literal.lstrip("-").isdigit():
+            literal += "."
+
+        return literal + CLANG_FLOAT_SUFFIXES.get(type_kind, "")
+
+    def expression_string(self, cursor: "cindex.Cursor") -> str:
+        """
+        Print an expression as CastXML does e.g. "::foo::Kind::LARGE".
+
+        Parameters
+        ----------
+        cursor : cindex.Cursor
+            The expression e.g. a default argument
+
+        Returns
+        -------
+        str
+            The expression
+        """
+        CursorKind = cindex.CursorKind
+        kind = cursor.kind
+
+        children = [
+            child for child in cursor.get_children() if child.kind.is_expression()
+        ]
+        tokens = [token.spelling for token in cursor.get_tokens()]
+
+        if kind == CursorKind.INTEGER_LITERAL:
+            value = self.evaluate(cursor)
+            if value is not None:
+                suffix = CLANG_INTEGER_SUFFIXES.get(
+                    cursor.type.get_canonical().kind.name
+                )
+                return f"{value}{suffix or ''}"
+
+        elif kind == CursorKind.FLOATING_LITERAL:
+            value = self.evaluate(cursor)
+            if value is not None:
+                type_kind = cursor.type.get_canonical().kind.name
+                return self.float_string(value, type_kind)
+
+        elif kind in (CursorKind.STRING_LITERAL, CursorKind.CHARACTER_LITERAL):
+            if tokens and tokens[0][-1:] in ("'", '"'):
+                return " ".join(tokens)
+
+        elif kind == CursorKind.CXX_BOOL_LITERAL_EXPR:
+            value = self.evaluate(cursor)
+            if value is not None:
+                return "true" if value else "false"
+
+        elif kind == CursorKind.CXX_NULL_PTR_LITERAL_EXPR:
+            return "nullptr"
+
+        elif kind == CursorKind.GNU_NULL_EXPR:
+            # NULL expands to __null
+            return "__null"
+
+        elif kind == CursorKind.PAREN_EXPR and children:
+            return f"({self.expression_string(children[0])})"
+
+        elif kind == CursorKind.UNARY_OPERATOR and children:
+            operand = self.expression_string(children[0])
+            operand_start = children[0].extent.start.offset
+            operator = [
+                token.spelling
+                for token in cursor.get_tokens()
+                if token.extent.start.offset < operand_start
+            ]
+            if operator:
+                return operator[0] + operand
+            return operand + tokens[-1]
+
+        elif kind == CursorKind.BINARY_OPERATOR and len(children) == 2:
+            lhs_end = children[0].extent.end.offset
+            operator = [
+                token.spelling
+                for token in cursor.get_tokens()
+                if token.extent.start.offset >= lhs_end
+            ]
+            lhs = self.expression_string(children[0])
+            rhs = self.expression_string(children[1])
+            return f"{lhs} {operator[0]} {rhs}"
+
+        elif kind == CursorKind.DECL_REF_EXPR and cursor.referenced is not None:
+            referenced = cursor.referenced
+            if referenced.kind == CursorKind.ENUM_CONSTANT_DECL:
+                enum_name = self.qualified_name(referenced.semantic_parent)
+                return f"::{enum_name}::{referenced.spelling}"
+            if referenced.kind == CursorKind.TEMPLATE_NON_TYPE_PARAMETER:
+                return f"{referenced.semantic_parent.spelling}::{referenced.spelling}"
+            return self.qualified_name(referenced)
+
+        elif kind == CursorKind.INIT_LIST_EXPR:
+            return "{" + ", ".join(self.expression_string(c) for c in children) + "}"
+
+        elif kind == CursorKind.CALL_EXPR:
+            arguments = ", ".join(self.expression_string(c) for c in children)
+            if tokens[:2] == ["=", "{"]:
+                # Copy list initialization e.g. std::vector<double> data = {}
+                return f"{{{arguments}}}"
+            referenced = cursor.referenced
+            if referenced is None and cursor.type.kind == cindex.TypeKind.DEPENDENT:
+                # A call in a template pattern e.g. std::make_shared<Foo<DIM>>()
+                return self.join_tokens(
+                    self._template_arguments.get(token, token) for token in tokens
+                )
+            if referenced is None or referenced.kind == CursorKind.CONSTRUCTOR:
+                # A temporary object e.g. Foo() or T()
+                return f"{self.temporary_type_string(cursor.type)}({arguments})"
+            return f"{self.qualified_name(referenced)}({arguments})"
+
+        elif kind == CursorKind.UNEXPOSED_EXPR:
+            if len(children) == 1:
+                return self.expression_string(children[0])
+            if not children and tokens[-2:] == ["(", ")"]:
+                # A value initialized temporary e.g. std::vector<int>()
+                return f"{self.temporary_type_string(cursor.type)}()"
+
+        # Fall back to the evaluated value, then the source tokens
+        value = self.evaluate(cursor)
+        if isinstance(value, int):
+            return str(value)
+        return " ".join(tokens)
+
+    def temporary_type_string(self, clang_type: "cindex.Type") -> str:
+        """
+        Get the type string of a temporary object e.g. "geo::VecD" in "geo::VecD()".
+
+        Parameters
+        ----------
+        clang_type : cindex.Type
+            The type of the temporary
+
+        Returns
+        -------
+        str
+            The type string, without a leading "::"
+        """
+        if clang_type.kind in (
+            cindex.TypeKind.ELABORATED,
+            cindex.TypeKind.TYPEDEF,
+            cindex.TypeKind.RECORD,
+            cindex.TypeKind.ENUM,
+        ):
+            return self.type_string(clang_type, remove_const=True).lstrip(":")
+        return clang_type.spelling
+
+    @staticmethod
+    def join_tokens(tokens: Iterable[str]) -> str:
+        """
+        Join expression tokens, with spaces only where they are needed.
+
+        Parameters
+        ----------
+        tokens : Iterable[str]
+            The tokens e.g. ["std", "::", "make_shared", "<", "int", ">"]
+
+        Returns
+        -------
+        str
+            The expression e.g. "std::make_shared<int>"
+        """
+        expression = ""
+        for token in tokens:
+            if expression and (expression[-1].isalnum() or expression[-1] == "_"):
+                if token[0].isalnum() or token[0] == "_":
+                    expression += " "
+            expression += token
+        return expression
+
+    def template_arguments(self, cursor: "cindex.Cursor") -> Dict[str, str]:
+        """
+        Get the template arguments of a class template instantiation.
+
+        Parameters
+        ----------
+        cursor : cindex.Cursor
+            The class declaration e.g. for "Foo<2, 3>"
+
+        Returns
+        -------
+        Dict[str, str]
+            The template arguments keyed by parameter name e.g. {"DIM": "2"},
+            or an empty dict if the class isn't an instantiation
+        """
+        pattern = self.instantiated_from(cursor)
+        if pattern is None:
+            return {}
+
+        parameters = [
+            child.spelling
+            for child in pattern.get_children()
+            if child.kind
+            in (
+                cindex.CursorKind.TEMPLATE_TYPE_PARAMETER,
+                cindex.CursorKind.TEMPLATE_NON_TYPE_PARAMETER,
+                cindex.CursorKind.TEMPLATE_TEMPLATE_PARAMETER,
+            )
+        ]
+
+        # Split the argument list at commas outside nested template arguments
+        class_name = self.class_name(cursor)
+        arguments = []
+        depth = 0
+        argument = ""
+        argument_start = class_name.find("<") + 1
+        for char in class_name[argument_start:-1]:
+            if char == "," and depth == 0:
+                arguments.append(argument.strip())
+                argument = ""
+                continue
+            if char in "<(":
+                depth += 1
+            elif char in ">)":
+                depth -= 1
+            argument += char
+        arguments.append(argument.strip())
+
+        return dict(zip(parameters, arguments))
+
+    @staticmethod
+    def default_expression(cursor: "cindex.Cursor") -> Optional["cindex.Cursor"]:
+        """
+        Get the default value expression of a function parameter.
+
+        Parameters
+        ----------
+        cursor : cindex.Cursor
+            The parameter declaration
+
+        Returns
+        -------
+        Optional[cindex.Cursor]
+            The default value, or None if the parameter doesn't have one
+        """
+        # Skip expressions in the parameter type e.g. template arguments
+        equals_offsets = [
+            token.extent.start.offset
+            for token in cursor.get_tokens()
+            if token.spelling == "="
+        ]
+        if not equals_offsets:
+            return None
+
+        for child in cursor.get_children():
+            if (
+                child.kind.is_expression()
+                and child.extent.start.offset >= equals_offsets[0]
+            ):
+                return child
+        return None
+
+    def extract_arguments(
+        self, cursor: "cindex.Cursor", pattern: Optional["cindex.Cursor"] = None
+    ) -> Tuple[CppArgument, ...]:
+        """
+        Extract the arguments of a function.
+
+        Parameters
+        ----------
+        cursor : cindex.Cursor
+            The function declaration
+        pattern : Optional[cindex.Cursor]
+            The template pattern of the function, to take default values from
+
+        Returns
+        -------
+        Tuple[CppArgument, ...]
+            The arguments
+        """
+        default_source = list((pattern or cursor).get_arguments())
+
+        self._template_arguments = {}
+        if pattern is not None and self.is_record(cursor.semantic_parent):
+            self._template_arguments = self.template_arguments(cursor.semantic_parent)
+
+        arguments = []
+        for i, argument in enumerate(cursor.get_arguments()):
+            default_value = None
+            if i < len(default_source):
+                default_expression = self.default_expression(default_source[i])
+                if default_expression is not None:
+                    default_value = self.expression_string(default_expression)
+
+            arguments.append(
+                CppArgument(
+                    argument.spelling or f"arg{i}",
+                    self.extract_type(argument.type),
+                    default_value,
+                )
+            )
+
+        return tuple(arguments)
+
+    def extract_class(
+        self, cursor: "cindex.Cursor", members: bool = False
+    ) -> CppClassDecl:
+        """
+        Extract a class, reusing a previous extraction of the same class.
+
+        Parameters
+        ----------
+        cursor : cindex.Cursor
+            The class declaration
+        members : bool
+            Whether to extract the class members
+
+        Returns
+        -------
+        CppClassDecl
+            The class
+        """
+        key = self.spelling(cursor)
+        class_decl = self._classes.get(key)
+        pattern = self.instantiated_from(cursor)
+
+        if class_decl is None:
+            parent = None
+            if self.is_record(cursor.semantic_parent):
+                parent = self.extract_class(cursor.semantic_parent)
+
+            class_type = {
+                cindex.CursorKind.STRUCT_DECL: "struct",
+                cindex.CursorKind.UNION_DECL: "union",
+            }.get(cursor.kind, "class")
+
+            class_decl = CppClassDecl(
+                self.class_name(cursor),
+                location=self.extract_location(cursor),
+                parent=parent,
+                class_type=class_type,
+                is_abstract=bool(cursor.is_abstract_record()),
+            )
+            self._classes[key] = class_decl
+
+            class_decl.bases = tuple(self.extract_bases(cursor, pattern))
+
+        if members and key not in self._full_classes:
+            self._full_classes.add(key)
+            if self.is_in_source(cursor):
+                self._decls.append(class_decl)
+
+            constructors: List[CppConstructorDecl] = []
+            member_functions: List[CppMemberFunctionDecl] = []
+            enumerations: List[CppEnumeration] = []
+            self.extract_members(
+                cursor, class_decl, constructors, member_functions, enumerations
+            )
+            class_decl.constructors = tuple(constructors)
+            class_decl.member_functions = tuple(member_functions)
+            class_decl.enumerations = tuple(enumerations)
+
+        return class_decl
+
+    def extract_bases(
+        self, cursor: "cindex.Cursor", pattern: Optional["cindex.Cursor"]
+    ) -> List[CppBase]:
+        """
+        Extract the direct base classes of a class.
+
+        Parameters
+        ----------
+        cursor : cindex.Cursor
+            The class declaration
+        pattern : Optional[cindex.Cursor]
+            The template pattern of the class, if it is an instantiation
+
+        Returns
+        -------
+        List[CppBase]
+            The base classes
+        """
+        probe_names = []
+        if pattern is not None:
+            probe_names = self._probes_by_class.get(self.spelling(cursor), [])
+
+        base_specifiers = [
+            child
+            for child in (pattern or cursor).get_children()
+            if child.kind == cindex.CursorKind.CXX_BASE_SPECIFIER
+        ]
+
+        bases = []
+        for i, base_specifier in enumerate(base_specifiers):
+            base_decl = base_specifier.type.get_canonical().get_declaration()
+
+            # Dependent base classes are resolved through the probe typedefs
+            for probe_name in probe_names:
+                if self.is_record(base_decl):
+                    break
+                base_typedef = self._probe_decls.get(f"{probe_name}_base_{i}")
+                if base_typedef is not None:
+                    base_type = base_typedef.underlying_typedef_type.get_canonical()
+                    base_decl = base_type.get_declaration()
+
+            if not self.is_record(base_decl):
+                continue
+
+            bases.append(
+                CppBase(
+                    self.extract_class(base_decl),
+                    base_specifier.access_specifier.name.lower(),
+                    bool(cindex.conf.lib.clang_isVirtualBase(base_specifier)),
+                )
+            )
+
+        return bases
+
+    def instantiated_members(
+        self, cursor: "cindex.Cursor", pattern: "cindex.Cursor"
+    ) -> List["cindex.Cursor"]:
+        """
+        Get the members of a template instantiation from the probes.
+
+        Parameters
+        ----------
+        cursor : cindex.Cursor
+            The class declaration
+        pattern : cindex.Cursor
+            The template pattern of the class
+
+        Returns
+        -------
+        List[cindex.Cursor]
+            The constructors, methods, enumerations and nested classes of the
+            instantiation, in the order of the pattern's declarations
+        """
+        lib = cindex.conf.lib
+        class_spelling = self.spelling(cursor)
+
+        members: Dict[str, Tuple[int, "cindex.Cursor"]] = {}
+
+        member_refs = [
+            ref
+            for probe_name in self._probes_by_class.get(class_spelling, [])
+            if f"{probe_name}_members" in self._probe_decls
+            for using_decl in self._probe_decls[f"{probe_name}_members"].get_children()
+            for ref in using_decl.get_children()
+            if ref.kind == cindex.CursorKind.OVERLOADED_DECL_REF
+        ]
+        for member_ref in member_refs:
+            for i in range(lib.clang_getNumOverloadedDecls(member_ref)):
+                member = lib.clang_getOverloadedDecl(member_ref, i)
+                if member.kind == cindex.CursorKind.ENUM_CONSTANT_DECL:
+                    member = member.semantic_parent
+
+                if member.kind not in (
+                    cindex.CursorKind.CONSTRUCTOR,
+                    cindex.CursorKind.CXX_METHOD,
+                    cindex.CursorKind.ENUM_DECL,
+                ):
+                    continue
+
+                # Skip members found in base classes
+                parent_spelling = self.spelling(member.semantic_parent)
+                if parent_spelling != class_spelling:
+                    continue
+
+                # Skip members declared by the compiler
+                member_pattern = lib.clang_getSpecializedCursorTemplate(member)
+                if member_pattern is None:
+                    if member.kind != cindex.CursorKind.ENUM_DECL:
+                        continue
+                    member_pattern = member
+
+                members.setdefault(
+                    member.get_usr(), (member_pattern.extent.start.offset, member)
+                )
+
+        # Default constructors are not found by using declarations, so they
+        # are taken from the pattern
+        for child in pattern.get_children():
+            if (
+                child.kind == cindex.CursorKind.CONSTRUCTOR
+                and not any(child.get_arguments())
+                and not child.is_deleted_method()
+            ):
+                members.setdefault(child.get_usr(), (child.extent.start.offset, child))
+
+        # Nested classes are probed separately
+        for child in pattern.get_children():
+            if not self.is_record(child) or not child.is_definition():
+                continue
+
+            nested_spelling = f"{class_spelling}::{child.spelling}"
+            for probe_name in self._probes_by_class.get(nested_spelling, [])[:1]:
+                nested_type = self._probe_decls[probe_name].underlying_typedef_type
+                members[probe_name] = (
+                    child.extent.start.offset,
+                    nested_type.get_canonical().get_declaration(),
+                )
+
+        return [member for _, member in sorted(members.values(), key=lambda m: m[0])]
+
+    def extract_members(
+        self,
+        cursor: "cindex.Cursor",
+        class_decl: CppClassDecl,
+        constructors: List[CppConstructorDecl],
+        member_functions: List[CppMemberFunctionDecl],
+        enumerations: List[CppEnumeration],
+    ) -> None:
+        """
+        Extract the members of a class, including members of nested classes.
+
+        Parameters
+        ----------
+        cursor : cindex.Cursor
+            The class declaration
+        class_decl : CppClassDecl
+            The extracted class
+        constructors : List[CppConstructorDecl]
+            The list to add constructors to
+        member_functions : List[CppMemberFunctionDecl]
+            The list to add member functions to
+        enumerations : List[CppEnumeration]
+            The list to add enumerations to
+        """
+        pattern = self.instantiated_from(cursor)
+        if pattern is None:
+            members = list(cursor.get_children())
+        else:
+            members = self.instantiated_members(cursor, pattern)
+
+        for member in members:
+            if member.kind == cindex.CursorKind.CONSTRUCTOR:
+                if self.is_wrappable_function(member):
+                    constructors.append(self.extract_constructor(member, class_decl))
+
+            elif member.kind == cindex.CursorKind.CXX_METHOD:
+                if self.is_wrappable_function(member):
+                    member_functions.append(
+                        self.extract_member_function(member, class_decl)
+                    )
+
+            elif member.kind == cindex.CursorKind.ENUM_DECL:
+                enumerations.append(self.extract_enumeration(member))
+
+            elif self.is_record(member) and not member.is_anonymous():
+                if member.is_definition() or self.instantiated_from(member):
+                    nested_decl = self.extract_class(member, members=True)
+                    constructors += nested_decl.constructors
+                    member_functions += nested_decl.member_functions
+                    enumerations += nested_decl.enumerations
+
+        constructors += self.implicit_constructors(
+            class_decl, pattern or cursor, self.spelling(cursor)
+        )
+
+    @staticmethod
+    def is_wrappable_function(cursor: "cindex.Cursor") -> bool:
+        """
+        Check if a function would be reported by CastXML.
+
+        CastXML skips operators, deleted functions and functions taking
+        rvalue references.
+
+        Parameters
+        ----------
+        cursor : cindex.Cursor
+            The function declaration
+
+        Returns
+        -------
+        bool
+            True if the function should be extracted
+        """
+        if cursor.spelling.startswith("operator"):
+            return False
+
+        if (
+            cursor.kind != cindex.CursorKind.FUNCTION_DECL
+            and cursor.is_deleted_method()
+        ):
+            return False
+
+        for argument in cursor.get_arguments():
+            if argument.type.kind == cindex.TypeKind.RVALUEREFERENCE:
+                return False
+
+        return True
+
+    def implicit_constructors(
+        self, class_decl: CppClassDecl, cursor: "cindex.Cursor", class_spelling: str
+    ) -> List[CppConstructorDecl]:
+        """
+        Get the constructors the compiler adds to a class.
+
+        Parameters
+        ----------
+        class_decl : CppClassDecl
+            The extracted class
+        cursor : cindex.Cursor
+            The class declaration, or the template pattern of an instantiation
+        class_spelling : str
+            The full name of the class e.g. "Foo<2>::Bar"
+
+        Returns
+        -------
+        List[CppConstructorDecl]
+            The default constructor, if the class has no user-declared
+            constructors and can be default constructed, and the copy
+            constructor, if the class has no user-declared copy or move
+            constructor or move assignment operator
+        """
+        CursorKind = cindex.CursorKind
+
+        has_constructor = False
+        has_copy = False
+        has_move = False
+        has_uninitialized_member = False
+
+        for child in cursor.get_children():
+            if child.kind == CursorKind.CONSTRUCTOR:
+                has_constructor = True
+                has_copy = has_copy or child.is_copy_constructor()
+                has_move = has_move or child.is_move_constructor()
+
+            elif child.kind == CursorKind.FUNCTION_TEMPLATE:
+                has_constructor = has_constructor or child.spelling == cursor.spelling
+
+            elif child.kind == CursorKind.CXX_METHOD:
+                has_move = has_move or child.is_move_assignment_operator_method()
+
+            elif child.kind == CursorKind.FIELD_DECL:
+                field_type = child.type.get_canonical()
+                is_initialized = any(
+                    c.kind.is_expression() for c in child.get_children()
+                )
+                if not is_initialized and (
+                    field_type.kind == cindex.TypeKind.LVALUEREFERENCE
+                    or (
+                        field_type.is_const_qualified()
+                        and field_type.kind != cindex.TypeKind.RECORD
+                    )
+                ):
+                    has_uninitialized_member = True
+
+        constructors = []
+        location = class_decl.location
+        name = cursor.spelling
+
+        if not has_constructor and not has_uninitialized_member:
+            constructors.append(
+                CppConstructorDecl(
+                    name, location=location, parent=class_decl, is_artificial=True
+                )
+            )
+
+        if not has_copy and not has_move:
+            copy_string = f"::{class_spelling} const &"
+            copy_type = CppType(copy_string, False, True, copy_string)
+            constructors.append(
+                CppConstructorDecl(
+                    name,
+                    is_copy_constructor=True,
+                    location=location,
+                    parent=class_decl,
+                    arguments=(CppArgument("arg0", copy_type, None),),
+                    is_artificial=True,
+                )
+            )
+
+        return constructors
+
+    def extract_constructor(
+        self, cursor: "cindex.Cursor", class_decl: CppClassDecl
+    ) -> CppConstructorDecl:
+        """
+        Extract a constructor.
+
+        Parameters
+        ----------
+        cursor : cindex.Cursor
+            The constructor declaration
+        class_decl : CppClassDecl
+            The extracted class declaring the constructor
+
+        Returns
+        -------
+        CppConstructorDecl
+            The constructor
+        """
+        pattern = cindex.conf.lib.clang_getSpecializedCursorTemplate(cursor)
+        # Constructors of a template pattern are spelled e.g. "Foo<N>"
+        return CppConstructorDecl(
+            cursor.spelling.split("<")[0],
+            is_copy_constructor=bool(cursor.is_copy_constructor()),
+            location=self.extract_location(cursor),
+            parent=class_decl,
+            arguments=self.extract_arguments(cursor, pattern),
+            access_type=cursor.access_specifier.name.lower(),
+        )
+
+    def extract_member_function(
+        self, cursor: "cindex.Cursor", class_decl: CppClassDecl
+    ) -> CppMemberFunctionDecl:
+        """
+        Extract a member function.
+
+        Parameters
+        ----------
+        cursor : cindex.Cursor
+            The member function declaration
+        class_decl : CppClassDecl
+            The extracted class declaring the member function
+
+        Returns
+        -------
+        CppMemberFunctionDecl
+            The member function
+        """
+        virtuality = "not virtual"
+        if cursor.is_pure_virtual_method():
+            virtuality = "pure virtual"
+        elif cursor.is_virtual_method():
+            virtuality = "virtual"
+
+        pattern = cindex.conf.lib.clang_getSpecializedCursorTemplate(cursor)
+        return CppMemberFunctionDecl(
+            cursor.spelling,
+            return_type=self.extract_type(cursor.result_type),
+            has_static=bool(cursor.is_static_method()),
+            has_const=bool(cursor.is_const_method()),
+            virtuality=virtuality,
+            location=self.extract_location(cursor),
+            parent=class_decl,
+            arguments=self.extract_arguments(cursor, pattern),
+            access_type=cursor.access_specifier.name.lower(),
+        )
+
+    def extract_enumeration(self, cursor: "cindex.Cursor") -> CppEnumeration:
+        """
+        Extract an enumeration.
+
+        Parameters
+        ----------
+        cursor : cindex.Cursor
+            The enumeration declaration
+
+        Returns
+        -------
+        CppEnumeration
+            The enumeration
+        """
+        return CppEnumeration(
+            "" if cursor.is_anonymous() else cursor.spelling,
+            tuple(
+                (value.spelling, value.enum_value)
+                for value in cursor.get_children()
+                if value.kind == cindex.CursorKind.ENUM_CONSTANT_DECL
+            ),
+        )
+
+    def extract_free_function(self, cursor: "cindex.Cursor") -> CppFreeFunctionDecl:
+        """
+        Extract a free function.
+
+        Parameters
+        ----------
+        cursor : cindex.Cursor
+            The free function declaration
+
+        Returns
+        -------
+        CppFreeFunctionDecl
+            The free function
+        """
+        return CppFreeFunctionDecl(
+            cursor.spelling,
+            return_type=self.extract_type(cursor.result_type),
+            location=self.extract_location(cursor),
+            arguments=self.extract_arguments(cursor),
+        )
+
+    def extract_typedef(self, cursor: "cindex.Cursor") -> CppTypedefDecl:
+        """
+        Extract a typedef.
+
+        Parameters
+        ----------
+        cursor : cindex.Cursor
+            The typedef declaration
+
+        Returns
+        -------
+        CppTypedefDecl
+            The typedef, with the class it names if there is one
+        """
+        declaration = None
+        type_decl = cursor.underlying_typedef_type.get_canonical().get_declaration()
+        if self.is_record(type_decl):
+            declaration = self.extract_class(type_decl)
+
+        return CppTypedefDecl(
+            cursor.spelling,
+            location=self.extract_location(cursor),
+            declaration=declaration,
+        )
@@ -0,0 +1,292 @@
+"""Index for fast lookups of parsed C++ declarations."""
+
+from typing import Dict, List, Optional, Union
+
+from pygccxml.declarations import (
+    class_t,
+    declaration_utils,
+    free_function_t,
+    templates,
+    typedef_t,
+)
+from pygccxml.declarations.runtime_errors import declaration_not_found_t
+
+from cppwg.ir.declarations import CppClassDecl, CppFreeFunctionDecl, CppTypedefDecl
+
+
+class CppDeclIndex:
+    """
+    An index over the declarations parsed from the source tree.
+
+    The index is built in a single pass over the source namespace, and maps
+    class names, typedef names, free function names, source files and base
+    classes to declarations. Lookups are dictionary lookups, so they don't
+    rescan the namespace like pygccxml queries do.
+
+    Class names are normalized in the same way as pygccxml name queries,
+    so e.g. "Foo<2,2>" and "Foo<2, 2>" find the same class.
+
+    Declarations can be pygccxml declarations from the CastXML front-end or
+    compact declarations from the libclang front-end.
+
+    Attributes
+    ----------
+    classes : List[class_t]
+        All class declarations, in parse order
+    free_functions : List[free_function_t]
+        All free function declarations, in parse order
+    typedefs : List[typedef_t]
+        All typedef declarations, in parse order
+    """
+
+    def __init__(self, source_ns: Optional["namespace_t"] = None) -> None:  # noqa: F821
+        """
+        Create an index, optionally adding declarations from a namespace.
+
+        Parameters
+        ----------
+        source_ns : Optional[namespace_t]
+            The namespace holding the parsed source declarations
+        """
+        self.classes: List[class_t] = []
+        self.free_functions: List[free_function_t] = []
+        self.typedefs: List[typedef_t] = []
+
+        self._classes_by_name: Dict[str, List[class_t]] = {}
+        self._free_functions_by_name: Dict[str, List[free_function_t]] = {}
+        self._typedefs_by_name: Dict[str, List[typedef_t]] = {}
+        self._decls_by_file: Dict[str, List["declaration_t"]] = {}  # noqa: F821
+        self._derived_by_base: Dict[str, List[class_t]] = {}
+
+        if source_ns is not None:
+            self.add_decls(source_ns.declarations)
+
+    @staticmethod
+    def class_key(decl: Union[class_t, CppClassDecl]) -> Union[str, int]:
+        """
+        Get the key identifying a class in the base class lookup.
+
+        pygccxml classes are keyed by their full name, as classes merged from
+        separately parsed shards can have more than one declaration object.
+        Compact declarations are unique, so they are keyed by identity.
+
+        Parameters
+        ----------
+        decl : Union[class_t, CppClassDecl]
+            The class declaration
+
+        Returns
+        -------
+        Union[str, int]
+            The key
+        """
+        if isinstance(decl, CppClassDecl):
+            return id(decl)
+        return declaration_utils.full_name(decl)
+
+    @staticmethod
+    def normalize_name(name: str) -> str:
+        """
+        Normalize a class name e.g. "Foo< 2,2 >" -> "Foo<2, 2>".
+
+        Parameters
+        ----------
+        name : str
+            The class name
+
+        Returns
+        -------
+        str
+            The normalized class name
+        """
+        return templates.normalize(name)
+
+    def add_decls(self, decls: List["declaration_t"]) -> None:  # noqa: F821
+        """
+        Add declarations to the index.
+
+        The declarations are expected to be a flat list, as produced by the
+        source parser; nested declarations are not searched. Declarations
+        already in the index are skipped.
+
+        Parameters
+        ----------
+        decls : List[declaration_t]
+            The declarations to add
+        """
+        seen_ids = {id(decl) for decl in self.classes}
+
+        for decl in decls:
+            if decl.location:
+                self._decls_by_file.setdefault(decl.location.file_name, []).append(decl)
+
+            if isinstance(decl, (class_t, CppClassDecl)):
+                if id(decl) in seen_ids:
+                    continue
+                seen_ids.add(id(decl))
+                self.classes.append(decl)
+
+                names = {self.normalize_name(decl.name)}
+                names.add(self.normalize_name(getattr(decl, "partial_name", decl.name)))
+                for name in names:
+                    self._classes_by_name.setdefault(name, []).append(decl)
+
+                for base in decl.bases:
+                    base_key = self.class_key(base.related_class)
+                    self._derived_by_base.setdefault(base_key, []).append(decl)
+
+            elif isinstance(decl, (free_function_t, CppFreeFunctionDecl)):
+                self.free_functions.append(decl)
+                self._free_functions_by_name.setdefault(decl.name, []).append(decl)
+
+            elif isinstance(decl, (typedef_t, CppTypedefDecl)):
+                self.typedefs.append(decl)
+                self._typedefs_by_name.setdefault(decl.name, []).append(decl)
+
+    def find_class(self, name: str) -> class_t:
+        """
+        Get the class with the given name.
+
+        Parameters
+        ----------
+        name : str
+            The class name e.g. "Foo<2, 2>"
+
+        Returns
+        -------
+        class_t
+            The first class declaration parsed with that name
+
+        Raises
+        ------
+        declaration_not_found_t
+            If there is no class with that name
+        """
+        decls = self._classes_by_name.get(self.normalize_name(name))
+        if not decls:
+            raise declaration_not_found_t(f"class {name}")
+        return decls[0]
+
+    def find_typedef(self, name: str) -> typedef_t:
+        """
+        Get the typedef with the given name.
+
+        Parameters
+        ----------
+        name : str
+            The typedef name e.g. "Foo_2_2"
+
+        Returns
+        -------
+        typedef_t
+            The first typedef declaration parsed with that name
+
+        Raises
+        ------
+        declaration_not_found_t
+            If there is no typedef with that name
+        """
+        decls = self._typedefs_by_name.get(name)
+        if not decls:
+            raise declaration_not_found_t(f"typedef {name}")
+        return decls[0]
+
+    def find_typedef_class(self, name: str) -> class_t:
+        """
+        Get the class named by the typedef with the given name.
+
+        Parameters
+        ----------
+        name : str
+            The typedef name e.g. "Foo_2_2"
+
+        Returns
+        -------
+        class_t
+            The class declaration named by the first typedef with that name
+
+        Raises
+        ------
+        declaration_not_found_t
+            If there is no typedef with that name, or it doesn't name a class
+        """
+        typedef_decl = self.find_typedef(name)
+        if isinstance(typedef_decl, CppTypedefDecl):
+            class_decl = typedef_decl.declaration
+        else:
+            class_decl = getattr(typedef_decl.decl_type, "declaration", None)
+
+        if class_decl is None:
+            raise declaration_not_found_t(f"class for typedef {name}")
+        return class_decl
+
+    def find_free_functions(self, name: str) -> List[free_function_t]:
+        """
+        Get the free functions with the given name.
+
+        Parameters
+        ----------
+        name : str
+            The free function name
+
+        Returns
+        -------
+        List[free_function_t]
+            The free function declarations (i.e. overloads) with that name
+        """
+        return list(self._free_functions_by_name.get(name, []))
+
+    def decls_in_file(self, file_name: str) -> List["declaration_t"]:  # noqa: F821
+        """
+        Get the declarations located in a source file.
+
+        Parameters
+        ----------
+        file_name : str
+            The path to the source file
+
+        Returns
+        -------
+        List[declaration_t]
+            The declarations in the file
+        """
+        return list(self._decls_by_file.get(file_name, []))
+
+    @property
+    def source_files(self) -> List[str]:
+        """
+        Returns the paths to all the files with declarations in the index.
+        """
+        return list(self._decls_by_file)
+
+    def base_classes(self, decl: class_t) -> List[class_t]:
+        """
+        Get the direct base classes of a class.
+
+        Parameters
+        ----------
+        decl : class_t
+            The class declaration
+
+        Returns
+        -------
+        List[class_t]
+            The base class declarations
+        """
+        return [base.related_class for base in decl.bases]
+
+    def derived_classes(self, decl: class_t) -> List[class_t]:
+        """
+        Get the indexed classes directly derived from a class.
+
+        Parameters
+        ----------
+        decl : class_t
+            The class declaration
+
+        Returns
+        -------
+        List[class_t]
+            The derived class declarations
+        """
+        return list(self._derived_by_base.get(self.class_key(decl), []))
@@ -0,0 +1,140 @@
+"""Utilities for merging declarations parsed from separate translation units."""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pygccxml.declarations import class_t, declaration_utils, typedef_t
+
+
+def declaration_key(decl: "declaration_t") -> Tuple[str, str, str, int]:  # noqa: F821
+    """
+    Get a key identifying a declaration across separate parses.
+
+    The key is made up of the declaration type, its string representation
+    (which includes the full name and signature) and its location.
+
+    Parameters
+    ----------
+    decl : declaration_t
+        The declaration
+
+    Returns
+    -------
+    Tuple[str, str, str, int]
+        The declaration key
+    """
+    return (
+        decl.__class__.__name__,
+        str(decl),
+        decl.location.file_name,
+        decl.location.line,
+    )
+
+
+def merge_declarations(
+    decl_lists: Iterable[List["declaration_t"]],  # noqa: F821
+    preferred_file: Optional[str] = None,
+) -> List["declaration_t"]:  # noqa: F821
+    """
+    Merge lists of declarations, dropping duplicates.
+
+    Classes are matched by their full name, so that a class instantiated in
+    more than one translation unit is only kept once, along with its members.
+    Other declarations are matched by their declaration key. Where duplicates
+    are found, the first one seen is kept unless a class is located in the
+    preferred file (e.g. an explicit instantiation in the header collection).
+    Class hierarchy and typedef references are then relinked to the kept
+    declarations.
+
+    Parameters
+    ----------
+    decl_lists : Iterable[List[declaration_t]]
+        The lists of declarations to merge, in order of precedence
+    preferred_file : Optional[str]
+        Classes located in this file take precedence over their duplicates
+
+    Returns
+    -------
+    List[declaration_t]
+        The merged declarations
+    """
+    decl_lists = list(decl_lists)
+
+    # Choose which copy of each class to keep
+    kept_classes: Dict[str, class_t] = {}
+    for decl_list in decl_lists:
+        for decl in decl_list:
+            if not isinstance(decl, class_t):
+                continue
+            name = declaration_utils.full_name(decl)
+            kept_class = kept_classes.get(name)
+            if kept_class is None or (
+                preferred_file
+                and decl.location.file_name == preferred_file
+                and kept_class.location.file_name != preferred_file
+            ):
+                kept_classes[name] = decl
+
+    kept_class_ids = {id(decl) for decl in kept_classes.values()}
+
+    merged: List["declaration_t"] = []  # noqa: F821
+    seen_keys = set()
+
+    for decl_list in decl_lists:
+        for decl in decl_list:
+            # Keep classes chosen above, along with all of their members
+            if isinstance(decl, class_t) and id(decl) not in kept_class_ids:
+                continue
+
+            parent = decl.parent
+            in_kept_class = True
+            while isinstance(parent, class_t):
+                if id(parent) not in kept_class_ids:
+                    in_kept_class = False
+                    break
+                parent = parent.parent
+            if not in_kept_class:
+                continue
+
+            key = declaration_key(decl)
+            if key in seen_keys:
+                continue
+            seen_keys.add(key)
+            merged.append(decl)
+
+    relink_declarations(merged)
+
+    return merged
+
+
+def relink_declarations(decls: List["declaration_t"]) -> None:  # noqa: F821
+    """
+    Point base, derived and typedef references at classes in the declaration list.
+
+    Declarations from separate parses refer to their own copies of shared
+    classes. This rebinds those references to the copies in `decls` so that
+    identity checks on related classes work across the merged declarations.
+
+    Parameters
+    ----------
+    decls : List[declaration_t]
+        The declarations to relink
+    """
+    class_map: Dict[str, class_t] = {}
+    for decl in decls:
+        if isinstance(decl, class_t):
+            class_map.setdefault(declaration_utils.full_name(decl), decl)
+
+    for decl in decls:
+        if isinstance(decl, class_t):
+            for hierarchy_info in decl.bases + decl.derived:
+                related_name = declaration_utils.full_name(hierarchy_info.related_class)
+                related_class = class_map.get(related_name)
+                if related_class is not None:
+                    hierarchy_info.related_class = related_class
+
+        elif isinstance(decl, typedef_t):
+            declaration = getattr(decl.decl_type, "declaration", None)
+            if isinstance(declaration, class_t):
+                related_class = class_map.get(declaration_utils.full_name(declaration))
+                if related_class is not None:
+                    decl.decl_type.declaration = related_class
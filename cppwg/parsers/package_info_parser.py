@@ -1,8 +1,12 @@
 """Parser for input yaml."""
 
+import hashlib
+import json
 import logging
 import os
-from typing import Any, Dict
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
 
 import yaml
 
@@ -11,25 +15,123 @@ from cppwg.info.free_function_info import CppFreeFunctionInfo
 from cppwg.info.module_info import ModuleInfo
 from cppwg.info.package_info import PackageInfo
 from cppwg.info.variable_info import CppVariableInfo
+from cppwg.templates import pybind11_default
 from cppwg.utils import utils
 from cppwg.utils.constants import CPPWG_SOURCEROOT_STRING
+from cppwg.version import __version__ as cppwg_version
+
+# Use the LibYAML based loader if PyYAML was built with it
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Subdirectory of the cache directory holding resolved package info configs
+CONFIG_CACHE_SUBDIR = "package_info"
+
+# Module, class and free function options that determine a module's part of the
+# header collection, which is all that's resolved for modules not selected by
+# the module filter
+HEADER_MODULE_KEYS = (
+    "classes",
+    "excluded",
+    "free_functions",
+    "name",
+    "source_locations",
+    "template_substitutions",
+)
+HEADER_ENTRY_KEYS = (
+    "excluded",
+    "name",
+    "name_override",
+    "source_file",
+    "source_file_path",
+    "template_substitutions",
+)
+
+
+def _resolve_module_file(
+    config_file: str,
+    source_root: str,
+    raw_data: bytes,
+    overrides: Dict[str, Any],
+    header_only: bool = False,
+) -> Dict[str, Any]:
+    """
+    Resolve a module include file; run in worker processes.
+
+    Parameters
+    ----------
+    config_file : str
+        The path to the module include file
+    source_root : str
+        The root directory of the C++ source code
+    raw_data : bytes
+        The contents of the module include file
+    overrides : Dict[str, Any]
+        Module options set alongside the include in the top-level file
+    header_only : bool
+        Only resolve the options needed for the header collection
+
+    Returns
+    -------
+    Dict[str, Any]
+        The resolved module config
+    """
+    parser = PackageInfoParser(config_file, source_root)
+    return parser.resolve_module_file(raw_data, overrides, header_only)
 
 
 class PackageInfoParser:
     """
     Parser for the package info yaml file.
 
+    The yaml file is first resolved into plain config dicts, with paths made
+    absolute and verified, booleans converted and custom generators located.
+    The info objects are then built from the resolved config. If a cache
+    directory is set, the resolved config is stored there, keyed by the yaml
+    content and the source root, and reused while neither changes.
+
+    A module can be kept in its own yaml file, referenced from the top-level
+    file with e.g. `- include: modules/geometry.yaml`. Other options given
+    alongside the include, like the module name, override those in the file.
+    Include files are cached separately and are parsed in parallel.
+
+    If a module filter is set, the header collection still covers every
+    module, but wrappers are only written for the selected modules. Only the
+    options that determine the header collection, like class names and source
+    files, are resolved for include files of modules that are named in the
+    top-level file and not selected. These are cached in their own entries,
+    so the include files aren't parsed again while they're unchanged.
+
     Attributes
     ----------
         config_file : str
             The path to the package info yaml config file
         source_root : str
             The root directory of the C++ source code
+        cache_dir : Optional[str]
+            The directory to cache resolved configs in, if any
+        module_names : Optional[List[str]]
+            The names of the modules selected for writing wrappers; all
+            modules are selected if None
+        max_workers : Optional[int]
+            The number of processes used to parse include files
     """
 
-    def __init__(self, config_file: str, source_root: str):
+    def __init__(
+        self,
+        config_file: str,
+        source_root: str,
+        cache_dir: Optional[str] = None,
+        module_names: Optional[Iterable[str]] = None,
+        max_workers: Optional[int] = None,
+    ):
         self.config_file = config_file
         self.source_root = source_root
+        self.cache_dir = cache_dir
+        self.module_names = None if module_names is None else list(module_names)
+        self.max_workers = max_workers
+
+        # Paths checked while resolving the config
+        self.verified_paths: List[str] = []
 
     def parse(self) -> PackageInfo:
         """
@@ -46,14 +148,33 @@ class PackageInfoParser:
         logger = logging.getLogger()
         logger.info("Parsing package info file.")
 
-        # Load raw info from the yaml file
-        raw_package_info: Dict[str, Any] = {}
+        with open(self.config_file, "rb") as config_file:
+            raw_data = config_file.read()
+
+        content_key = self.content_key(raw_data)
+        cache_path = self.cache_path(self.config_file)
+        resolved_config = self.load_cached_config(cache_path, content_key)
+
+        if resolved_config is None:
+            # Load raw info from the yaml file
+            raw_package_info: Dict[str, Any] = yaml.load(raw_data, Loader=YamlLoader)
+            resolved_config = self.resolve_config(raw_package_info)
+            self.store_cached_config(cache_path, content_key, resolved_config)
+
+        self.load_included_modules(resolved_config)
+
+        return self.build_package_info(resolved_config)
 
-        with open(self.config_file, "r") as config_file:
-            raw_package_info = yaml.safe_load(config_file)
+    def base_config(self) -> Dict[str, Any]:
+        """
+        Get the default config options.
 
-        # Base config options that apply to package, modules, classes, etc.
-        base_config: Dict[str, Any] = {
+        Returns
+        -------
+        Dict[str, Any]
+            Config options that apply to package, modules, classes, etc.
+        """
+        return {
             "calldef_excludes": "",
             "constructor_arg_type_excludes": "",
             "constructor_signature_excludes": "",
@@ -74,12 +195,38 @@ class PackageInfoParser:
             "template_substitutions": [],
         }
 
+    def resolve_config(self, raw_package_info: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Resolve the raw package info into validated config dicts.
+
+        Modules kept in include files are left as {"include", "name",
+        "overrides"} entries, to be resolved by `load_included_modules`.
+
+        Parameters
+        ----------
+        raw_package_info : Dict[str, Any]
+            The package info loaded from the yaml file
+
+        Returns
+        -------
+        Dict[str, Any]
+            The package config, with a "modules" list of module configs. Each
+            module config has "classes", "free_functions" and "variables"
+            lists of resolved configs. The paths checked while resolving are
+            listed under "verified_paths".
+        """
+        self.verified_paths = []
+
+        base_config = self.base_config()
+
         # Get package config from the raw package info
         package_config: Dict[str, Any] = {
             "name": "cppwg_package",
             "common_include_file": True,
             "exclude_default_args": False,
             "source_hpp_patterns": ["*.hpp"],
+            "source_ignore_files": [],
+            "template_packs": [],
         }
         package_config.update(base_config)
 
@@ -98,161 +245,502 @@ class PackageInfoParser:
         # Convert custom generator path to a full path
         self.convert_custom_generator(package_config)
 
-        # Create the PackageInfo object from the package config dict
-        package_info = PackageInfo(package_config["name"], package_config)
+        # Convert template pack paths to full paths
+        self.convert_template_packs(package_config)
 
         # Parse the module data
+        config_dir = os.path.dirname(os.path.abspath(self.config_file))
+        package_config["modules"] = []
         for raw_module_info in raw_package_info["modules"]:
-            # Get module config from the raw module info
-            module_config = {
-                "name": "cppwg_module",
-                "source_locations": [],
-                "use_all_classes": False,
-                "use_all_free_functions": False,
-                "use_all_variables": False,
-                "classes": [],
-                "free_functions": [],
-                "variables": [],
-            }
-            module_config.update(base_config)
-
-            for key in module_config.keys():
-                if key in raw_module_info:
-                    module_config[key] = raw_module_info[key]
-
-            # Convert source locations to full paths
-            if module_config["source_locations"]:
-                locations = []
-                for location in module_config["source_locations"]:
-                    locations.append(self.full_path(location))
-                    self.verify_path(locations[-1])
-                module_config["source_locations"] = locations
-
-            # Convert custom generator path to a full path
-            self.convert_custom_generator(module_config)
-
-            # Convert boolean options
-            module_config["use_all_classes"] = utils.is_option_ALL(
-                module_config["classes"]
+            if "include" in raw_module_info:
+                # Module kept in its own file, relative to this one
+                include_path = os.path.abspath(
+                    os.path.join(config_dir, raw_module_info["include"])
+                )
+                self.verify_path(include_path)
+
+                overrides = dict(raw_module_info)
+                del overrides["include"]
+                package_config["modules"].append(
+                    {
+                        "include": include_path,
+                        "name": overrides.get("name"),
+                        "overrides": overrides,
+                    }
+                )
+                continue
+
+            package_config["modules"].append(
+                self.resolve_module_config(raw_module_info, base_config)
             )
 
-            module_config["use_all_free_functions"] = utils.is_option_ALL(
-                module_config["free_functions"]
-            )
+        package_config["verified_paths"] = list(dict.fromkeys(self.verified_paths))
 
-            module_config["use_all_variables"] = utils.is_option_ALL(
-                module_config["variables"]
-            )
+        return package_config
+
+    def resolve_module_config(
+        self, raw_module_info: Dict[str, Any], base_config: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Resolve the raw info for a module.
+
+        Parameters
+        ----------
+        raw_module_info : Dict[str, Any]
+            The raw info from the yaml file
+        base_config : Dict[str, Any]
+            The default config options
+
+        Returns
+        -------
+        Dict[str, Any]
+            The resolved config
+        """
+        # Get module config from the raw module info
+        module_config = {
+            "name": "cppwg_module",
+            "source_locations": [],
+            "use_all_classes": False,
+            "use_all_free_functions": False,
+            "use_all_variables": False,
+            "classes": [],
+            "free_functions": [],
+            "variables": [],
+        }
+        module_config.update(base_config)
+
+        for key in module_config.keys():
+            if key in raw_module_info:
+                module_config[key] = raw_module_info[key]
+
+        # Convert source locations to full paths
+        if module_config["source_locations"]:
+            locations = []
+            for location in module_config["source_locations"]:
+                locations.append(self.full_path(location))
+                self.verify_path(locations[-1])
+            module_config["source_locations"] = locations
+
+        # Convert custom generator path to a full path
+        self.convert_custom_generator(module_config)
+
+        # Convert boolean options
+        module_config["use_all_classes"] = utils.is_option_ALL(module_config["classes"])
+
+        module_config["use_all_free_functions"] = utils.is_option_ALL(
+            module_config["free_functions"]
+        )
+
+        module_config["use_all_variables"] = utils.is_option_ALL(
+            module_config["variables"]
+        )
+
+        # Resolve the class, free function and variable data.
+        # Note: if e.g. module_config["use_all_classes"] == True, class info
+        # objects will be added later after parsing the C++ source code.
+        for collection, use_all in [
+            ("classes", "use_all_classes"),
+            ("free_functions", "use_all_free_functions"),
+            ("variables", "use_all_variables"),
+        ]:
+            raw_entries = module_config[collection]
+            module_config[collection] = []
+            if module_config[use_all] or not raw_entries:
+                continue
+
+            for raw_entry in raw_entries:
+                module_config[collection].append(
+                    self.resolve_entry_config(raw_entry, base_config)
+                )
+
+        return module_config
+
+    def resolve_module_file(
+        self, raw_data: bytes, overrides: Dict[str, Any], header_only: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Resolve a module include file.
+
+        Parameters
+        ----------
+        raw_data : bytes
+            The contents of the module include file
+        overrides : Dict[str, Any]
+            Module options set alongside the include in the top-level file
+        header_only : bool
+            Only resolve the options needed for the header collection
+
+        Returns
+        -------
+        Dict[str, Any]
+            The resolved module config. The paths checked while resolving are
+            listed under "verified_paths".
+        """
+        self.verified_paths = []
+
+        raw_module_info: Dict[str, Any] = yaml.load(raw_data, Loader=YamlLoader) or {}
+        raw_module_info.update(overrides)
+
+        if header_only:
+            raw_module_info = self.header_module_info(raw_module_info)
+
+        module_config = self.resolve_module_config(raw_module_info, self.base_config())
+        module_config["verified_paths"] = list(dict.fromkeys(self.verified_paths))
+
+        return module_config
+
+    @staticmethod
+    def header_module_info(raw_module_info: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Reduce raw module info to the options needed for the header collection.
+
+        Parameters
+        ----------
+        raw_module_info : Dict[str, Any]
+            The raw info from the yaml file
+
+        Returns
+        -------
+        Dict[str, Any]
+            The raw info, with only the options in HEADER_MODULE_KEYS, and
+            HEADER_ENTRY_KEYS for each class and free function
+        """
+        header_info = {
+            key: value
+            for key, value in raw_module_info.items()
+            if key in HEADER_MODULE_KEYS
+        }
+
+        for collection in ("classes", "free_functions"):
+            raw_entries = header_info.get(collection)
+            if isinstance(raw_entries, list):
+                header_info[collection] = [
+                    {
+                        key: value
+                        for key, value in raw_entry.items()
+                        if key in HEADER_ENTRY_KEYS
+                    }
+                    for raw_entry in raw_entries
+                ]
+
+        return header_info
+
+    def is_selected(self, module_name: Optional[str]) -> bool:
+        """
+        Check if a module is selected by the module filter.
+
+        Parameters
+        ----------
+        module_name : Optional[str]
+            The module name, or None if it isn't known yet
+
+        Returns
+        -------
+        bool
+            True if there is no module filter, the module is in it, or the
+            module name isn't known
+        """
+        return (
+            self.module_names is None
+            or module_name is None
+            or module_name in self.module_names
+        )
+
+    def load_included_modules(self, package_config: Dict[str, Any]) -> None:
+        """
+        Resolve the modules kept in include files.
+
+        Parameters
+        ----------
+        package_config : Dict[str, Any]
+            The resolved config from `resolve_config`, updated in place
+        """
+        modules = package_config["modules"]
+
+        included = [i for i, m in enumerate(modules) if "include" in m]
+        module_configs = self.load_module_files([modules[i] for i in included])
+        for i, module_config in zip(included, module_configs):
+            modules[i] = module_config
+
+    def load_module_files(
+        self, include_entries: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Load module include files, from the cache where they are unchanged.
+
+        Include files that aren't cached are parsed in parallel. For modules
+        not selected by the module filter, only the options needed for the
+        header collection are resolved, and cached in a separate entry.
+
+        Parameters
+        ----------
+        include_entries : List[Dict[str, Any]]
+            The {"include", "name", "overrides"} entries from `resolve_config`
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+            The resolved module configs, in the same order
+        """
+        logger = logging.getLogger()
+
+        module_configs: List[Optional[Dict[str, Any]]] = []
+        pending = []  # (index, cache path, content key, raw data, entry, header only)
+
+        for entry in include_entries:
+            with open(entry["include"], "rb") as include_file:
+                raw_data = include_file.read()
+
+            # Options set in the top-level file are part of the fingerprint
+            overrides_data = json.dumps(entry["overrides"], sort_keys=True, default=str)
+            content_key = self.content_key(raw_data + b"\0" + overrides_data.encode())
+
+            header_only = not self.is_selected(entry["name"])
+            if header_only:
+                logger.info(
+                    f"Module {entry['name']} not selected - only resolving "
+                    f"its header collection options."
+                )
+
+            cache_path = self.cache_path(entry["include"], header_only)
+            module_config = self.load_cached_config(cache_path, content_key)
+            if module_config is None:
+                pending.append(
+                    (
+                        len(module_configs),
+                        cache_path,
+                        content_key,
+                        raw_data,
+                        entry,
+                        header_only,
+                    )
+                )
+            module_configs.append(module_config)
+
+        if not pending:
+            return module_configs
+
+        args = [
+            (entry["include"], self.source_root, raw_data, entry["overrides"], header)
+            for _, _, _, raw_data, entry, header in pending
+        ]
+        if len(pending) > 1 and self.max_workers != 1:
+            max_workers = min(len(pending), self.max_workers or os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(_resolve_module_file, *zip(*args)))
+        else:
+            results = [_resolve_module_file(*arg) for arg in args]
+
+        for (i, cache_path, content_key, *_), module_config in zip(pending, results):
+            self.store_cached_config(cache_path, content_key, module_config)
+            module_configs[i] = module_config
+
+        return module_configs
+
+    def resolve_entry_config(
+        self, raw_entry_info: Dict[str, Any], base_config: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Resolve the raw info for a class, free function or variable.
+
+        Parameters
+        ----------
+        raw_entry_info : Dict[str, Any]
+            The raw info from the yaml file
+        base_config : Dict[str, Any]
+            The default config options
+
+        Returns
+        -------
+        Dict[str, Any]
+            The resolved config
+        """
+        # Get entry config from the raw entry info
+        entry_config = {
+            "name_override": "",
+            "source_file": "",
+            "source_file_path": "",
+        }
+        entry_config.update(base_config)
+
+        for key in entry_config.keys():
+            if key in raw_entry_info:
+                entry_config[key] = raw_entry_info[key]
+
+        entry_config["name"] = raw_entry_info["name"]
+
+        # Convert source file path to a full path
+        entry_config["source_file_path"] = self.full_path(
+            entry_config["source_file_path"]
+        )
+        self.verify_path(entry_config["source_file_path"])
+
+        # Convert custom generator path to a full path
+        self.convert_custom_generator(entry_config)
+
+        return entry_config
 
+    def build_package_info(self, package_config: Dict[str, Any]) -> PackageInfo:
+        """
+        Create the info objects from a resolved config.
+
+        Parameters
+        ----------
+        package_config : Dict[str, Any]
+            The resolved config from `resolve_config`
+
+        Returns
+        -------
+        PackageInfo
+            The object holding data from the parsed package info yaml file.
+        """
+        # Create the PackageInfo object from the package config dict
+        package_info = PackageInfo(package_config["name"], package_config)
+
+        for module_config in package_config["modules"]:
             # Create the ModuleInfo object from the module config dict
             module_info = ModuleInfo(module_config["name"], module_config)
 
             # Add the module to the package
             package_info.add_module(module_info)
 
-            # Parse the class data and create class info objects.
-            # Note: if module_config["use_all_classes"] == True, class info
-            # objects will be added later after parsing the C++ source code.
-            if not module_config["use_all_classes"]:
-                if module_config["classes"]:
-                    for raw_class_info in module_config["classes"]:
-                        # Get class config from the raw class info
-                        class_config = {
-                            "name_override": "",
-                            "source_file": "",
-                            "source_file_path": "",
-                        }
-                        class_config.update(base_config)
-
-                        for key in class_config.keys():
-                            if key in raw_class_info:
-                                class_config[key] = raw_class_info[key]
-
-                        # Convert source file path to a full path
-                        class_config["source_file_path"] = self.full_path(
-                            class_config["source_file_path"]
-                        )
-                        self.verify_path(class_config["source_file_path"])
-
-                        # Convert custom generator path to a full path
-                        self.convert_custom_generator(class_config)
-
-                        # Create the CppClassInfo object from the class config dict
-                        class_info = CppClassInfo(raw_class_info["name"], class_config)
-
-                        # Add the class to the module
-                        module_info.add_class(class_info)
-
-            # Parse the free function data and create free function info objects.
-            # Note: if module_config["use_all_free_functions"] == True, free function
-            # info objects will be added later after parsing the C++ source code.
-            if not module_config["use_all_free_functions"]:
-                if module_config["free_functions"]:
-                    for raw_free_function_info in module_config["free_functions"]:
-                        # Get free function config from the raw free function info
-                        free_function_config = {
-                            "name_override": "",
-                            "source_file": "",
-                            "source_file_path": "",
-                        }
-                        free_function_config.update(base_config)
-
-                        for key in free_function_config.keys():
-                            if key in raw_free_function_info:
-                                free_function_config[key] = raw_free_function_info[key]
-
-                        # Convert source file path to a full path
-                        free_function_config["source_file_path"] = self.full_path(
-                            free_function_config["source_file_path"]
-                        )
-                        self.verify_path(free_function_config["source_file_path"])
-
-                        # Convert custom generator path to a full path
-                        self.convert_custom_generator(free_function_config)
-
-                        # Create the CppFreeFunctionInfo object from the free function config dict
-                        free_function_info = CppFreeFunctionInfo(
-                            free_function_config["name"], free_function_config
-                        )
-
-                        # Add the free function to the module
-                        module_info.add_free_function(free_function_info)
-
-            # Parse the variable data
-            if not module_config["use_all_variables"]:
-                if module_config["variables"]:
-                    for raw_variable_info in module_config["variables"]:
-                        # Get variable config from the raw variable info
-                        variable_config = {
-                            "name_override": "",
-                            "source_file": "",
-                            "source_file_path": "",
-                        }
-                        variable_config.update(base_config)
-
-                        for key in variable_config.keys():
-                            if key in raw_variable_info:
-                                variable_config[key] = raw_variable_info[key]
-
-                        # Convert source file path to a full path
-                        variable_config["source_file_path"] = self.full_path(
-                            variable_config["source_file_path"]
-                        )
-                        self.verify_path(variable_config["source_file_path"])
-
-                        # Convert custom generator path to a full path
-                        self.convert_custom_generator(variable_config)
-
-                        # Create the CppVariableInfo object from the variable config dict
-                        variable_info = CppVariableInfo(
-                            variable_config["name"], variable_config
-                        )
-
-                        # Add the variable to the module
-                        module_info.add_variable(variable_info)
+            for class_config in module_config["classes"]:
+                module_info.add_class(CppClassInfo(class_config["name"], class_config))
+
+            for free_function_config in module_config["free_functions"]:
+                module_info.add_free_function(
+                    CppFreeFunctionInfo(
+                        free_function_config["name"], free_function_config
+                    )
+                )
+
+            for variable_config in module_config["variables"]:
+                module_info.add_variable(
+                    CppVariableInfo(variable_config["name"], variable_config)
+                )
 
         return package_info
 
+    def content_key(self, raw_data: bytes) -> str:
+        """
+        Get a key identifying the yaml content and the source root.
+
+        Parameters
+        ----------
+        raw_data : bytes
+            The contents of the yaml file
+
+        Returns
+        -------
+        str
+            A hex digest of the contents, source root and cppwg version
+        """
+        digest = hashlib.sha256(raw_data)
+        digest.update(b"\0" + self.source_root.encode("utf-8"))
+        digest.update(b"\0" + cppwg_version.encode("utf-8"))
+        return digest.hexdigest()
+
+    def cache_path(self, config_file: str, header_only: bool = False) -> Optional[str]:
+        """
+        Get the path to the cached config for a yaml file and the source root.
+
+        Parameters
+        ----------
+        config_file : str
+            The path to the yaml file
+        header_only : bool
+            Get the path to the config with only the header collection options
+
+        Returns
+        -------
+        Optional[str]
+            The cache entry path, or None if there is no cache directory.
+            There is one entry per yaml file and source root, and one more for
+            the header collection options of a module include file.
+        """
+        if not self.cache_dir:
+            return None
+
+        location = f"{os.path.abspath(config_file)}\0{self.source_root}"
+        entry_name = hashlib.sha1(location.encode("utf-8")).hexdigest()
+        if header_only:
+            entry_name += "_header"
+        return os.path.join(self.cache_dir, CONFIG_CACHE_SUBDIR, f"{entry_name}.pkl")
+
+    def load_cached_config(
+        self, cache_path: Optional[str], content_key: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Load the cached resolved config for the yaml content, if there is one.
+
+        Paths verified when the config was resolved are checked again, so a
+        missing file is still reported.
+
+        Parameters
+        ----------
+        cache_path : Optional[str]
+            The path from `cache_path`
+        content_key : str
+            The key from `content_key`
+
+        Returns
+        -------
+        Optional[Dict[str, Any]]
+            The resolved config, or None if there is no valid cache entry
+        """
+        if not cache_path:
+            return None
+
+        logger = logging.getLogger()
+
+        try:
+            with open(cache_path, "rb") as cache_file:
+                cached_key, config = pickle.load(cache_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError):
+            logger.warning(f"Could not read config cache entry {cache_path}")
+            return None
+
+        if cached_key != content_key:
+            return None
+
+        for path in config["verified_paths"]:
+            self.verify_path(path)
+
+        logger.info(f"Using cached config: {cache_path}")
+        return config
+
+    def store_cached_config(
+        self, cache_path: Optional[str], content_key: str, config: Dict[str, Any]
+    ) -> None:
+        """
+        Store a resolved config in the cache, replacing any previous entry.
+
+        Parameters
+        ----------
+        cache_path : Optional[str]
+            The path from `cache_path`
+        content_key : str
+            The key from `content_key`
+        config : Dict[str, Any]
+            The resolved package or module config
+        """
+        if not cache_path:
+            return
+
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+
+        # Write to a temporary file so readers never see a partial entry
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as cache_file:
+            pickle.dump(
+                (content_key, config),
+                cache_file,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp_path, cache_path)
+
     def convert_custom_generator(self, config: Dict[str, Any]) -> None:
         """
         Convert the custom generator path to a full path if set in the config.
@@ -268,6 +756,28 @@ class PackageInfoParser:
         config["custom_generator"] = self.convert_path(config["custom_generator"])
         self.verify_path(config["custom_generator"])
 
+    def convert_template_packs(self, config: Dict[str, Any]) -> None:
+        """
+        Convert the template pack paths in the config to full paths.
+
+        Built-in pack names e.g. "chaste" are left as they are.
+
+        Parameters
+        ----------
+        config: Dict[str, Any]
+            The config dictionary.
+        """
+        template_packs = config["template_packs"] or []
+        if isinstance(template_packs, str):
+            template_packs = [template_packs]
+
+        config["template_packs"] = []
+        for template_pack in template_packs:
+            if template_pack not in pybind11_default.template_packs:
+                template_pack = self.convert_path(template_pack)
+                self.verify_path(template_pack)
+            config["template_packs"].append(template_pack)
+
     def convert_path(self, raw_path: str) -> str:
         """
         Convert a path which has a CPPWG_SOURCEROOT_STRING placeholder.
@@ -312,3 +822,5 @@ class PackageInfoParser:
         if not os.path.exists(path):
             logger.error(f"Could not find {path}")
             raise FileNotFoundError()
+
+        self.verified_paths.append(path)
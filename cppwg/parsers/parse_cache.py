@@ -0,0 +1,369 @@
+"""Persistent cache for parsed C++ declarations."""
+
+import glob
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from pygccxml import parser
+
+from cppwg.utils.constants import CPPWG_DEFAULT_CACHE_MAX_SIZE
+
+# Recursion limit used while pickling declaration trees, which are deeply linked
+PICKLE_RECURSION_LIMIT = 50000
+
+
+class IncludedFilesRecorder(parser.cache_base_t):
+    """
+    A pygccxml declarations cache that records the files included by a parse.
+
+    pygccxml reports every file seen by CastXML (i.e. the full transitive
+    include tree) to its declarations cache. This cache never returns cached
+    declarations, it just keeps the reported file list.
+
+    Attributes
+    ----------
+    included_files : List[str]
+        The files included while parsing the last source file
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.included_files: List[str] = []
+
+    def flush(self) -> None:
+        """Nothing to flush."""
+        pass
+
+    def update(self, source_file, configuration, declarations, included_files):
+        """Record the included files for the parsed source file."""
+        if isinstance(included_files, dict):
+            included_files = included_files.values()
+
+        self.included_files = sorted(
+            {
+                os.path.abspath(file_name)
+                for file_name in included_files
+                if file_name and os.path.isfile(file_name)
+            }
+        )
+
+    def cached_value(self, source_file, configuration):
+        """Return None, so that the source file is always parsed."""
+        return None
+
+
+class CppParseCache:
+    """
+    A content-addressed on-disk cache of parsed C++ declarations.
+
+    Each cache entry holds the filtered source declarations from one parse of
+    the header collection, together with a signature for every file included
+    in that parse. The entry is valid while the configuration key matches and
+    none of the included files have changed. Entries are evicted in least
+    recently used order once the cache grows beyond its size cap.
+
+    Attributes
+    ----------
+    cache_dir : str
+        The directory holding the cache entries
+    max_size : int
+        The maximum size of the cache in bytes
+    """
+
+    def __init__(self, cache_dir: str, max_size: Optional[int] = None) -> None:
+        """
+        Create a parse cache.
+
+        Parameters
+        ----------
+        cache_dir : str
+            The directory to store cache entries in; created if it doesn't exist
+        max_size : Optional[int]
+            The maximum size of the cache in MB
+        """
+        self.cache_dir: str = os.path.abspath(cache_dir)
+
+        if max_size is None:
+            max_size = CPPWG_DEFAULT_CACHE_MAX_SIZE
+        self.max_size: int = max_size * 1024 * 1024
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def config_key(**settings: str) -> str:
+        """
+        Get a key identifying the configuration used for a parse.
+
+        Parameters
+        ----------
+        **settings : str
+            The parse settings e.g. cflags, compiler path, tool versions
+
+        Returns
+        -------
+        str
+            A hex digest of the settings
+        """
+        data = json.dumps(settings, sort_keys=True, default=str)
+        return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def file_signature(
+        file_path: str, previous: Optional[Tuple[int, int, str]] = None
+    ) -> Optional[Tuple[int, int, str]]:
+        """
+        Get a (mtime, size, sha1) signature for a file.
+
+        The content hash is only recomputed if the file's mtime or size differ
+        from the previous signature.
+
+        Parameters
+        ----------
+        file_path : str
+            The path to the file
+        previous : Optional[Tuple[int, int, str]]
+            A previously computed signature for the file
+
+        Returns
+        -------
+        Optional[Tuple[int, int, str]]
+            The file signature, or None if the file doesn't exist
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+
+        if previous and previous[0] == stat.st_mtime_ns and previous[1] == stat.st_size:
+            return previous
+
+        with open(file_path, "rb") as in_file:
+            digest = hashlib.sha1(in_file.read()).hexdigest()
+
+        return (stat.st_mtime_ns, stat.st_size, digest)
+
+    def entry_paths(self, config_key: str) -> List[str]:
+        """
+        Get the paths to the entries for a configuration, most recent first.
+
+        Parameters
+        ----------
+        config_key : str
+            The configuration key
+
+        Returns
+        -------
+        List[str]
+            Paths to the entry dependency files
+        """
+        paths = glob.glob(os.path.join(self.cache_dir, f"{config_key}_*.json"))
+        paths.sort(key=lambda path: os.path.getmtime(path), reverse=True)
+        return paths
+
+    def check_dependencies(
+        self, dependencies: Dict[str, Tuple[int, int, str]]
+    ) -> List[str]:
+        """
+        Get the files whose content differs from the recorded signatures.
+
+        Parameters
+        ----------
+        dependencies : Dict[str, Tuple[int, int, str]]
+            The recorded file signatures
+
+        Returns
+        -------
+        List[str]
+            The changed (or removed) files
+        """
+        changed_files = []
+        for file_path, signature in dependencies.items():
+            signature = tuple(signature)
+            current = self.file_signature(file_path, signature)
+            if current is None or current[2] != signature[2]:
+                changed_files.append(file_path)
+        return changed_files
+
+    def load(self, config_key: str) -> Optional[List["declaration_t"]]:  # noqa: F821
+        """
+        Load the cached declarations for a configuration.
+
+        Parameters
+        ----------
+        config_key : str
+            The configuration key
+
+        Returns
+        -------
+        Optional[List[declaration_t]]
+            The cached declarations, or None if there is no valid entry
+        """
+        logger = logging.getLogger()
+
+        for deps_path in self.entry_paths(config_key):
+            try:
+                with open(deps_path, "r") as deps_file:
+                    dependencies = json.load(deps_file)
+            except (OSError, ValueError):
+                logger.warning(f"Could not read parse cache entry {deps_path}")
+                continue
+
+            if self.check_dependencies(dependencies):
+                continue
+
+            decls_path = os.path.splitext(deps_path)[0] + ".pkl"
+            try:
+                with open(decls_path, "rb") as decls_file:
+                    decls = pickle.load(decls_file)
+            except (OSError, EOFError, pickle.UnpicklingError):
+                logger.warning(f"Could not read parse cache entry {decls_path}")
+                continue
+
+            # Mark the entry as recently used
+            os.utime(deps_path)
+            os.utime(decls_path)
+
+            logger.info(f"Parse cache hit: {decls_path}")
+            return decls
+
+        logger.info("Parse cache miss.")
+        return None
+
+    def load_latest(
+        self, config_key: str
+    ) -> Optional[
+        Tuple[List["declaration_t"], Dict[str, Tuple[int, int, str]]]  # noqa: F821
+    ]:
+        """
+        Load the most recently used entry for a configuration, even if stale.
+
+        Parameters
+        ----------
+        config_key : str
+            The configuration key
+
+        Returns
+        -------
+        Optional[Tuple[List[declaration_t], Dict[str, Tuple[int, int, str]]]]
+            The cached declarations and the file signatures they were parsed
+            from, or None if there is no entry for the configuration
+        """
+        logger = logging.getLogger()
+
+        for deps_path in self.entry_paths(config_key):
+            decls_path = os.path.splitext(deps_path)[0] + ".pkl"
+            try:
+                with open(deps_path, "r") as deps_file:
+                    dependencies = json.load(deps_file)
+                with open(decls_path, "rb") as decls_file:
+                    decls = pickle.load(decls_file)
+            except (OSError, ValueError, EOFError, pickle.UnpicklingError):
+                logger.warning(f"Could not read parse cache entry {decls_path}")
+                continue
+
+            dependencies = {
+                path: tuple(signature) for path, signature in dependencies.items()
+            }
+            return decls, dependencies
+
+        return None
+
+    def store(
+        self,
+        config_key: str,
+        decls: List["declaration_t"],  # noqa: F821
+        included_files: List[str],
+    ) -> None:
+        """
+        Store declarations in the cache.
+
+        Parameters
+        ----------
+        config_key : str
+            The configuration key
+        decls : List[declaration_t]
+            The declarations to store
+        included_files : List[str]
+            The files included by the parse that produced the declarations
+        """
+        logger = logging.getLogger()
+
+        dependencies = {}
+        for file_path in included_files:
+            signature = self.file_signature(file_path)
+            if signature:
+                dependencies[file_path] = signature
+
+        content_key = self.config_key(
+            **{path: signature[2] for path, signature in dependencies.items()}
+        )
+        entry_path = os.path.join(self.cache_dir, f"{config_key}_{content_key}")
+
+        recursion_limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(recursion_limit, PICKLE_RECURSION_LIMIT))
+        try:
+            data = pickle.dumps(decls, protocol=pickle.HIGHEST_PROTOCOL)
+        except RecursionError:
+            logger.warning("Declarations too deeply nested to cache.")
+            return
+        finally:
+            sys.setrecursionlimit(recursion_limit)
+
+        self.write_atomic(entry_path + ".pkl", data)
+        self.write_atomic(
+            entry_path + ".json", json.dumps(dependencies, indent=0).encode("utf-8")
+        )
+        logger.info(f"Parse cache stored: {entry_path}.pkl")
+
+        self.evict()
+
+    def write_atomic(self, file_path: str, data: bytes) -> None:
+        """
+        Write data to a file so that readers never see a partial file.
+
+        Parameters
+        ----------
+        file_path : str
+            The path to the file
+        data : bytes
+            The data to write
+        """
+        tmp_path = f"{file_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as out_file:
+            out_file.write(data)
+        os.replace(tmp_path, file_path)
+
+    def evict(self) -> None:
+        """
+        Remove least recently used entries until the cache is within its size cap.
+        """
+        logger = logging.getLogger()
+
+        entries = []
+        total_size = 0
+        for deps_path in glob.glob(os.path.join(self.cache_dir, "*.json")):
+            decls_path = os.path.splitext(deps_path)[0] + ".pkl"
+            try:
+                size = os.path.getsize(deps_path) + os.path.getsize(decls_path)
+                last_used = os.path.getmtime(deps_path)
+            except OSError:
+                continue
+            entries.append((last_used, size, deps_path, decls_path))
+            total_size += size
+
+        entries.sort()
+        for _, size, deps_path, decls_path in entries:
+            if total_size <= self.max_size:
+                break
+            for path in (deps_path, decls_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total_size -= size
+            logger.info(f"Parse cache evicted: {decls_path}")
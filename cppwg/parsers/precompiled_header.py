@@ -0,0 +1,239 @@
+"""Builder for a clang precompiled header of stable includes."""
+
+import json
+import logging
+import os
+import re
+import shlex
+import subprocess
+from typing import Dict, List, Optional, Tuple
+
+from cppwg.parsers.parse_cache import CppParseCache
+from cppwg.utils.constants import CPPWG_EXT
+
+
+class CppPrecompiledHeader:
+    """
+    A clang precompiled header (PCH) for the stable includes of a package.
+
+    Heavy third-party includes (e.g. boost, PETSc, VTK) are preprocessed by
+    CastXML on every run. Precompiling them once lets CastXML load them from
+    the PCH instead. CastXML cannot emit a PCH itself, so it is built with a
+    clang compiler which must match the version of CastXML's internal clang.
+
+    The PCH is kept in the output directory, named by a key made from its
+    includes, flags and compiler version. It is rebuilt when any file it
+    depends on changes.
+
+    Attributes
+    ----------
+    includes : List[str]
+        The includes to precompile e.g. ["<vector>", "boost/numeric/ublas/matrix.hpp"]
+    output_dir : str
+        The directory to write the PCH to
+    clang_binary : str
+        The path to the clang++ compiler used to build the PCH
+    cflags : str
+        The cflags passed to CastXML, which the PCH must be built with
+    include_paths : List[str]
+        The include paths passed to CastXML
+    castxml_clang_version : str
+        The version of the clang compiler built into CastXML e.g. "13.0.0"
+    """
+
+    def __init__(
+        self,
+        includes: List[str],
+        output_dir: str,
+        clang_binary: str,
+        cflags: str,
+        include_paths: List[str],
+        castxml_clang_version: str,
+    ):
+        self.includes: List[str] = includes
+        self.output_dir: str = os.path.abspath(output_dir)
+        self.clang_binary: str = clang_binary
+        self.cflags: str = cflags
+        self.include_paths: List[str] = include_paths
+        self.castxml_clang_version: str = castxml_clang_version
+
+    @staticmethod
+    def clang_version(version_output: str) -> Optional[str]:
+        """
+        Extract the clang version from the output of `--version`.
+
+        Parameters
+        ----------
+        version_output : str
+            The output of running a clang-based tool with `--version`
+
+        Returns
+        -------
+        Optional[str]
+            The clang version e.g. "13.0.0", or None if not found
+        """
+        match = re.search(r"clang version (\d+\.\d+\.\d+)", version_output)
+        if match:
+            return match.group(1)
+        return None
+
+    @staticmethod
+    def read_dependencies(deps_path: str) -> List[str]:
+        """
+        Read the dependency list from a Makefile-style dependency file.
+
+        Parameters
+        ----------
+        deps_path : str
+            The path to the dependency file written by the compiler's -MF option
+
+        Returns
+        -------
+        List[str]
+            The absolute paths to the files the target depends on
+        """
+        with open(deps_path, "r") as deps_file:
+            deps = deps_file.read().replace("\\\n", " ")
+
+        # Drop the target e.g. "file.pch:"
+        _, _, deps = deps.partition(": ")
+
+        # Split on whitespace not escaped by a backslash
+        files = re.split(r"(?<!\\)\s+", deps.strip())
+        return sorted({os.path.abspath(f.replace("\\ ", " ")) for f in files if f})
+
+    def key(self) -> str:
+        """
+        Get the key identifying this PCH's configuration.
+
+        Returns
+        -------
+        str
+            A hex digest of the includes, flags and compiler
+        """
+        return CppParseCache.config_key(
+            includes=self.includes,
+            clang_binary=self.clang_binary,
+            cflags=self.cflags,
+            include_paths=self.include_paths,
+            clang_version=self.castxml_clang_version,
+        )
+
+    def paths(self) -> Tuple[str, str, str]:
+        """
+        Get the paths to the PCH source, PCH and dependency record.
+
+        Returns
+        -------
+        Tuple[str, str, str]
+            The paths to the header to precompile, the PCH and the json record
+            of the PCH's dependencies.
+        """
+        base = os.path.join(self.output_dir, f"precompiled_{self.key()}.{CPPWG_EXT}")
+        return f"{base}.hpp", f"{base}.hpp.pch", f"{base}.json"
+
+    def is_current(self) -> bool:
+        """
+        Check if a previously built PCH can be reused.
+
+        Returns
+        -------
+        bool
+            True if the PCH exists and none of its dependencies have changed
+        """
+        _, pch_path, record_path = self.paths()
+        if not (os.path.isfile(pch_path) and os.path.isfile(record_path)):
+            return False
+
+        try:
+            with open(record_path, "r") as record_file:
+                dependencies: Dict[str, List] = json.load(record_file)
+        except (OSError, ValueError):
+            return False
+
+        for file_path, signature in dependencies.items():
+            signature = tuple(signature)
+            current = CppParseCache.file_signature(file_path, signature)
+            if current is None or current[2] != signature[2]:
+                logging.getLogger().info(
+                    f"Precompiled header input changed: {file_path}"
+                )
+                return False
+
+        return True
+
+    def build(self) -> Optional[str]:
+        """
+        Build the PCH if it is out of date.
+
+        Returns
+        -------
+        Optional[str]
+            The path to the PCH, or None if it could not be built
+        """
+        logger = logging.getLogger()
+
+        if not self.includes:
+            return None
+
+        # The PCH format is specific to the clang version that wrote it
+        try:
+            clang_version = self.clang_version(
+                subprocess.check_output(
+                    [self.clang_binary, "--version"], stderr=subprocess.STDOUT
+                ).decode("utf-8", "replace")
+            )
+        except (OSError, subprocess.CalledProcessError):
+            clang_version = None
+
+        if clang_version is None or clang_version.split(".")[0] != (
+            self.castxml_clang_version.split(".")[0]
+        ):
+            logger.warning(
+                f"Precompiled headers need clang {self.castxml_clang_version} to match "
+                f"castxml, but {self.clang_binary} is clang {clang_version}"
+                " - skipping precompiled header."
+            )
+            return None
+
+        hpp_path, pch_path, record_path = self.paths()
+
+        if self.is_current():
+            logger.info(f"Using precompiled header: {pch_path}")
+            return pch_path
+
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        with open(hpp_path, "w") as hpp_file:
+            hpp_file.write("#pragma once\n")
+            for include in self.includes:
+                if include.startswith("<"):
+                    hpp_file.write(f"#include {include}\n")
+                else:
+                    hpp_file.write(f'#include "{include}"\n')
+
+        deps_path = f"{pch_path}.d"
+        command = [self.clang_binary, "-x", "c++-header"]
+        command += shlex.split(self.cflags)
+        command += [f"-I{include_path}" for include_path in self.include_paths]
+        command += [hpp_path, "-o", pch_path, "-MD", "-MF", deps_path]
+
+        logger.info(f"Building precompiled header: {pch_path}")
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            logger.warning(
+                "Could not build precompiled header - skipping.\n" + result.stderr
+            )
+            return None
+
+        dependencies = {}
+        for file_path in self.read_dependencies(deps_path):
+            signature = CppParseCache.file_signature(file_path)
+            if signature:
+                dependencies[file_path] = signature
+        os.remove(deps_path)
+
+        with open(record_path, "w") as record_file:
+            json.dump(dependencies, record_file, indent=0)
+
+        return pch_path
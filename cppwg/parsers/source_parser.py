@@ -1,14 +1,30 @@
 """Parser for C++ source code."""
 
 import logging
-from pathlib import Path
-from typing import List
+import os
+import re
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
 
+import pygccxml
 from pygccxml import declarations, parser
 from pygccxml.declarations import declaration_t
 from pygccxml.declarations.mdecl_wrapper import mdecl_wrapper_t
 from pygccxml.declarations.namespace import namespace_t
 
+from cppwg.parsers.castxml_filter import filter_castxml_output
+from cppwg.parsers.decl_merge import merge_declarations
+from cppwg.parsers.parse_cache import (
+    PICKLE_RECURSION_LIMIT,
+    CppParseCache,
+    IncludedFilesRecorder,
+)
+from cppwg.utils.constants import CPPWG_EXT
+from cppwg.utils.path_index import PathIndex
+from cppwg.version import __version__ as cppwg_version
+
 # declaration_t is the base type for all declarations in pygccxml including:
 # - class_declaration_t (pygccxml.declarations.class_declaration.class_declaration_t)
 # - class_t (pygccxml.declarations.class_declaration.class_t)
@@ -34,10 +50,24 @@ class CppSourceParser:
             Optional compiler path to be passed to CastXML
         castxml_binary : str
             The path to the CastXML binary
+        castxml_version : str
+            The CastXML version string, used to key cached parse results
+        incremental : bool
+            Reparse only headers changed since the last cached parse
+        shard_collections : List[str]
+            Paths to header collection shards to parse in parallel, if any
+        parse_cache : Optional[CppParseCache]
+            An on-disk cache of parse results; parse results aren't cached if None
+        precompiled_header : Optional[str]
+            Path to a clang precompiled header to be loaded by CastXML, if any
+        restrict_to_source : bool
+            Only load declarations from outside the source tree that are needed
         source_includes : List[str]
             The list of source include paths
         source_root : str
             The root directory of the source code
+        source_path_index : PathIndex
+            An index for checking if files are in the source root
         wrapper_header_collection : str
             The path to the header collection file
     """
@@ -50,6 +80,12 @@ class CppSourceParser:
         source_includes: List[str],
         castxml_cflags: str = "",
         castxml_compiler: str = None,
+        castxml_version: str = "",
+        parse_cache: Optional[CppParseCache] = None,
+        incremental: bool = False,
+        shard_collections: Optional[List[str]] = None,
+        precompiled_header: Optional[str] = None,
+        restrict_to_source: bool = False,
     ):
         self.source_root: str = source_root
         self.wrapper_header_collection: str = wrapper_header_collection
@@ -57,11 +93,56 @@ class CppSourceParser:
         self.source_includes: List[str] = source_includes
         self.castxml_cflags: str = castxml_cflags
         self.castxml_compiler: str = castxml_compiler
+        self.castxml_version: str = castxml_version
+        self.parse_cache: Optional[CppParseCache] = parse_cache
+        self.incremental: bool = incremental
+        self.shard_collections: List[str] = shard_collections or []
+        self.precompiled_header: Optional[str] = precompiled_header
+        self.restrict_to_source: bool = restrict_to_source
+
+        self.source_path_index: PathIndex = PathIndex([self.source_root])
+
+    def cache_key(
+        self, xml_generator_config: parser.xml_generator_configuration_t
+    ) -> str:
+        """
+        Get the key identifying this parser's configuration in the parse cache.
+
+        Parameters
+        ----------
+        xml_generator_config : xml_generator_configuration_t
+            The CastXML configuration
+
+        Returns
+        -------
+        str
+            The parse cache configuration key
+        """
+        return CppParseCache.config_key(
+            source_root=self.source_root,
+            wrapper_header_collection=self.wrapper_header_collection,
+            source_includes=self.source_includes,
+            castxml_cflags=self.castxml_cflags,
+            castxml_compiler=xml_generator_config.compiler_path,
+            precompiled_header=(
+                CppParseCache.file_signature(self.precompiled_header)[2]
+                if self.precompiled_header
+                else None
+            ),
+            restrict_to_source=self.restrict_to_source,
+            castxml_version=self.castxml_version,
+            pygccxml_version=pygccxml.__version__,
+            cppwg_version=cppwg_version,
+        )
 
     def parse(self) -> namespace_t:
         """
         Parse the C++ source code from the header collection using CastXML and pygccxml.
 
+        If a parse cache is set, cached declarations are used when none of the
+        files included by the header collection have changed since they were
+        stored. In incremental mode, only changed headers are reparsed.
+
         Returns
         -------
         namespace_t
@@ -69,23 +150,96 @@ class CppSourceParser:
         """
         logger = logging.getLogger()
 
+        # Load stable includes from a precompiled header if one is set
+        cflags = self.castxml_cflags
+        if self.precompiled_header:
+            cflags = f"{cflags} -include-pch {self.precompiled_header}"
+
         # Configure the XML generator (CastXML)
         xml_generator_config = parser.xml_generator_configuration_t(
             xml_generator_path=self.castxml_binary,
             xml_generator="castxml",
-            cflags=self.castxml_cflags,
+            cflags=cflags,
             compiler_path=self.castxml_compiler,
             include_paths=self.source_includes,
         )
         logger.info(f"Using compiler: {xml_generator_config.compiler_path}")
 
-        # Parse all the C++ source code to extract declarations
-        logger.info("Parsing source code for declarations.")
-        decls: List[declaration_t] = parser.parse(
-            files=[self.wrapper_header_collection],
-            config=xml_generator_config,
-            compilation_mode=parser.COMPILATION_MODE.ALL_AT_ONCE,
-        )
+        source_decls: Optional[List[declaration_t]] = None
+
+        if self.parse_cache:
+            cache_key = self.cache_key(xml_generator_config)
+            source_decls = self.parse_cache.load(cache_key)
+
+        if source_decls is None:
+            included_files: List[str] = []
+
+            # Reparse only changed headers if there is a previous parse
+            if self.incremental and self.parse_cache:
+                incremental_result = self.parse_incremental(
+                    xml_generator_config, cache_key
+                )
+                if incremental_result:
+                    source_decls, included_files = incremental_result
+
+            # Parse all the C++ source code to extract declarations
+            if source_decls is None and self.shard_collections:
+                logger.info(
+                    "Parsing source code for declarations "
+                    f"in {len(self.shard_collections)} shards."
+                )
+                source_decls, included_files = self.parse_shards(xml_generator_config)
+
+            elif source_decls is None:
+                logger.info("Parsing source code for declarations.")
+                source_decls, included_files = self.parse_collection(
+                    xml_generator_config, self.wrapper_header_collection
+                )
+
+            if self.parse_cache:
+                self.parse_cache.store(cache_key, source_decls, included_files)
+
+        # Create a source namespace module for the filtered declarations
+        source_ns = namespace_t(name="source", declarations=source_decls)
+
+        # Initialise the source namespace's internal type hash tables for faster queries
+        logger.info("Optimizing source declaration queries.")
+        source_ns.init_optimizer()
+
+        return source_ns
+
+    def parse_collection(
+        self,
+        xml_generator_config: parser.xml_generator_configuration_t,
+        collection_path: str,
+    ) -> Tuple[List[declaration_t], List[str]]:
+        """
+        Parse a header collection file with CastXML and filter the declarations.
+
+        Parameters
+        ----------
+        xml_generator_config : xml_generator_configuration_t
+            The CastXML configuration
+        collection_path : str
+            The path to the header collection file to parse
+
+        Returns
+        -------
+        Tuple[List[declaration_t], List[str]]
+            The declarations from the source tree and the header collection,
+            and the list of all files included by the header collection.
+        """
+        logger = logging.getLogger()
+
+        if self.restrict_to_source:
+            decls, included_files = self.read_restricted(
+                xml_generator_config, collection_path
+            )
+        else:
+            recorder = IncludedFilesRecorder()
+            reader = parser.source_reader_t(xml_generator_config, cache=recorder)
+            decls = reader.read_file(collection_path)
+            included_files = recorder.included_files
 
         # Get access to the global namespace containing all parsed C++ declarations
         global_ns: namespace_t = declarations.get_global_namespace(decls)
@@ -96,19 +250,326 @@ class CppSourceParser:
         filtered_decls: mdecl_wrapper_t = global_ns.decls(function=query)
 
         # Filter declarations in our source tree; include declarations from the
-        # wrapper_header_collection file for explicit instantiations, typedefs etc.
+        # header collection file for explicit instantiations, typedefs etc.
         source_decls: List[declaration_t] = [
             decl
             for decl in filtered_decls
-            if Path(self.source_root) in Path(decl.location.file_name).parents
+            if self.source_path_index.contains(decl.location.file_name)
+            or decl.location.file_name == collection_path
+        ]
+
+        return source_decls, included_files
+
+    def read_restricted(
+        self,
+        xml_generator_config: parser.xml_generator_configuration_t,
+        collection_path: str,
+    ) -> Tuple[List[declaration_t], List[str]]:
+        """
+        Parse a header collection, loading only declarations needed from the source tree.
+
+        The CastXML output is filtered before pygccxml reads it, so that
+        declarations from outside the source tree and the header collection
+        (e.g. the standard library) are only loaded if a source declaration
+        refers to them, and then without their members.
+
+        Parameters
+        ----------
+        xml_generator_config : xml_generator_configuration_t
+            The CastXML configuration
+        collection_path : str
+            The path to the header collection file to parse
+
+        Returns
+        -------
+        Tuple[List[declaration_t], List[str]]
+            The top level declarations, and the list of all files included by
+            the header collection.
+        """
+        logger = logging.getLogger()
+
+        source_prefix = os.path.join(self.source_root, "")
+
+        def keep_file(file_name: str) -> bool:
+            return file_name.startswith(source_prefix) or file_name == collection_path
+
+        reader = parser.source_reader_t(xml_generator_config)
+        xml_file = reader.create_xml_file(collection_path)
+        filtered_xml_file = f"{xml_file}.filtered.xml"
+        try:
+            file_names, num_kept, num_read = filter_castxml_output(
+                xml_file, filtered_xml_file, keep_file
+            )
+            logger.info(f"Loading {num_kept} of {num_read} CastXML elements.")
+            decls: List[declaration_t] = reader.read_xml_file(filtered_xml_file)
+        finally:
+            for file_name in (xml_file, filtered_xml_file):
+                if os.path.exists(file_name):
+                    os.remove(file_name)
+
+        included_files = [
+            file_name for file_name in file_names if os.path.isfile(file_name)
+        ]
+
+        return decls, included_files
+
+    def parse_incremental(
+        self, xml_generator_config: parser.xml_generator_configuration_t, cache_key: str
+    ) -> Optional[Tuple[List[declaration_t], List[str]]]:
+        """
+        Reparse changed headers and splice them into the previous declarations.
+
+        The previous declarations are taken from the latest parse cache entry.
+        Headers that changed since then, and the source headers including them,
+        are parsed in a small header collection along with the explicit template
+        instantiations and typedefs for classes declared in them. Declarations
+        from those headers are then replaced by the freshly parsed ones.
+
+        Parameters
+        ----------
+        xml_generator_config : xml_generator_configuration_t
+            The CastXML configuration
+        cache_key : str
+            The parse cache configuration key
+
+        Returns
+        -------
+        Optional[Tuple[List[declaration_t], List[str]]]
+            The spliced declarations and the list of included files, or None
+            if a full parse is needed.
+        """
+        logger = logging.getLogger()
+
+        previous = self.parse_cache.load_latest(cache_key)
+        if previous is None:
+            logger.info("No previous parse found - parsing all headers.")
+            return None
+
+        previous_decls, dependencies = previous
+        changed_files = self.parse_cache.check_dependencies(dependencies)
+
+        # Fall back to a full parse if the header collection changed, or if
+        # headers outside the source tree changed or were removed
+        for file_path in changed_files:
+            if file_path == self.wrapper_header_collection:
+                logger.info("Header collection changed - parsing all headers.")
+                return None
+            if not self.source_path_index.contains(file_path):
+                logger.info(f"{file_path} changed - parsing all headers.")
+                return None
+            if not os.path.isfile(file_path):
+                logger.info(f"{file_path} removed - parsing all headers.")
+                return None
+
+        # Find all source headers that include the changed headers
+        source_files = [
+            file_path
+            for file_path in dependencies
+            if self.source_path_index.contains(file_path)
+        ]
+        reparse_files = self.find_includers(changed_files, source_files)
+        logger.info(
+            f"Incremental parse of {len(reparse_files)} header(s): "
+            + ", ".join(os.path.basename(file_path) for file_path in reparse_files)
+        )
+
+        # Map typedefs in the header collection to the headers declaring their
+        # classes. Explicitly instantiated classes are located in the header
+        # collection, so use the location of their members instead.
+        typedef_targets: Dict[str, str] = {}
+        for decl in previous_decls:
+            if not isinstance(decl, declarations.typedef_t):
+                continue
+            class_decl = getattr(decl.decl_type, "declaration", None)
+            if not isinstance(class_decl, declarations.class_t):
+                continue
+            for member in [class_decl] + class_decl.declarations:
+                if (
+                    member.location
+                    and member.location.file_name != self.wrapper_header_collection
+                ):
+                    typedef_targets[decl.name] = member.location.file_name
+                    break
+
+        with open(self.wrapper_header_collection, "r") as in_file:
+            collection = in_file.read()
+
+        instantiations = ""
+        typedefs = ""
+        for cpp_name, py_name in re.findall(
+            r"^\s*typedef (.+) (\w+);$", collection, re.MULTILINE
+        ):
+            if typedef_targets.get(py_name) in reparse_files:
+                instantiations += f"template class {cpp_name};\n"
+                typedefs += f"    typedef {cpp_name} {py_name};\n"
+
+        # Write a header collection for the reparsed headers
+        collection_dir = os.path.dirname(self.wrapper_header_collection)
+        fd, collection_path = tempfile.mkstemp(
+            suffix=f".{CPPWG_EXT}.hpp", dir=collection_dir
+        )
+        with os.fdopen(fd, "w") as out_file:
+            for file_path in sorted(reparse_files):
+                out_file.write(f'#include "{file_path}"\n')
+            out_file.write(instantiations)
+            out_file.write("namespace cppwg\n{\n" + typedefs + "}\n")
+
+        try:
+            new_decls, new_included_files = self.parse_collection(
+                xml_generator_config, collection_path
+            )
+
+            # Relocate typedefs and explicit instantiations to the header collection
+            self.relocate_to_collection(new_decls, collection_path)
+        finally:
+            os.remove(collection_path)
+
+        # Splice the new declarations into the previous declarations. Previous
+        # declarations from the header collection are replaced where duplicated.
+        new_decls = [
+            decl
+            for decl in new_decls
+            if decl.location.file_name in reparse_files
             or decl.location.file_name == self.wrapper_header_collection
         ]
+        kept_decls = [
+            decl
+            for decl in previous_decls
+            if decl.location.file_name not in reparse_files
+        ]
+        source_decls = merge_declarations(
+            [new_decls, kept_decls], preferred_file=self.wrapper_header_collection
+        )
 
-        # Create a source namespace module for the filtered declarations
-        source_ns = namespace_t(name="source", declarations=source_decls)
+        included_files = set(dependencies).union(new_included_files)
+        included_files.discard(collection_path)
 
-        # Initialise the source namespace's internal type hash tables for faster queries
-        logger.info("Optimizing source declaration queries.")
-        source_ns.init_optimizer()
+        return source_decls, sorted(included_files)
 
-        return source_ns
+    def parse_shards(
+        self, xml_generator_config: parser.xml_generator_configuration_t
+    ) -> Tuple[List[declaration_t], List[str]]:
+        """
+        Parse the header collection shards in parallel and merge the declarations.
+
+        Each shard is parsed by CastXML in its own process. Declarations found
+        in more than one shard are deduplicated, with explicit instantiations
+        from the shards taking precedence.
+
+        Parameters
+        ----------
+        xml_generator_config : xml_generator_configuration_t
+            The CastXML configuration
+
+        Returns
+        -------
+        Tuple[List[declaration_t], List[str]]
+            The merged declarations, and the list of files included by all shards
+        """
+        num_shards = len(self.shard_collections)
+
+        # Raise the recursion limit in workers to pickle the declaration trees
+        with ProcessPoolExecutor(
+            max_workers=num_shards,
+            initializer=sys.setrecursionlimit,
+            initargs=(PICKLE_RECURSION_LIMIT,),
+        ) as executor:
+            results = list(
+                executor.map(
+                    self.parse_collection,
+                    [xml_generator_config] * num_shards,
+                    self.shard_collections,
+                )
+            )
+
+        decl_lists: List[List[declaration_t]] = []
+        included_files: Set[str] = {self.wrapper_header_collection}
+
+        for shard_path, (shard_decls, shard_included_files) in zip(
+            self.shard_collections, results
+        ):
+            self.relocate_to_collection(shard_decls, shard_path)
+            decl_lists.append(shard_decls)
+            included_files.update(shard_included_files)
+            included_files.discard(shard_path)
+
+        source_decls = merge_declarations(
+            decl_lists, preferred_file=self.wrapper_header_collection
+        )
+
+        return source_decls, sorted(included_files)
+
+    def relocate_to_collection(
+        self, decls: List[declaration_t], collection_path: str
+    ) -> None:
+        """
+        Relocate declarations from another collection file to the header collection.
+
+        Declarations such as typedefs and explicit template instantiations
+        located in `collection_path` are moved to the matching line of the
+        header collection.
+
+        Parameters
+        ----------
+        decls : List[declaration_t]
+            The declarations to relocate
+        collection_path : str
+            The path to the other collection file
+        """
+        with open(collection_path, "r") as in_file:
+            lines = in_file.read().splitlines()
+
+        with open(self.wrapper_header_collection, "r") as in_file:
+            collection_lines: Dict[str, int] = {}
+            for line_number, line in enumerate(in_file.read().splitlines(), 1):
+                collection_lines.setdefault(line, line_number)
+
+        for decl in decls:
+            if decl.location.file_name != collection_path:
+                continue
+            decl.location.file_name = self.wrapper_header_collection
+            if 0 < decl.location.line <= len(lines):
+                line = lines[decl.location.line - 1]
+                decl.location.line = collection_lines.get(line, decl.location.line)
+
+    @staticmethod
+    def find_includers(changed_files: List[str], source_files: List[str]) -> Set[str]:
+        """
+        Find the source files that directly or indirectly include changed files.
+
+        Parameters
+        ----------
+        changed_files : List[str]
+            The paths to the changed files
+        source_files : List[str]
+            The paths to the source files to search
+
+        Returns
+        -------
+        Set[str]
+            The changed files and all source files including them
+        """
+        include_regex = re.compile(r'^\s*#\s*include\s*[<"]([^>"]+)[>"]', re.MULTILINE)
+
+        # Map each source file to the files it includes
+        includes: Dict[str, List[str]] = {}
+        for file_path in source_files:
+            with open(file_path, "r", errors="replace") as in_file:
+                includes[file_path] = include_regex.findall(in_file.read())
+
+        def includes_file(includer: str, included_path: str) -> bool:
+            for name in includes.get(includer, []):
+                if included_path == name or included_path.endswith(os.sep + name):
+                    return True
+            return False
+
+        found = set(changed_files)
+        pending = list(changed_files)
+        while pending:
+            included_path = pending.pop()
+            for file_path in source_files:
+                if file_path not in found and includes_file(file_path, included_path):
+                    found.add(file_path)
+                    pending.append(file_path)
+
+        return found
@@ -0,0 +1,311 @@
+"""Precompiled wrapper templates and loadable template packs."""
+
+import keyword
+import logging
+import os
+import string
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Mapping, Optional
+
+import yaml
+
+from cppwg.templates import pybind11_default
+
+# The named placeholders each wrapper template is rendered with, and the
+# number of positional placeholders, as passed by the writers
+TEMPLATE_PLACEHOLDERS: Dict[str, FrozenSet[str]] = {
+    "class_cpp_header": frozenset(
+        {"includes", "class_py_name", "class_cpp_name", "smart_ptr_handle"}
+    ),
+    "class_definition": frozenset(
+        {"class_py_name", "overrides_string", "ptr_support", "bases"}
+    ),
+    "class_hpp_header": frozenset({"class_py_name"}),
+    "class_method": frozenset(
+        {
+            "def_adorn",
+            "method_name",
+            "return_type",
+            "self_ptr",
+            "arg_signature",
+            "const_adorn",
+            "class_py_name",
+            "method_docs",
+            "default_args",
+            "call_policy",
+        }
+    ),
+    "class_virtual_override_footer": frozenset(),
+    "class_virtual_override_header": frozenset({"class_py_name", "class_base_name"}),
+    "constructor": frozenset({"arg_signature", "default_args"}),
+    "free_function": frozenset(
+        {"def_adorn", "function_name", "function_docs", "default_args"}
+    ),
+    "method_virtual_override": frozenset(
+        {
+            "return_type",
+            "method_name",
+            "arg_string",
+            "const_adorn",
+            "overload_adorn",
+            "tidy_method_name",
+            "class_py_name",
+            "args_string",
+        }
+    ),
+    "smart_pointer_holder": frozenset({"smart_ptr_type"}),
+}
+
+TEMPLATE_POSITIONAL_PLACEHOLDERS: Dict[str, int] = {"smart_pointer_holder": 1}
+
+
+class WrapperTemplate:
+    """
+    A wrapper code template, compiled once into a renderer.
+
+    Templates use the `str.format` syntax e.g. "void register_{class_py_name}".
+    When a template is compiled, its placeholders are checked against those
+    the writers fill in, and it is turned into a function that builds the
+    output with an f-string, so rendering doesn't parse the template again.
+    Templates are rendered with `format`, like the strings they replace.
+
+    Attributes
+    ----------
+    name : str
+        The template name e.g. "class_method"
+    text : str
+        The template text
+    fields : FrozenSet[str]
+        The named placeholders in the template
+    format : Callable[..., str]
+        Renders the template, taking values for the placeholders as
+        arguments like `str.format`
+    """
+
+    __slots__ = ("name", "text", "fields", "format")
+
+    def __init__(self, name: str, text: str) -> None:
+        """
+        Compile and validate a template.
+
+        Parameters
+        ----------
+        name : str
+            The template name, which sets the allowed placeholders
+        text : str
+            The template text
+
+        Raises
+        ------
+        ValueError
+            If the template can't be parsed or has unknown placeholders
+        """
+        self.name: str = name
+        self.text: str = text
+        self.fields: FrozenSet[str] = frozenset()
+        self.format: Callable[..., str] = self.compile()
+
+    def __reduce__(self):
+        """
+        Pickle the template as its name and text, compiling it on unpickling.
+        """
+        return (WrapperTemplate, (self.name, self.text))
+
+    def __str__(self) -> str:
+        """
+        Return the template text.
+        """
+        return self.text
+
+    def error(self, message: str) -> ValueError:
+        """
+        Log an error with the template and get an exception to raise.
+
+        Parameters
+        ----------
+        message : str
+            The error message
+
+        Returns
+        -------
+        ValueError
+            The exception to raise
+        """
+        logger = logging.getLogger()
+        logger.error(f"Invalid wrapper template {self.name}: {message}")
+        return ValueError(self.name)
+
+    def compile(self) -> Callable[..., str]:
+        """
+        Compile the template into a rendering function.
+
+        Literal text and format specs are bound to names, so only validated
+        placeholder names appear in the generated code.
+
+        Returns
+        -------
+        Callable[..., str]
+            A function taking the placeholder values as arguments
+
+        Raises
+        ------
+        ValueError
+            If the template can't be parsed or has unknown placeholders
+        """
+        if self.name not in TEMPLATE_PLACEHOLDERS:
+            raise self.error(
+                f"unknown template name - expected one of "
+                f"{sorted(TEMPLATE_PLACEHOLDERS)}"
+            )
+        allowed_fields = TEMPLATE_PLACEHOLDERS[self.name]
+        allowed_positional = TEMPLATE_POSITIONAL_PLACEHOLDERS.get(self.name, 0)
+
+        try:
+            parsed = list(string.Formatter().parse(self.text))
+        except ValueError as error:
+            raise self.error(str(error))
+
+        namespace: Dict[str, Any] = {}
+        code: List[str] = []
+        fields: List[str] = []
+        next_positional = 0
+
+        for idx, (literal, field, format_spec, conversion) in enumerate(parsed):
+            if literal:
+                namespace[f"_literal{idx}"] = literal
+                code.append(f"{{_literal{idx}}}")
+
+            if field is None:
+                continue
+
+            if field == "" or field.isdigit():
+                # Positional placeholder e.g. "{}" or "{0}"
+                position = next_positional if field == "" else int(field)
+                next_positional += 1
+                if position >= allowed_positional:
+                    raise self.error(f"unexpected positional placeholder {{{field}}}")
+                value = f"_args[{position}]"
+
+            elif field.isidentifier() and not keyword.iskeyword(field):
+                if field not in allowed_fields:
+                    raise self.error(
+                        f"unknown placeholder {{{field}}} - expected one of "
+                        f"{sorted(allowed_fields)}"
+                    )
+                if field not in fields:
+                    fields.append(field)
+                value = field
+
+            else:
+                raise self.error(f"unsupported placeholder {{{field}}}")
+
+            if conversion:
+                if conversion not in ("r", "s", "a"):
+                    raise self.error(f"invalid conversion in {{{field}!{conversion}}}")
+                value += f"!{conversion}"
+            if format_spec:
+                if "{" in format_spec:
+                    raise self.error(f"nested placeholder in {{{field}:{format_spec}}}")
+                namespace[f"_spec{idx}"] = format_spec
+                value += f":{{_spec{idx}}}"
+            code.append(f"{{{value}}}")
+
+        self.fields = frozenset(fields)
+
+        # e.g. def render(*_args, class_py_name, **_unused):
+        #          return f"{_literal0}{class_py_name}{_literal1}"
+        parameters = ", ".join(["*_args"] + fields + ["**_unused"])
+        source = f'def render({parameters}):\n    return f"{"".join(code)}"\n'
+
+        try:
+            exec(compile(source, f"<{self.name} template>", "exec"), namespace)
+        except SyntaxError as error:
+            raise self.error(error.msg)
+        return namespace["render"]
+
+
+def compile_templates(templates: Mapping[str, str]) -> Dict[str, WrapperTemplate]:
+    """
+    Compile a collection of templates.
+
+    Parameters
+    ----------
+    templates : Mapping[str, str]
+        The template texts by name
+
+    Returns
+    -------
+    Dict[str, WrapperTemplate]
+        The compiled templates by name
+    """
+    return {name: WrapperTemplate(name, text) for name, text in templates.items()}
+
+
+def read_template_pack(pack: str) -> Dict[str, str]:
+    """
+    Read a template pack, by built-in name or from a yaml file.
+
+    A template pack file maps template names to template texts e.g.
+
+    class_cpp_header: |
+      #include <pybind11/pybind11.h>
+      ...
+
+    Parameters
+    ----------
+    pack : str
+        The name of a built-in pack e.g. "chaste", or the path to a pack file
+
+    Returns
+    -------
+    Dict[str, str]
+        The template texts by name
+    """
+    logger = logging.getLogger()
+
+    if pack in pybind11_default.template_packs:
+        return dict(pybind11_default.template_packs[pack])
+
+    if not os.path.isfile(pack):
+        logger.error(
+            f"Could not find template pack {pack} - expected a file or one of "
+            f"{sorted(pybind11_default.template_packs)}"
+        )
+        raise FileNotFoundError()
+
+    with open(pack, "r") as pack_file:
+        templates = yaml.safe_load(pack_file) or {}
+
+    if not isinstance(templates, dict) or not all(
+        isinstance(text, str) for text in templates.values()
+    ):
+        logger.error(f"Template pack {pack} should map template names to strings")
+        raise ValueError(pack)
+
+    return templates
+
+
+def load_templates(packs: Optional[Iterable[str]] = None) -> Dict[str, WrapperTemplate]:
+    """
+    Load the wrapper templates, overriding the defaults with template packs.
+
+    Packs are applied in order, so templates in later packs replace those in
+    earlier ones. Every template is compiled and validated up front.
+
+    Parameters
+    ----------
+    packs : Optional[Iterable[str]]
+        Built-in pack names or pack file paths
+
+    Returns
+    -------
+    Dict[str, WrapperTemplate]
+        The compiled templates by name
+    """
+    logger = logging.getLogger()
+
+    templates = dict(pybind11_default.template_collection)
+    for pack in packs or ():
+        logger.info(f"Loading wrapper templates from {pack}")
+        templates.update(read_template_pack(pack))
+
+    return compile_templates(templates)
@@ -42,7 +42,7 @@ public:
     using {class_py_name}::{class_base_name};
 """ % CPPWG_CLASS_OVERRIDE_SUFFIX
 
-class_virtual_override_footer = "}\n"
+class_virtual_override_footer = "}};\n\n"
 
 class_definition = """\
 void register_{class_py_name}_class(py::module &m)
@@ -73,8 +73,13 @@ class_method = """\
             {method_docs}{default_args}{call_policy})
 """
 
+constructor = """\
+        .def(py::init<{arg_signature}>(){default_args})
+"""
+
 template_collection = {
     "class_cpp_header": class_cpp_header,
+    "constructor": constructor,
     "free_function": free_function,
     "class_hpp_header": class_hpp_header,
     "class_method": class_method,
@@ -84,3 +89,9 @@ template_collection = {
     "smart_pointer_holder": smart_pointer_holder,
     "method_virtual_override": method_virtual_override,
 }
+
+# Built-in template packs, which replace templates in the collection above
+template_packs = {
+    "default": {},
+    "chaste": {"class_cpp_header": class_cpp_header_chaste},
+}
@@ -5,10 +5,31 @@ CPPWG_ALL_STRING = "CPPWG_ALL"
 
 CPPWG_EXT = "cppwg"
 CPPWG_HEADER_COLLECTION_FILENAME = f"wrapper_header_collection.{CPPWG_EXT}.hpp"
+CPPWG_MANIFEST_FILENAME = ".cppwg-manifest.json"
 
 CPPWG_TRUE_STRINGS = ["ON", "YES", "Y", "TRUE", "T", "1"]
 CPPWG_FALSE_STRINGS = ["OFF", "NO", "N", "FALSE", "F", "0", ""]
 
 CPPWG_DEFAULT_WRAPPER_DIR = "cppwg_wrappers"
 
+CPPWG_FRONTENDS = ["castxml", "libclang"]
+
 CPPWG_CLASS_OVERRIDE_SUFFIX = "_Overrides"
+
+CPPWG_DEFAULT_CACHE_MAX_SIZE = 1024  # MB
+
+# Config attributes looked up through the info tree by the writers
+CPPWG_INHERITED_CONFIG = (
+    "calldef_excludes",
+    "common_include_file",
+    "constructor_arg_type_excludes",
+    "constructor_signature_excludes",
+    "exclude_default_args",
+    "pointer_call_policy",
+    "prefix_text",
+    "reference_call_policy",
+    "return_type_excludes",
+    "smart_ptr_type",
+    "source_includes",
+    "template_substitutions",
+)
@@ -0,0 +1,193 @@
+"""Graph for ordering items after the items they depend on."""
+
+from typing import Dict, Generic, Hashable, Iterable, List, TypeVar
+
+T = TypeVar("T", bound=Hashable)
+
+
+class DependencyGraph(Generic[T]):
+    """
+    A graph of dependencies between items.
+
+    The graph is used to order items so that each item comes after the items
+    it depends on. Items are kept in the order they are given, which is used
+    to break ties between independent items.
+
+    Attributes
+    ----------
+    items : List[T]
+        The items in the graph, in their initial order
+    """
+
+    def __init__(self, items: Iterable[T]) -> None:
+        """
+        Create a graph with no dependencies.
+
+        Parameters
+        ----------
+        items : Iterable[T]
+            The items in their initial order
+        """
+        self.items: List[T] = list(dict.fromkeys(items))
+
+        self._index: Dict[T, int] = {item: i for i, item in enumerate(self.items)}
+
+        # Dependencies and dependents of each item, by index
+        self._dependencies: List[Dict[int, None]] = [{} for _ in self.items]
+        self._dependents: List[Dict[int, None]] = [{} for _ in self.items]
+
+    def add_dependency(self, item: T, dependency: T) -> None:
+        """
+        Record that an item depends on another item.
+
+        Parameters
+        ----------
+        item : T
+            The dependent item
+        dependency : T
+            The item it depends on
+        """
+        i = self._index[item]
+        j = self._index[dependency]
+        if i != j:
+            self._dependencies[i][j] = None
+            self._dependents[j][i] = None
+
+    def dependencies(self, item: T) -> List[T]:
+        """
+        Get the items an item depends on.
+
+        Parameters
+        ----------
+        item : T
+            The item
+
+        Returns
+        -------
+        List[T]
+            The items it depends on, in the order they were added
+        """
+        return [self.items[j] for j in self._dependencies[self._index[item]]]
+
+    def cycles(self) -> List[List[T]]:
+        """
+        Get the groups of items that depend on each other.
+
+        Returns
+        -------
+        List[List[T]]
+            The strongly connected components with more than one item, each
+            in the initial order of the items
+        """
+        # Iterative Tarjan's algorithm
+        n = len(self.items)
+        index = [-1] * n
+        lowlink = [0] * n
+        on_stack = [False] * n
+        stack: List[int] = []
+        components: List[List[int]] = []
+        counter = 0
+
+        for root in range(n):
+            if index[root] != -1:
+                continue
+
+            work = [(root, iter(self._dependencies[root]))]
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+
+            while work:
+                node, successors = work[-1]
+                for successor in successors:
+                    if index[successor] == -1:
+                        index[successor] = lowlink[successor] = counter
+                        counter += 1
+                        stack.append(successor)
+                        on_stack[successor] = True
+                        work.append((successor, iter(self._dependencies[successor])))
+                        break
+                    if on_stack[successor]:
+                        lowlink[node] = min(lowlink[node], index[successor])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+                    if lowlink[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = False
+                            component.append(member)
+                            if member == node:
+                                break
+                        if len(component) > 1:
+                            components.append(sorted(component))
+
+        components.sort()
+        return [[self.items[i] for i in component] for component in components]
+
+    def sorted(self) -> List[T]:
+        """
+        Order the items so that each item comes after its dependencies.
+
+        Items are visited in order. An item with a dependency later in the
+        order moves to just after its last such dependency, and its
+        dependents between the two positions move with it. This is the order
+        the original pairwise class sort produced, so it is kept for
+        acyclic graphs.
+
+        Within a cycle, a dependency on a later item in the initial order is
+        ignored, so cyclic graphs are still ordered deterministically.
+
+        Returns
+        -------
+        List[T]
+            The ordered items
+        """
+        n = len(self.items)
+
+        dependencies = [list(deps) for deps in self._dependencies]
+        dependents = [list(deps) for deps in self._dependents]
+
+        # Break cycles
+        for component in self.cycles():
+            members = {self._index[item] for item in component}
+            for i in members:
+                dependencies[i] = [
+                    j for j in dependencies[i] if j not in members or j < i
+                ]
+                dependents[i] = [j for j in dependents[i] if j not in members or j > i]
+
+        order = list(range(n))
+        position = list(range(n))
+
+        i = 0
+        while i < n - 1:
+            node = order[i]
+
+            # The position of the last dependency after this item
+            last = max(
+                (position[j] for j in dependencies[node] if position[j] > i),
+                default=i,
+            )
+            if last == i:
+                i += 1
+                continue
+
+            # Positions of dependents that need to move along with this item
+            moved = sorted(
+                position[j] for j in dependents[node] if i < position[j] <= last
+            )
+
+            order.insert(last, order.pop(i))
+            for k, j in enumerate(moved):
+                order.insert(last + k, order.pop(j - 1 - k))
+
+            for k in range(i, min(n, last + len(moved) + 1)):
+                position[order[k]] = k
+
+        return [self.items[i] for i in order]
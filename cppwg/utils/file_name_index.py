@@ -0,0 +1,70 @@
+"""Index for looking up source files by file name."""
+
+import os
+from typing import Dict, Iterable, List, Tuple
+
+
+class FileNameIndex:
+    """
+    An index of file paths by base name and stem.
+
+    The index is built once for the source headers, so mapping a class to
+    its header is a dictionary lookup instead of a scan over all headers.
+    Paths with the same name are kept in the order they are given.
+
+    Attributes
+    ----------
+    file_paths : Tuple[str, ...]
+        The indexed file paths
+    """
+
+    def __init__(self, file_paths: Iterable[str]) -> None:
+        """
+        Create an index over some file paths.
+
+        Parameters
+        ----------
+        file_paths : Iterable[str]
+            The file paths e.g. the source headers
+        """
+        self.file_paths: Tuple[str, ...] = tuple(file_paths)
+
+        self._paths_by_name: Dict[str, List[str]] = {}
+        self._paths_by_stem: Dict[str, List[str]] = {}
+        for file_path in self.file_paths:
+            file_name = os.path.basename(file_path)
+            stem = os.path.splitext(file_name)[0]
+            self._paths_by_name.setdefault(file_name, []).append(file_path)
+            self._paths_by_stem.setdefault(stem, []).append(file_path)
+
+    def paths_by_name(self, file_name: str) -> List[str]:
+        """
+        Get the paths of the files with a base name.
+
+        Parameters
+        ----------
+        file_name : str
+            The base name e.g. "Foo.hpp"
+
+        Returns
+        -------
+        List[str]
+            The matching file paths
+        """
+        return list(self._paths_by_name.get(file_name, []))
+
+    def paths_by_stem(self, stem: str) -> List[str]:
+        """
+        Get the paths of the files with a base name, less its extension.
+
+        Parameters
+        ----------
+        stem : str
+            The base name without extension e.g. "Foo"
+
+        Returns
+        -------
+        List[str]
+            The matching file paths
+        """
+        return list(self._paths_by_stem.get(stem, []))
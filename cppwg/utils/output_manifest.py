@@ -0,0 +1,311 @@
+"""Manifest of generated wrapper files, for writing only changed files."""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+from cppwg.utils.constants import CPPWG_MANIFEST_FILENAME
+
+# Generated file content, as a string or a sequence of fragments to join
+Content = Union[str, Sequence[str]]
+
+# Size of the chunks existing files are read in to hash them
+READ_CHUNK_SIZE = 1 << 16
+
+
+def content_hash(content: Content) -> str:
+    """
+    Get the hash of some file content.
+
+    The fragments of the content are hashed in turn, so the content doesn't
+    need to be joined into one string first.
+
+    Parameters
+    ----------
+    content : Content
+        The file content, or its fragments
+
+    Returns
+    -------
+    str
+        A hex digest of the content
+    """
+    if isinstance(content, str):
+        content = (content,)
+
+    digest = hashlib.sha1()
+    for fragment in content:
+        digest.update(fragment.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def file_hash(file_path: str) -> Optional[str]:
+    """
+    Get the hash of a text file's content.
+
+    Parameters
+    ----------
+    file_path : str
+        The path to the file
+
+    Returns
+    -------
+    Optional[str]
+        A hex digest of the content, or None if the file can't be read
+    """
+    digest = hashlib.sha1()
+    try:
+        with open(file_path, "r") as in_file:
+            for chunk in iter(lambda: in_file.read(READ_CHUNK_SIZE), ""):
+                digest.update(chunk.encode("utf-8"))
+    except (OSError, UnicodeDecodeError):
+        return None
+    return digest.hexdigest()
+
+
+def write_if_changed(
+    file_path: str, content: Content, digest: Optional[str] = None
+) -> bool:
+    """
+    Write a file, unless it already has the same content.
+
+    Leaving unchanged files alone keeps their modification times, so build
+    tools don't recompile them. The content is hashed and written a fragment
+    at a time, without joining it into one string.
+
+    Parameters
+    ----------
+    file_path : str
+        The path to the file
+    content : Content
+        The file content, or its fragments
+    digest : Optional[str]
+        The content hash, if already known
+
+    Returns
+    -------
+    bool
+        True if the file was written
+    """
+    if digest is None:
+        digest = content_hash(content)
+
+    if file_hash(file_path) == digest:
+        return False
+
+    if isinstance(content, str):
+        content = (content,)
+
+    with open(file_path, "w") as out_file:
+        out_file.writelines(content)
+    return True
+
+
+def write_output(
+    file_path: str,
+    content: Content,
+    output_manifest: Optional["OutputManifest"] = None,
+) -> None:
+    """
+    Write a generated file if it has changed, recording it in a manifest if set.
+
+    Parameters
+    ----------
+    file_path : str
+        The path to the file
+    content : Content
+        The file content, or its fragments
+    output_manifest : Optional[OutputManifest]
+        The manifest to record the file in
+    """
+    if output_manifest:
+        output_manifest.write(file_path, content)
+    else:
+        write_if_changed(file_path, content)
+
+
+class OutputManifest:
+    """
+    A record of the files generated in an output directory.
+
+    Generated files are only written if their content has changed. The
+    manifest file lists each generated file with its content hash. When the
+    manifest is saved, files listed by the previous run but not generated in
+    this run are removed, unless they were edited since they were generated.
+
+    Attributes
+    ----------
+    output_root : str
+        The output directory
+    scopes : Optional[List[str]]
+        Directories, relative to the output root, whose files are all
+        generated by this run e.g. the modules being generated. Stale files
+        are only removed from these directories. If None, stale files are
+        removed from anywhere in the output root.
+    written : int
+        The number of files written
+    unchanged : int
+        The number of files left unchanged
+    removed : int
+        The number of stale files removed
+    """
+
+    def __init__(self, output_root: str, scopes: Optional[Iterable[str]] = None):
+        """
+        Create a manifest for an output directory, loading the previous manifest.
+
+        Parameters
+        ----------
+        output_root : str
+            The output directory
+        scopes : Optional[Iterable[str]]
+            Directories whose files are all generated by this run
+        """
+        self.output_root: str = os.path.abspath(output_root)
+        self.scopes: Optional[List[str]] = None if scopes is None else list(scopes)
+
+        self.written: int = 0
+        self.unchanged: int = 0
+        self.removed: int = 0
+
+        self.manifest_path: str = os.path.join(
+            self.output_root, CPPWG_MANIFEST_FILENAME
+        )
+
+        # Content hashes of the files generated in the previous and this run,
+        # keyed by path relative to the output root
+        self.previous_files: Dict[str, str] = self.load()
+        self.files: Dict[str, str] = {}
+
+    def load(self) -> Dict[str, str]:
+        """
+        Load the previous manifest.
+
+        Returns
+        -------
+        Dict[str, str]
+            The content hashes of the previously generated files, or an empty
+            dict if there is no readable manifest
+        """
+        logger = logging.getLogger()
+
+        try:
+            with open(self.manifest_path, "r") as manifest_file:
+                return dict(json.load(manifest_file)["files"])
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.warning(f"Could not read manifest {self.manifest_path}")
+            return {}
+
+    def relative_path(self, file_path: str) -> str:
+        """
+        Get the manifest key for a file.
+
+        Parameters
+        ----------
+        file_path : str
+            The path to the file
+
+        Returns
+        -------
+        str
+            The path relative to the output root, with "/" separators
+        """
+        relative_path = os.path.relpath(os.path.abspath(file_path), self.output_root)
+        return relative_path.replace(os.sep, "/")
+
+    def write(self, file_path: str, content: Content) -> bool:
+        """
+        Write a generated file if it has changed, and record it.
+
+        Parameters
+        ----------
+        file_path : str
+            The path to the file
+        content : Content
+            The file content, or its fragments
+
+        Returns
+        -------
+        bool
+            True if the file was written
+        """
+        digest = content_hash(content)
+        written = write_if_changed(file_path, content, digest)
+        if written:
+            self.written += 1
+        else:
+            self.unchanged += 1
+
+        self.files[self.relative_path(file_path)] = digest
+        return written
+
+    def in_scope(self, relative_path: str) -> bool:
+        """
+        Check if a file is in a directory generated by this run.
+
+        Parameters
+        ----------
+        relative_path : str
+            The path relative to the output root
+
+        Returns
+        -------
+        bool
+            True if the file is in one of the scopes
+        """
+        if self.scopes is None:
+            return True
+        return any(relative_path.startswith(f"{scope}/") for scope in self.scopes)
+
+    def save(self) -> None:
+        """
+        Remove stale files and save the manifest.
+        """
+        logger = logging.getLogger()
+
+        for relative_path, previous_hash in sorted(self.previous_files.items()):
+            if relative_path in self.files:
+                continue
+
+            # Keep the record of files from directories not generated this run
+            if not self.in_scope(relative_path):
+                self.files[relative_path] = previous_hash
+                continue
+
+            file_path = os.path.join(self.output_root, relative_path)
+            current_hash = file_hash(file_path)
+            if current_hash is None:
+                continue
+
+            if current_hash != previous_hash:
+                logger.warning(
+                    f"Not removing stale file edited since generated: {file_path}"
+                )
+                continue
+
+            os.remove(file_path)
+            self.removed += 1
+            logger.info(f"Removed stale file {file_path}")
+
+        manifest = {"files": dict(sorted(self.files.items()))}
+        with open(self.manifest_path, "w") as manifest_file:
+            json.dump(manifest, manifest_file, indent=1)
+            manifest_file.write("\n")
+
+    def summary(self) -> str:
+        """
+        Get a summary of the files written, unchanged and removed.
+
+        Returns
+        -------
+        str
+            The summary
+        """
+        return (
+            f"Wrapper files: {self.written} written, {self.unchanged} unchanged, "
+            f"{self.removed} removed."
+        )
@@ -0,0 +1,104 @@
+"""Index for checking which directories contain a file."""
+
+from pathlib import Path
+from typing import Dict, Iterable, Tuple
+
+
+class PathIndex:
+    """
+    An index of directories for fast, memoized file membership checks.
+
+    Checking `Path(directory) in Path(file_name).parents` for every
+    declaration repeats the same pathlib work for each declaration in a
+    file. The index classifies each distinct file name once, and later
+    lookups are dictionary lookups.
+
+    Membership follows the same rule as `Path.parents`: a file is in a
+    directory if the directory is a strict ancestor of the file path.
+
+    Attributes
+    ----------
+    directories : Tuple[str, ...]
+        The indexed directories
+    """
+
+    def __init__(self, directories: Iterable[str]) -> None:
+        """
+        Create an index over some directories.
+
+        Parameters
+        ----------
+        directories : Iterable[str]
+            The directories to index e.g. the source root and source locations
+        """
+        self.directories: Tuple[str, ...] = tuple(dict.fromkeys(directories))
+
+        # Map each normalized directory path to the directories given for it
+        self._directories_by_path: Dict[Path, Tuple[str, ...]] = {}
+        for directory in self.directories:
+            path = Path(directory)
+            self._directories_by_path[path] = self._directories_by_path.get(
+                path, ()
+            ) + (directory,)
+
+        self._matches: Dict[str, Tuple[str, ...]] = {}
+
+    def matches(self, file_name: str) -> Tuple[str, ...]:
+        """
+        Get the indexed directories containing a file.
+
+        Parameters
+        ----------
+        file_name : str
+            The path to the file
+
+        Returns
+        -------
+        Tuple[str, ...]
+            The directories containing the file, deepest first
+        """
+        matches = self._matches.get(file_name)
+        if matches is None:
+            matches = ()
+            for parent in Path(file_name).parents:
+                matches += self._directories_by_path.get(parent, ())
+            self._matches[file_name] = matches
+        return matches
+
+    def longest_match(self, file_name: str) -> str:
+        """
+        Get the deepest indexed directory containing a file.
+
+        Parameters
+        ----------
+        file_name : str
+            The path to the file
+
+        Returns
+        -------
+        str
+            The deepest directory containing the file, or "" if there is none
+        """
+        matches = self.matches(file_name)
+        return matches[0] if matches else ""
+
+    def contains(self, file_name: str, directory: str = "") -> bool:
+        """
+        Check if a file is in an indexed directory.
+
+        Parameters
+        ----------
+        file_name : str
+            The path to the file
+        directory : str
+            An indexed directory to check; by default any indexed directory
+
+        Returns
+        -------
+        bool
+            True if the file is in the directory
+        """
+        matches = self.matches(file_name)
+        if directory:
+            return directory in matches
+        return bool(matches)
@@ -0,0 +1,138 @@
+"""Cache of stripped C++ source text and class indexes."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+
+from cppwg.utils.source_lexer import CppSourceIndex
+
+
+class SourceCache:
+    """
+    A cache of lexed source files.
+
+    Each entry holds the source stripped of comments, preprocessor lines and
+    whitespace, and an index of its class definitions. Entries are keyed by
+    path and validated against the file's modification time and size, so
+    each source file is read and lexed at most once while it is unchanged.
+    Files can be loaded ahead of use by a thread pool.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        """
+        Create an empty cache.
+
+        Parameters
+        ----------
+        max_workers : Optional[int]
+            The number of threads used to load files; defaults to the
+            ThreadPoolExecutor default
+        """
+        self.max_workers = max_workers
+
+        # Lexed source and (mtime, size) stamp, by path
+        self._entries: Dict[str, Tuple[Tuple[int, int], CppSourceIndex]] = {}
+
+    @staticmethod
+    def _stamp(path: str) -> Tuple[int, int]:
+        """
+        Get the modification time and size of a file.
+
+        Parameters
+        ----------
+        path : str
+            The path to the file
+
+        Returns
+        -------
+        Tuple[int, int]
+            The modification time in nanoseconds and the size in bytes
+        """
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    @classmethod
+    def _load(cls, path: str) -> Tuple[Tuple[int, int], CppSourceIndex]:
+        """
+        Read and lex a source file.
+
+        Parameters
+        ----------
+        path : str
+            The path to the source file
+
+        Returns
+        -------
+        Tuple[Tuple[int, int], CppSourceIndex]
+            The file's stamp and the lexed source
+        """
+        stamp = cls._stamp(path)
+        return stamp, CppSourceIndex.from_file(path)
+
+    def _is_current(self, path: str) -> bool:
+        """
+        Check if a file has an entry matching its current stamp.
+
+        Parameters
+        ----------
+        path : str
+            The path to the source file
+
+        Returns
+        -------
+        bool
+            True if the cached source is up to date
+        """
+        entry = self._entries.get(path)
+        return entry is not None and entry[0] == self._stamp(path)
+
+    def prefetch(self, paths: Iterable[str]) -> None:
+        """
+        Load source files that aren't cached or have changed, in parallel.
+
+        Parameters
+        ----------
+        paths : Iterable[str]
+            The paths to the source files
+        """
+        paths = [path for path in dict.fromkeys(paths) if not self._is_current(path)]
+        if not paths:
+            return
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for path, entry in zip(paths, executor.map(self._load, paths)):
+                self._entries[path] = entry
+
+    def index(self, path: str) -> CppSourceIndex:
+        """
+        Get the lexed source of a file, loading it if needed.
+
+        Parameters
+        ----------
+        path : str
+            The path to the source file
+
+        Returns
+        -------
+        CppSourceIndex
+            The stripped source and its class definitions
+        """
+        if not self._is_current(path):
+            self._entries[path] = self._load(path)
+        return self._entries[path][1]
+
+    def get(self, path: str) -> str:
+        """
+        Get the stripped source of a file, loading it if needed.
+
+        Parameters
+        ----------
+        path : str
+            The path to the source file
+
+        Returns
+        -------
+        str
+            The source stripped of comments, preprocessor lines and whitespace
+        """
+        return self.index(path).source
@@ -0,0 +1,412 @@
+"""Single-pass lexer for stripping C++ source and indexing class declarations."""
+
+import mmap
+import re
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+# Bytes that can be part of a word (\w), counting non-ASCII bytes as letters
+_WORD_BYTES = frozenset(
+    b"0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz"
+) | frozenset(range(0x80, 0x100))
+
+# One token per match. Directives are lines starting with "#", so whitespace
+# stops at the newline before an indented directive.
+_TOKEN_REGEX = re.compile(
+    rb"""
+    (?P<directive>(?<![^\n])[ \t]*\#(?:\\\r?\n|[^\n])*)
+    |(?P<space>\s*\n(?=[ \t]*\#)|(?:\s|\\\r?\n)+)
+    |(?P<line_comment>//(?:\\\r?\n|[^\n])*)
+    |(?P<block_comment>/\*(?s:.*?)(?:\*/|\Z))
+    |(?P<literal>
+        (?:u8|[uUL])?R"(?P<delimiter>[^()\\\s"]{0,16})\((?s:.*?)\)(?P=delimiter)"
+        |(?:u8|[uUL])?"(?:\\.|[^"\\\n])*"?
+        |(?:u8|[uUL])?'(?:\\.|[^'\\\n])*'?
+    )
+    |(?P<number>\.?\d(?:[eEpP][+-]|'(?=\w)|[\w.\x80-\xff])*)
+    |(?P<word>[A-Za-z_\x80-\xff][\w\x80-\xff]*)
+    |(?P<punct>(?:[^\s\w/"'\#\x80-\xff]|/(?![/*]))+|\#)
+    """,
+    re.VERBOSE,
+)
+
+_LT, _GT, _LPAREN, _RPAREN, _LBRACE, _COLON, _SEMICOLON = b"<>(){:;"
+
+# States of the template scanner
+_NO_TEMPLATE = 0
+_TEMPLATE = 1  # After "template", expecting "<"
+_TEMPLATE_PARAMS = 2  # In the template parameter list
+_AFTER_TEMPLATE = 3  # Just after the template parameter list
+
+# States of the class scanner
+_NO_CLASS = 0
+_CLASS = 1  # After "class" or "struct", expecting the name
+_CLASS_NAME = 2  # After the class name
+_INHERITANCE = 3  # In the inheritance clause
+
+
+class CppSourceClass(NamedTuple):
+    """
+    A class or struct definition found in C++ source.
+
+    Attributes
+    ----------
+    kind : str
+        "class" or "struct"
+    name : str
+        The class name e.g. "Foo"
+    template_signature : str
+        The stripped template signature e.g. "<int A,int B=A>", or "" if the
+        class isn't a template
+    inheritance : str
+        The stripped inheritance clause e.g. "public Bar<2>", or "" if none
+    """
+
+    kind: str
+    name: str
+    template_signature: str
+    inheritance: str
+
+
+def lex_source(
+    source: Union[bytes, bytearray, mmap.mmap],
+    strip_comments: bool = True,
+    strip_preprocessor: bool = True,
+    strip_whitespace: bool = True,
+    index_classes: bool = True,
+) -> Tuple[str, List[CppSourceClass]]:
+    """
+    Strip C++ source and find its class definitions in a single pass.
+
+    Comments, string and character literals and preprocessor lines are
+    recognized, so e.g. "//" inside a string isn't taken as a comment.
+    Stripped whitespace is kept as a single space only between two words.
+
+    Class definitions are found at any nesting level. Explicit and partial
+    specializations, forward declarations and enum classes are skipped.
+
+    Parameters
+    ----------
+    source : Union[bytes, bytearray, mmap.mmap]
+        The source, encoded as UTF-8
+    strip_comments : bool
+        Strip comments from the source
+    strip_preprocessor : bool
+        Strip preprocessor directive lines from the source
+    strip_whitespace : bool
+        Strip newlines and non-essential whitespace from the source
+    index_classes : bool
+        Find class definitions
+
+    Returns
+    -------
+    Tuple[str, List[CppSourceClass]]
+        The stripped source and the class definitions, in source order
+    """
+    pieces: List[bytes] = []
+    append = pieces.append
+    pending_space = False
+    last_is_word = False
+
+    classes: List[CppSourceClass] = []
+    template_state = _NO_TEMPLATE
+    class_state = _NO_CLASS
+    previous_word: Optional[bytes] = None
+    signature = b""
+    signature_start = 0
+    angle_depth = 0
+    paren_depth = 0
+    class_kind = b""
+    class_name = b""
+    class_signature = b""
+    inheritance_start = 0
+
+    for match in _TOKEN_REGEX.finditer(source):
+        kind = match.lastgroup
+
+        if kind == "space":
+            if strip_whitespace:
+                pending_space = True
+            else:
+                # Drop trailing whitespace on each line
+                lines = match.group().split(b"\n")
+                append(b"\n".join([line.rstrip() for line in lines[:-1]] + lines[-1:]))
+                last_is_word = False
+            continue
+
+        token = match.group()
+
+        if kind == "line_comment" or kind == "block_comment":
+            if not strip_comments:
+                append(token)
+                last_is_word = False
+            elif kind == "block_comment":
+                if strip_whitespace:
+                    pending_space = True
+                else:
+                    append(b" ")
+                    last_is_word = False
+            continue
+
+        if kind == "directive":
+            if not strip_preprocessor:
+                append(token)
+                last_is_word = False
+            continue
+
+        # Code tokens: literals, numbers, words and punctuation
+        if pending_space:
+            if last_is_word and token[0] in _WORD_BYTES:
+                append(b" ")
+            pending_space = False
+        append(token)
+        last_is_word = token[-1] in _WORD_BYTES
+
+        if not index_classes:
+            continue
+
+        start = match.start()
+
+        # Template parameter lists, found so they can be attached to the
+        # class that follows. Comparisons in default template arguments can
+        # unbalance the angle brackets, so classes are scanned separately.
+        if template_state == _TEMPLATE_PARAMS:
+            if kind == "punct":
+                for i in range(len(token)):
+                    char = token[i]
+                    if char == _LPAREN:
+                        paren_depth += 1
+                    elif char == _RPAREN:
+                        paren_depth -= 1
+                    elif paren_depth == 0 and char == _LT:
+                        angle_depth += 1
+                    elif paren_depth == 0 and char == _GT:
+                        angle_depth -= 1
+                        if angle_depth == 0:
+                            end = start + i + 1
+                            signature = source[signature_start:end]
+                            template_state = _AFTER_TEMPLATE
+                            if i + 1 < len(token):
+                                template_state = _NO_TEMPLATE
+                            break
+        elif template_state == _TEMPLATE and kind == "punct" and token[0] == _LT:
+            template_state = _TEMPLATE_PARAMS
+            signature_start = start
+            angle_depth = paren_depth = 0
+            for char in token:
+                if char == _LT:
+                    angle_depth += 1
+                elif char == _GT:
+                    angle_depth -= 1
+            if angle_depth <= 0:
+                # Explicit specialization e.g. "template <>"
+                template_state = _NO_TEMPLATE
+        elif kind == "word" and token == b"template":
+            template_state = _TEMPLATE
+        elif template_state != _AFTER_TEMPLATE or not (
+            token == b"class" or token == b"struct"
+        ):
+            template_state = _NO_TEMPLATE
+
+        # Class definitions
+        if class_state == _NO_CLASS:
+            if (token == b"class" or token == b"struct") and previous_word != b"enum":
+                class_state = _CLASS
+                class_kind = token
+                class_signature = b""
+                if template_state == _AFTER_TEMPLATE:
+                    class_signature = signature
+                    template_state = _NO_TEMPLATE
+
+        elif class_state == _CLASS:
+            class_state = _CLASS_NAME if kind == "word" else _NO_CLASS
+            class_name = token
+
+        elif class_state == _CLASS_NAME:
+            if kind == "word" and token == b"final":
+                pass
+            elif kind == "punct" and token[0] == _LBRACE:
+                classes.append(
+                    _source_class(class_kind, class_name, class_signature, b"")
+                )
+                class_state = _NO_CLASS
+                template_state = _NO_TEMPLATE
+            elif kind == "punct" and token[0] == _COLON and token[1:2] != b":":
+                class_state = _INHERITANCE
+                inheritance_start = start + 1
+            else:
+                class_state = _NO_CLASS
+
+        if class_state == _INHERITANCE and kind == "punct":
+            for i in range(1 if start < inheritance_start else 0, len(token)):
+                char = token[i]
+                if char == _SEMICOLON:
+                    class_state = _NO_CLASS
+                    break
+                if char == _LBRACE:
+                    end = start + i
+                    inheritance = source[inheritance_start:end]
+                    classes.append(
+                        _source_class(
+                            class_kind, class_name, class_signature, inheritance
+                        )
+                    )
+                    class_state = _NO_CLASS
+                    template_state = _NO_TEMPLATE
+                    break
+
+        previous_word = token if kind == "word" else None
+
+    return b"".join(pieces).decode("utf-8", errors="replace"), classes
+
+
+@lru_cache(maxsize=4096)
+def _strip(source: bytes) -> str:
+    """
+    Strip a short piece of source e.g. a template signature.
+
+    Parameters
+    ----------
+    source : bytes
+        The source piece
+
+    Returns
+    -------
+    str
+        The stripped source
+    """
+    return lex_source(source, index_classes=False)[0]
+
+
+def _source_class(
+    kind: bytes, name: bytes, signature: bytes, inheritance: bytes
+) -> CppSourceClass:
+    """
+    Create a class definition record from raw source bytes.
+
+    Parameters
+    ----------
+    kind : bytes
+        b"class" or b"struct"
+    name : bytes
+        The class name
+    signature : bytes
+        The raw template signature
+    inheritance : bytes
+        The raw inheritance clause
+
+    Returns
+    -------
+    CppSourceClass
+        The class definition, with stripped signature and inheritance
+    """
+    return CppSourceClass(
+        kind=kind.decode(),
+        name=name.decode("utf-8", errors="replace"),
+        template_signature=_strip(signature),
+        inheritance=_strip(inheritance),
+    )
+
+
+class CppSourceIndex:
+    """
+    A stripped C++ source file with an index of its class definitions.
+
+    Attributes
+    ----------
+    source : str
+        The source stripped of comments, preprocessor lines and whitespace
+    classes : List[CppSourceClass]
+        The class definitions in the source, in source order
+    """
+
+    def __init__(self, source: str, classes: List[CppSourceClass]) -> None:
+        """
+        Create an index from lexed source.
+
+        Parameters
+        ----------
+        source : str
+            The stripped source
+        classes : List[CppSourceClass]
+            The class definitions in the source
+        """
+        self.source = source
+        self.classes = classes
+
+        self._classes_by_name: Dict[str, List[CppSourceClass]] = {}
+        for source_class in classes:
+            self._classes_by_name.setdefault(source_class.name, []).append(source_class)
+
+    @classmethod
+    def from_source(cls, source: str) -> "CppSourceIndex":
+        """
+        Lex a C++ source string.
+
+        Parameters
+        ----------
+        source : str
+            The source string
+
+        Returns
+        -------
+        CppSourceIndex
+            The index of the source
+        """
+        return cls(*lex_source(source.encode("utf-8")))
+
+    @classmethod
+    def from_file(cls, source_file_path: str) -> "CppSourceIndex":
+        """
+        Lex a C++ source file, reading it through a memory map.
+
+        Parameters
+        ----------
+        source_file_path : str
+            The path to the source file
+
+        Returns
+        -------
+        CppSourceIndex
+            The index of the source file
+        """
+        with open(source_file_path, "rb") as source_file:
+            try:
+                with mmap.mmap(
+                    source_file.fileno(), 0, access=mmap.ACCESS_READ
+                ) as source:
+                    return cls(*lex_source(source))
+            except ValueError:
+                # Empty files can't be mapped
+                return cls(*lex_source(source_file.read()))
+
+    def find_classes(
+        self, class_name: Optional[str] = None, template_signature: Optional[str] = None
+    ) -> List[Tuple[str, str, str]]:
+        """
+        Find class definitions by name and template signature.
+
+        Parameters
+        ----------
+        class_name : Optional[str]
+            The class name to search for; if None, all classes are returned.
+        template_signature : Optional[str]
+            The template signature to search for e.g. "<int A, int B>"; if
+            None, classes are returned whether they are templates or not.
+
+        Returns
+        -------
+        List[Tuple[str, str, str]]
+            A list of (struct/class, class_name, inheritance) tuples
+        """
+        if class_name:
+            name = _strip(class_name.encode("utf-8"))
+            classes = self._classes_by_name.get(name, [])
+        else:
+            classes = self.classes
+
+        if template_signature:
+            signature = _strip(template_signature.encode("utf-8"))
+            classes = [c for c in classes if c.template_signature == signature]
+
+        return [(c.kind, c.name, c.inheritance) for c in classes]
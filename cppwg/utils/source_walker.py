@@ -0,0 +1,228 @@
+"""Walker for discovering source files."""
+
+import fnmatch
+import os
+import re
+from typing import Iterable, List, NamedTuple, Pattern, Set, Tuple
+
+from cppwg.utils.constants import CPPWG_EXT
+
+
+class IgnoreRule(NamedTuple):
+    """
+    A pattern read from an ignore file.
+
+    Attributes
+    ----------
+    base : str
+        The directory holding the ignore file
+    regex : Pattern[str]
+        The compiled pattern
+    anchored : bool
+        Whether the pattern is matched against the path relative to the base,
+        rather than the file or directory name
+    directory_only : bool
+        Whether the pattern only matches directories
+    """
+
+    base: str
+    regex: Pattern[str]
+    anchored: bool
+    directory_only: bool
+
+
+def compile_patterns(patterns: Iterable[str]) -> Pattern[str]:
+    """
+    Compile glob patterns e.g. ["*.hpp", "*.h"] into one regex.
+
+    Parameters
+    ----------
+    patterns : Iterable[str]
+        The glob patterns
+
+    Returns
+    -------
+    Pattern[str]
+        A regex matching names that match any of the patterns
+    """
+    regexes = [fnmatch.translate(pattern) for pattern in patterns]
+    if not regexes:
+        return re.compile(r"(?!)")
+    return re.compile("|".join(regexes))
+
+
+def read_ignore_file(path: str) -> List[IgnoreRule]:
+    """
+    Read the rules from an ignore file.
+
+    Ignore files hold one glob pattern per line, as in a .gitignore file.
+    Blank lines and lines starting with "#" are skipped. A pattern ending
+    with "/" only matches directories, and a pattern containing another "/"
+    is matched relative to the directory holding the ignore file. Negated
+    patterns starting with "!" are not supported and are skipped.
+
+    Parameters
+    ----------
+    path : str
+        The path to the ignore file
+
+    Returns
+    -------
+    List[IgnoreRule]
+        The rules
+    """
+    base = os.path.dirname(path)
+    rules = []
+    with open(path, "r") as ignore_file:
+        for line in ignore_file:
+            pattern = line.strip()
+            if not pattern or pattern.startswith("#") or pattern.startswith("!"):
+                continue
+
+            directory_only = pattern.endswith("/")
+            pattern = pattern.rstrip("/")
+            anchored = "/" in pattern
+            pattern = pattern.lstrip("/")
+            if not pattern:
+                continue
+
+            rules.append(
+                IgnoreRule(
+                    base=base,
+                    regex=re.compile(fnmatch.translate(pattern)),
+                    anchored=anchored,
+                    directory_only=directory_only,
+                )
+            )
+    return rules
+
+
+def is_ignored(path: str, name: str, is_dir: bool, rules: List[IgnoreRule]) -> bool:
+    """
+    Check if a file or directory matches any ignore rule.
+
+    Parameters
+    ----------
+    path : str
+        The path to the file or directory
+    name : str
+        The file or directory name
+    is_dir : bool
+        Whether the path is a directory
+    rules : List[IgnoreRule]
+        The ignore rules in effect
+
+    Returns
+    -------
+    bool
+        True if the path is ignored
+    """
+    for rule in rules:
+        if rule.directory_only and not is_dir:
+            continue
+        if rule.anchored:
+            target = os.path.relpath(path, rule.base).replace(os.sep, "/")
+        else:
+            target = name
+        if rule.regex.match(target):
+            return True
+    return False
+
+
+def find_source_files(
+    source_root: str,
+    patterns: Iterable[str],
+    restricted_paths: Iterable[str] = (),
+    ignore_file_names: Iterable[str] = (),
+) -> List[str]:
+    """
+    Find the files under a directory that match some glob patterns.
+
+    Directories are walked top-down with os.scandir, following symbolic
+    links. Restricted directories and directories matched by ignore rules
+    are pruned before they are entered, and a directory reached again
+    through a symbolic link cycle is not walked twice. Files with cppwg
+    extensions like .cppwg.hpp are skipped.
+
+    Parameters
+    ----------
+    source_root : str
+        The directory to search
+    patterns : Iterable[str]
+        The glob patterns to match file names with e.g. ["*.hpp"]
+    restricted_paths : Iterable[str]
+        Directories to skip e.g. the wrapper root
+    ignore_file_names : Iterable[str]
+        Names of ignore files to honour in each directory e.g. [".cppwgignore"]
+
+    Returns
+    -------
+    List[str]
+        The absolute paths of the matching files, in walk order
+    """
+    matcher = compile_patterns(patterns)
+    restricted: Set[str] = {
+        os.path.normcase(os.path.abspath(path)) for path in restricted_paths
+    }
+    ignore_file_names = tuple(ignore_file_names)
+
+    file_paths: List[str] = []
+    visited: Set[Tuple[int, int]] = set()
+
+    # Directories to walk, with the ignore rules in effect for each
+    stack: List[Tuple[str, List[IgnoreRule]]] = [(os.path.abspath(source_root), [])]
+    while stack:
+        directory, rules = stack.pop()
+
+        try:
+            stat = os.stat(directory)
+            entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+        except OSError:
+            continue
+
+        # Guard against symbolic link cycles
+        key = (stat.st_dev, stat.st_ino)
+        if key in visited:
+            continue
+        visited.add(key)
+
+        if ignore_file_names:
+            rules = list(rules)
+            for ignore_file_name in ignore_file_names:
+                ignore_path = os.path.join(directory, ignore_file_name)
+                if os.path.isfile(ignore_path):
+                    rules.extend(read_ignore_file(ignore_path))
+
+        subdirectories = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+
+            if is_dir:
+                if os.path.normcase(entry.path) in restricted:
+                    continue
+                if rules and is_ignored(entry.path, entry.name, True, rules):
+                    continue
+                subdirectories.append(entry.path)
+                continue
+
+            if not matcher.match(entry.name):
+                continue
+
+            # Skip files with the extensions like .cppwg.hpp
+            suffix = os.path.splitext(os.path.splitext(entry.name)[0])[1]
+            if suffix == f".{CPPWG_EXT}":
+                continue
+
+            if rules and is_ignored(entry.path, entry.name, False, rules):
+                continue
+
+            file_paths.append(entry.path)
+
+        # Walk subdirectories in name order, after this directory's files
+        for subdirectory in reversed(subdirectories):
+            stack.append((subdirectory, rules))
+
+    return file_paths
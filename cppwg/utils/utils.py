@@ -1,11 +1,11 @@
 """Utility functions for the cppwg package."""
 
 import ast
-import re
 from numbers import Number
 from typing import Any, List, Tuple
 
 from cppwg.utils.constants import CPPWG_ALL_STRING, CPPWG_TRUE_STRINGS
+from cppwg.utils.source_lexer import CppSourceIndex, lex_source
 
 
 def convert_to_bool(value: Any) -> bool:
@@ -72,26 +72,12 @@ def find_classes_in_source(
     List[Tuple[str, str, str]]
         A list of (struct/class, class_name, inheritance) tuples
     """
-    regex = r"\b"
+    source_index = CppSourceIndex.from_source(source)
 
-    if template_signature:
-        signature = strip_source_whitespace(template_signature)
-        regex += r"template\s*" + re.escape(signature) + r"\s*"
-
-    regex += r"(class|struct)\s+"
-
-    if class_name:
-        name = strip_source_whitespace(class_name)
-        regex += r"(" + re.escape(name) + r")"
-    else:
-        regex += r"(\w+)"
-
-    regex += r"\s*(?::\s*([^{;]+))?\s*"  # Inheritance
-    regex += r"\{"  # Start of class body
-
-    classes = re.findall(regex, source)
-
-    return classes
+    return source_index.find_classes(
+        class_name=class_name,
+        template_signature=template_signature,
+    )
 
 
 def find_classes_in_source_file(
@@ -116,21 +102,13 @@ def find_classes_in_source_file(
     List[Tuple[str, str, str]]
         A list of (struct/class, class_name, inheritance) tuples
     """
-    source = read_source_file(
-        source_file_path,
-        strip_comments=True,
-        strip_preprocessor=True,
-        strip_whitespace=True,
-    )
+    source_index = CppSourceIndex.from_file(source_file_path)
 
-    classes = find_classes_in_source(
-        source,
+    return source_index.find_classes(
         class_name=class_name,
         template_signature=template_signature,
     )
 
-    return classes
-
 
 def read_source_file(
     source_file_path: str,
@@ -157,16 +135,15 @@ def read_source_file(
     str
         The source file as a string
     """
-    source = ""
+    with open(source_file_path, "rb") as source_file:
+        source = source_file.read()
 
-    with open(source_file_path, "r") as source_file:
-        source = "\n".join(line.rstrip() for line in source_file)
-
-    source = strip_source(
+    source, _ = lex_source(
         source,
         strip_comments=strip_comments,
         strip_preprocessor=strip_preprocessor,
         strip_whitespace=strip_whitespace,
+        index_classes=False,
     )
 
     return source
@@ -207,6 +184,9 @@ def strip_source(
     """
     Strip elements from a C++ source string.
 
+    The source is stripped in a single pass, which recognizes string and
+    character literals, so e.g. "//" in a string isn't taken as a comment.
+
     Parameters
     ----------
     source_file_path : str
@@ -223,14 +203,13 @@ def strip_source(
     str
         The stripped source string
     """
-    if strip_comments:
-        source = strip_source_comments(source)
-
-    if strip_preprocessor:
-        source = strip_source_preprocessor(source)
-
-    if strip_whitespace:
-        source = strip_source_whitespace(source)
+    source, _ = lex_source(
+        source.encode("utf-8"),
+        strip_comments=strip_comments,
+        strip_preprocessor=strip_preprocessor,
+        strip_whitespace=strip_whitespace,
+        index_classes=False,
+    )
 
     return source
 
@@ -249,10 +228,9 @@ def strip_source_comments(source: str) -> str:
     str
         The source string with comments stripped
     """
-    source = re.sub(r"//.*", "", source)
-    source = re.sub(r"/\*.*?\*/", " ", source, flags=re.DOTALL)
-
-    return source
+    return strip_source(
+        source, strip_comments=True, strip_preprocessor=False, strip_whitespace=False
+    )
 
 
 def strip_source_preprocessor(source: str) -> str:
@@ -269,9 +247,9 @@ def strip_source_preprocessor(source: str) -> str:
     str
         The source string with preprocessor directives stripped
     """
-    source = re.sub(r"#.*", "", source)
-
-    return source
+    return strip_source(
+        source, strip_comments=False, strip_preprocessor=True, strip_whitespace=False
+    )
 
 
 def strip_source_whitespace(source: str) -> str:
@@ -288,8 +266,6 @@ def strip_source_whitespace(source: str) -> str:
     str
         The source string with whitespace stripped
     """
-    source = re.sub(r"[\r\n]", " ", source)
-    source = re.sub(r"\b\s+|\s+\b", " ", source)
-    source = re.sub(r"\B\s+|\s+\B", "", source)
-
-    return source
+    return strip_source(
+        source, strip_comments=False, strip_preprocessor=False, strip_whitespace=True
+    )
@@ -16,20 +16,22 @@ class CppBaseWrapperWriter:
         A dictionary of replacements to use when tidying up C++ declarations
     """
 
+    # Shared by all writers, as a writer is created for every class member
+    tidy_replacements = OrderedDict(
+        [
+            (" ", ""),
+            (",", "_"),
+            ("<", "_lt_"),
+            (">", "_gt_"),
+            ("::", "_"),
+            ("*", "Ptr"),
+            ("&", "Ref"),
+            ("-", "neg"),
+        ]
+    )
+
     def __init__(self, wrapper_templates: Dict[str, str]) -> None:
         self.wrapper_templates = wrapper_templates
-        self.tidy_replacements = OrderedDict(
-            [
-                (" ", ""),
-                (",", "_"),
-                ("<", "_lt_"),
-                (">", "_gt_"),
-                ("::", "_"),
-                ("*", "Ptr"),
-                ("&", "Ref"),
-                ("-", "neg"),
-            ]
-        )
 
     def tidy_name(self, name: str) -> str:
         """
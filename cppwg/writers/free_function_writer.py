@@ -47,10 +47,10 @@ class CppFreeFunctionWrapperWriter(CppBaseWrapperWriter):
         # Pybind11 arg string with or without default values.
         # e.g. without default values: ', py::arg("foo"), py::arg("bar")'
         # e.g. with default values: ', py::arg("foo") = 1, py::arg("bar") = 2'
-        default_args = ""
+        default_args: List[str] = []
         if not self.free_function_info.hierarchy_attribute("exclude_default_args"):
             for arg in self.free_function_info.decls[0].arguments:
-                default_args += f', py::arg("{arg.name}")'
+                default_args.append(f', py::arg("{arg.name}")')
                 if arg.default_value is not None:
                     # Try to convert "(-1)" to "-1" etc.
                     default_value = str(arg.default_value)
@@ -59,14 +59,14 @@ class CppFreeFunctionWrapperWriter(CppBaseWrapperWriter):
                     )
                     if value is not None:
                         default_value = str(value)
-                    default_args += f" = {default_value}"
+                    default_args.append(f" = {default_value}")
 
         # Add the free function wrapper code to the wrapper string
         func_dict = {
             "def_adorn": def_adorn,
             "function_name": self.free_function_info.decls[0].name,
             "function_docs": '" "',
-            "default_args": default_args,
+            "default_args": "".join(default_args),
         }
         wrapper_string = self.wrapper_templates["free_function"].format(**func_dict)
 
@@ -1,11 +1,13 @@
 """Writer for header collection hpp file."""
 
 import os
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 
 from cppwg.info.class_info import CppClassInfo
 from cppwg.info.free_function_info import CppFreeFunctionInfo
 from cppwg.info.package_info import PackageInfo
+from cppwg.utils.constants import CPPWG_EXT
+from cppwg.utils.output_manifest import OutputManifest, write_output
 
 
 class CppHeaderCollectionWriter:
@@ -31,6 +33,8 @@ class CppHeaderCollectionWriter:
             A dictionary of all class info objects
         free_func_dict : Dict[str, CppFreeFunctionInfo]
             A dictionary of all free function info objects
+        output_manifest : Optional[OutputManifest]
+            The manifest to record the generated file in
     """
 
     def __init__(
@@ -38,11 +42,13 @@ class CppHeaderCollectionWriter:
         package_info: PackageInfo,
         wrapper_root: str,
         hpp_collection_file: str,
+        output_manifest: Optional[OutputManifest] = None,
     ):
         self.package_info: PackageInfo = package_info
         self.wrapper_root: str = wrapper_root
         self.hpp_collection_file: str = hpp_collection_file
         self.hpp_collection: str = ""
+        self.output_manifest: Optional[OutputManifest] = output_manifest
 
         # For convenience, collect all class and free function info into dicts keyed by name
         self.class_dict: Dict[str, CppClassInfo] = {}
@@ -69,19 +75,16 @@ class CppHeaderCollectionWriter:
                 return True
         return False
 
-    def write(self) -> None:
-        """Generate the header file output string and write it to file."""
-        # Add the top prefix text
-        prefix_text = self.package_info.hierarchy_attribute("prefix_text")
-        if prefix_text:
-            self.hpp_collection += prefix_text + "\n"
-
-        # Add opening header guard
-        self.hpp_collection += f"#ifndef {self.package_info.name}_HEADERS_HPP_\n"
-        self.hpp_collection += f"#define {self.package_info.name}_HEADERS_HPP_\n"
-
-        self.hpp_collection += "\n// Includes\n"
+    def collect_includes(self) -> List[str]:
+        """
+        Collect the names of the header files to include.
 
+        Returns
+        -------
+        List[str]
+            The header file names, without duplicates
+        """
+        includes: List[str] = []
         seen_files = set()  # Keep track of included files to avoid duplicates
 
         if self.should_include_all():
@@ -89,7 +92,7 @@ class CppHeaderCollectionWriter:
             for filepath in self.package_info.source_hpp_files:
                 filename = os.path.basename(filepath)
                 if filename not in seen_files:
-                    self.hpp_collection += f'#include "{filename}"\n'
+                    includes.append(filename)
                     seen_files.add(filename)
 
         else:
@@ -102,7 +105,7 @@ class CppHeaderCollectionWriter:
 
                     filename = class_info.source_file
                     if filename and filename not in seen_files:
-                        self.hpp_collection += f'#include "{filename}"\n'
+                        includes.append(filename)
                         seen_files.add(filename)
 
                 # Include specific headers needed by free functions
@@ -110,13 +113,22 @@ class CppHeaderCollectionWriter:
                     if free_function_info.source_file_path:
                         filename = os.path.basename(free_function_info.source_file_path)
                         if filename not in seen_files:
-                            self.hpp_collection += f'#include "{filename}"\n'
+                            includes.append(filename)
                             seen_files.add(filename)
 
-        # Add the template instantiations e.g. `template class Foo<2,2>;`
-        # and typdefs e.g. `typedef Foo<2,2> Foo_2_2;`
-        template_instantiations = ""
-        template_typedefs = ""
+        return includes
+
+    def collect_template_instantiations(self) -> List[Tuple[str, str, str]]:
+        """
+        Collect the explicit template instantiations for templated classes.
+
+        Returns
+        -------
+        List[Tuple[str, str, str]]
+            A list of (source file, C++ name, Python name) tuples, one per
+            instantiation e.g. ("Foo.hpp", "Foo<2,2>", "Foo_2_2")
+        """
+        instantiations: List[Tuple[str, str, str]] = []
 
         for module_info in self.package_info.module_collection:
             for class_info in module_info.class_collection:
@@ -135,20 +147,144 @@ class CppHeaderCollectionWriter:
                 py_names = [name.strip() for name in class_info.py_names]
 
                 for cpp_name, py_name in zip(cpp_names, py_names):
-                    template_instantiations += f"template class {cpp_name};\n"
-                    template_typedefs += f"    typedef {cpp_name} {py_name};\n"
+                    instantiations.append((class_info.source_file, cpp_name, py_name))
+
+        return instantiations
+
+    def format_collection(
+        self, includes: List[str], instantiations: List[Tuple[str, str, str]]
+    ) -> str:
+        """
+        Format the contents of a header collection file.
 
-        self.hpp_collection += "\n// Instantiate Template Classes\n"
-        self.hpp_collection += template_instantiations
+        Parameters
+        ----------
+        includes : List[str]
+            The header file names to include
+        instantiations : List[Tuple[str, str, str]]
+            The (source file, C++ name, Python name) template instantiations
 
-        self.hpp_collection += "\n// Typedefs for nicer naming\n"
-        self.hpp_collection += "namespace cppwg\n{\n"
-        self.hpp_collection += template_typedefs
-        self.hpp_collection += "} // namespace cppwg\n"
+        Returns
+        -------
+        str
+            The header collection file contents
+        """
+        hpp_collection: List[str] = []
+
+        # Add the top prefix text
+        prefix_text = self.package_info.hierarchy_attribute("prefix_text")
+        if prefix_text:
+            hpp_collection.append(prefix_text + "\n")
+
+        # Add opening header guard
+        hpp_collection.append(f"#ifndef {self.package_info.name}_HEADERS_HPP_\n")
+        hpp_collection.append(f"#define {self.package_info.name}_HEADERS_HPP_\n")
+
+        hpp_collection.append("\n// Includes\n")
+
+        for filename in includes:
+            hpp_collection.append(f'#include "{filename}"\n')
+
+        # Add the template instantiations e.g. `template class Foo<2,2>;`
+        # and typdefs e.g. `typedef Foo<2,2> Foo_2_2;`
+        template_instantiations: List[str] = []
+        template_typedefs: List[str] = []
+
+        for _, cpp_name, py_name in instantiations:
+            template_instantiations.append(f"template class {cpp_name};\n")
+            template_typedefs.append(f"    typedef {cpp_name} {py_name};\n")
+
+        hpp_collection.append("\n// Instantiate Template Classes\n")
+        hpp_collection.extend(template_instantiations)
+
+        hpp_collection.append("\n// Typedefs for nicer naming\n")
+        hpp_collection.append("namespace cppwg\n{\n")
+        hpp_collection.extend(template_typedefs)
+        hpp_collection.append("} // namespace cppwg\n")
 
         # Add closing header guard
-        self.hpp_collection += f"\n#endif // {self.package_info.name}_HEADERS_HPP_\n"
+        hpp_collection.append(f"\n#endif // {self.package_info.name}_HEADERS_HPP_\n")
+
+        return "".join(hpp_collection)
+
+    def write(self) -> None:
+        """Generate the header file output string and write it to file."""
+        self.hpp_collection = self.format_collection(
+            self.collect_includes(), self.collect_template_instantiations()
+        )
 
         # Write the header collection string to file
-        with open(self.hpp_collection_file, "w") as hpp_file:
-            hpp_file.write(self.hpp_collection)
+        write_output(
+            self.hpp_collection_file, self.hpp_collection, self.output_manifest
+        )
+
+    def write_shards(self, num_shards: int, shard_dir: str) -> List[str]:
+        """
+        Split the header collection into shards that can be parsed in parallel.
+
+        Headers are distributed across the shards to balance their total file
+        size. Each template instantiation and its typedef are placed in the
+        shard that includes the class's source file.
+
+        Parameters
+        ----------
+        num_shards : int
+            The maximum number of shards
+        shard_dir : str
+            The directory to write the shard files to
+
+        Returns
+        -------
+        List[str]
+            The paths to the shard files
+        """
+        includes = self.collect_includes()
+        instantiations = self.collect_template_instantiations()
+
+        # Get file sizes to balance shards
+        file_sizes: Dict[str, int] = {}
+        for filepath in self.package_info.source_hpp_files:
+            filename = os.path.basename(filepath)
+            if filename not in file_sizes:
+                file_sizes[filename] = os.path.getsize(filepath)
+
+        # Assign the largest headers first, each to the smallest shard so far
+        num_shards = max(1, min(num_shards, len(includes)))
+        shard_includes: List[List[str]] = [[] for _ in range(num_shards)]
+        shard_sizes = [0] * num_shards
+        shard_index: Dict[str, int] = {}
+
+        for filename in sorted(includes, key=lambda x: -file_sizes.get(x, 0)):
+            idx = shard_sizes.index(min(shard_sizes))
+            shard_includes[idx].append(filename)
+            shard_sizes[idx] += file_sizes.get(filename, 0)
+            shard_index[filename] = idx
+
+        # Keep the original include order within each shard
+        for shard in shard_includes:
+            shard.sort(key=includes.index)
+
+        shard_instantiations: List[List[Tuple[str, str, str]]] = [
+            [] for _ in range(num_shards)
+        ]
+        for instantiation in instantiations:
+            idx = shard_index.get(instantiation[0], 0)
+            shard_instantiations[idx].append(instantiation)
+
+        shard_paths: List[str] = []
+        for idx in range(num_shards):
+            shard_path = os.path.join(
+                shard_dir,
+                os.path.basename(self.hpp_collection_file).replace(
+                    f".{CPPWG_EXT}.", f".{idx}.{CPPWG_EXT}."
+                ),
+            )
+            with open(shard_path, "w") as hpp_file:
+                hpp_file.write(
+                    self.format_collection(
+                        shard_includes[idx], shard_instantiations[idx]
+                    )
+                )
+            shard_paths.append(shard_path)
+
+        return shard_paths
@@ -0,0 +1,520 @@
+"""Member data shared by the method and constructor wrapper writers."""
+
+import re
+from typing import Any, Dict, FrozenSet, Iterable, List, NamedTuple, Pattern, Tuple
+
+from cppwg.ir.declarations import (
+    CppCalldefDecl,
+    CppClassDecl,
+    CppConstructorDecl,
+    CppMemberFunctionDecl,
+)
+from cppwg.utils import utils
+
+
+class CppMemberEntry(NamedTuple):
+    """
+    Wrapper data for a method or constructor.
+
+    Attributes
+    ----------
+    excluded : bool
+        Whether the member is excluded by the class's exclusion settings
+    arg_types : Tuple[str, ...]
+        The argument types with spaces removed e.g. ("::std::vector<unsignedint>const&",)
+    arg_signature : str
+        The argument types for the wrapper signature e.g. "int, bool"
+    keyword_args : str
+        The keyword args with default values e.g. ', py::arg("i") = 1'
+    call_policy : str
+        The return value policy for methods e.g. ", py::return_value_policy::reference"
+    """
+
+    excluded: bool
+    arg_types: Tuple[str, ...]
+    arg_signature: str
+    keyword_args: str
+    call_policy: str
+
+
+class DefaultValuePattern(NamedTuple):
+    """
+    Substitutions of a template argument into default values.
+
+    Attributes
+    ----------
+    param : str
+        The template parameter e.g. "DIM_A"
+    arg : str
+        The template argument e.g. "2"
+    qualified_regex : Pattern[str]
+        Matches the parameter qualified by the class name e.g. Foo::DIM_A
+    regex : Pattern[str]
+        Matches the parameter on its own e.g. DIM_A
+    """
+
+    param: str
+    arg: str
+    qualified_regex: Pattern[str]
+    regex: Pattern[str]
+
+
+def gather_patterns(values: Iterable[Any]) -> List[str]:
+    """
+    Flatten exclusion patterns gathered from the info tree, removing spaces.
+
+    Each level of the info tree may give a single pattern or a list of them.
+
+    Parameters
+    ----------
+    values : Iterable[Any]
+        The values gathered from the info tree e.g. [["int *"], "double *"]
+
+    Returns
+    -------
+    List[str]
+        The patterns e.g. ["int*", "double*"]
+    """
+    patterns = []
+    for value in values:
+        if isinstance(value, str):
+            value = [value]
+        patterns.extend(pattern.replace(" ", "") for pattern in value)
+    return patterns
+
+
+class CppMemberTable:
+    """
+    Wrapper data for the members of a class template instantiation.
+
+    The exclusion settings and default value substitutions are resolved from
+    the info tree once per class. The entry for each method and constructor
+    is computed on first lookup and reused, so the writers don't rebuild the
+    exclusion lists, normalize types or compile patterns per member. Members
+    are keyed by identity, as compact declarations are unique.
+
+    Attributes
+    ----------
+    class_info : CppClassInfo
+        The class information
+    class_decl : CppClassDecl
+        The class declaration for the instantiation
+    excluded_methods : FrozenSet[str]
+        The names of methods to exclude
+    calldef_excludes : FrozenSet[str]
+        Argument and return types to exclude, with spaces removed
+    return_type_excludes : FrozenSet[str]
+        Return types to exclude, with spaces removed
+    constructor_arg_type_matcher : Optional[Pattern[str]]
+        Matches constructor argument types containing an excluded type
+    constructor_signature_excludes : Tuple[Tuple[str, ...], ...]
+        Constructor argument type patterns to exclude
+    exclude_default_args : bool
+        Whether to leave out default argument values
+    pointer_call_policy : str
+        The return value policy for methods returning pointers
+    reference_call_policy : str
+        The return value policy for methods returning references
+    default_value_patterns : Tuple[DefaultValuePattern, ...]
+        The template argument substitutions for default values
+    """
+
+    def __init__(
+        self, class_info: "CppClassInfo", template_idx: int  # noqa: F821
+    ) -> None:
+        """
+        Resolve the settings for a class template instantiation.
+
+        Parameters
+        ----------
+        class_info : CppClassInfo
+            The class information
+        template_idx : int
+            The index of the template instantiation in the class info
+        """
+        self.class_info: "CppClassInfo" = class_info  # noqa: F821
+        self.class_decl: CppClassDecl = class_info.decls[template_idx]
+
+        self.excluded_methods: FrozenSet[str] = frozenset(
+            class_info.excluded_methods or ()
+        )
+        self.calldef_excludes: FrozenSet[str] = frozenset(
+            gather_patterns(class_info.hierarchy_attribute_gather("calldef_excludes"))
+        )
+        self.return_type_excludes: FrozenSet[str] = frozenset(
+            gather_patterns(
+                class_info.hierarchy_attribute_gather("return_type_excludes")
+            )
+        )
+
+        ctor_arg_type_excludes = gather_patterns(
+            class_info.hierarchy_attribute_gather("constructor_arg_type_excludes")
+        )
+        self.constructor_arg_type_matcher = None
+        if ctor_arg_type_excludes:
+            self.constructor_arg_type_matcher = re.compile(
+                "|".join(re.escape(pattern) for pattern in ctor_arg_type_excludes)
+            )
+
+        self.constructor_signature_excludes: Tuple[Tuple[str, ...], ...] = tuple(
+            tuple(exclude_types)
+            for ex_list in class_info.hierarchy_attribute_gather(
+                "constructor_signature_excludes"
+            )
+            for exclude_types in ex_list
+        )
+
+        self.exclude_default_args: bool = bool(
+            class_info.hierarchy_attribute("exclude_default_args")
+        )
+        self.pointer_call_policy: str = (
+            class_info.hierarchy_attribute("pointer_call_policy") or ""
+        )
+        self.reference_call_policy: str = (
+            class_info.hierarchy_attribute("reference_call_policy") or ""
+        )
+
+        self.default_value_patterns: Tuple[DefaultValuePattern, ...] = ()
+        if class_info.template_params and class_info.template_arg_lists:
+            self.default_value_patterns = tuple(
+                DefaultValuePattern(
+                    param=param,
+                    arg=str(arg),
+                    qualified_regex=re.compile(
+                        f"\\b{re.escape(class_info.name)}::{re.escape(param)}\\b"
+                    ),
+                    regex=re.compile(f"\\b{re.escape(param)}\\b"),
+                )
+                for param, arg in zip(
+                    class_info.template_params,
+                    class_info.template_arg_lists[template_idx],
+                )
+            )
+
+        self._methods: Dict[int, CppMemberEntry] = {}
+        self._constructors: Dict[int, CppMemberEntry] = {}
+
+        # Converted default values, keyed by the (value, integer type) pair
+        self._default_values: Dict[Tuple[str, bool], str] = {}
+
+    def method(self, method_decl: CppMemberFunctionDecl) -> CppMemberEntry:
+        """
+        Get the wrapper data for a method.
+
+        Parameters
+        ----------
+        method_decl : CppMemberFunctionDecl
+            The method declaration
+
+        Returns
+        -------
+        CppMemberEntry
+            The wrapper data
+        """
+        entry = self._methods.get(id(method_decl))
+        if entry is None:
+            entry = self._build_method(method_decl)
+            self._methods[id(method_decl)] = entry
+        return entry
+
+    def constructor(self, ctor_decl: CppConstructorDecl) -> CppMemberEntry:
+        """
+        Get the wrapper data for a constructor.
+
+        Parameters
+        ----------
+        ctor_decl : CppConstructorDecl
+            The constructor declaration
+
+        Returns
+        -------
+        CppMemberEntry
+            The wrapper data
+        """
+        entry = self._constructors.get(id(ctor_decl))
+        if entry is None:
+            entry = self._build_constructor(ctor_decl)
+            self._constructors[id(ctor_decl)] = entry
+        return entry
+
+    def _build_method(self, method_decl: CppMemberFunctionDecl) -> CppMemberEntry:
+        """
+        Compute the wrapper data for a method.
+
+        Parameters
+        ----------
+        method_decl : CppMemberFunctionDecl
+            The method declaration
+
+        Returns
+        -------
+        CppMemberEntry
+            The wrapper data
+        """
+        arg_types = tuple(
+            arg.decl_type.decl_string.replace(" ", "") for arg in method_decl.arguments
+        )
+
+        # Call policy, e.g. "py::return_value_policy::reference"
+        call_policy = ""
+        if method_decl.return_type.is_pointer:
+            if self.pointer_call_policy:
+                call_policy = f", py::return_value_policy::{self.pointer_call_policy}"
+        elif method_decl.return_type.is_reference:
+            if self.reference_call_policy:
+                call_policy = f", py::return_value_policy::{self.reference_call_policy}"
+
+        excluded = self._exclude_method(method_decl, arg_types)
+
+        return CppMemberEntry(
+            excluded=excluded,
+            arg_types=arg_types,
+            arg_signature=self._arg_signature(method_decl),
+            keyword_args="" if excluded else self._keyword_args(method_decl, False),
+            call_policy=call_policy,
+        )
+
+    def _build_constructor(self, ctor_decl: CppConstructorDecl) -> CppMemberEntry:
+        """
+        Compute the wrapper data for a constructor.
+
+        Parameters
+        ----------
+        ctor_decl : CppConstructorDecl
+            The constructor declaration
+
+        Returns
+        -------
+        CppMemberEntry
+            The wrapper data
+        """
+        arg_types = tuple(
+            arg.decl_type.decl_string.replace(" ", "") for arg in ctor_decl.arguments
+        )
+
+        excluded = self._exclude_constructor(ctor_decl, arg_types)
+
+        return CppMemberEntry(
+            excluded=excluded,
+            arg_types=arg_types,
+            arg_signature=self._arg_signature(ctor_decl),
+            keyword_args="" if excluded else self._keyword_args(ctor_decl, True),
+            call_policy="",
+        )
+
+    def _exclude_method(
+        self,
+        method_decl: CppMemberFunctionDecl,
+        arg_types: Tuple[str, ...],
+    ) -> bool:
+        """
+        Check if a method is excluded by the class's exclusion settings.
+
+        Parameters
+        ----------
+        method_decl : CppMemberFunctionDecl
+            The method declaration
+        arg_types : Tuple[str, ...]
+            The argument types with spaces removed
+
+        Returns
+        -------
+        bool
+            True if the method should be excluded
+        """
+        # Skip methods marked for exclusion
+        if method_decl.name in self.excluded_methods:
+            return True
+
+        # Exclude private methods
+        if method_decl.access_type == "private":
+            return True
+
+        # Exclude sub class (e.g. iterator) methods such as:
+        #   class Foo {
+        #     public:
+        #       class FooIterator {
+        if method_decl.parent != self.class_decl:
+            return True
+
+        # Check for excluded return types
+        return_type = method_decl.return_type.decl_string.replace(" ", "")
+        if (
+            return_type in self.calldef_excludes
+            or return_type in self.return_type_excludes
+        ):
+            return True
+
+        # Check for excluded argument patterns
+        for arg, arg_type in zip(method_decl.arguments, arg_types):
+            # e.g. ::std::vector<unsigned int> const & -> ::std::vector<unsigned
+            arg_type_short = arg.decl_type.decl_string.split()[0]
+            if arg_type_short in self.calldef_excludes:
+                return True
+
+            # e.g. ::std::vector<unsigned int> const & -> ::std::vector<unsignedint>const&
+            if arg_type in self.calldef_excludes:
+                return True
+
+        return False
+
+    def _exclude_constructor(
+        self,
+        ctor_decl: CppConstructorDecl,
+        arg_types: Tuple[str, ...],
+    ) -> bool:
+        """
+        Check if a constructor is excluded by the class's exclusion settings.
+
+        Exclusions based on the class hierarchy are checked by the writer.
+
+        Parameters
+        ----------
+        ctor_decl : CppConstructorDecl
+            The constructor declaration
+        arg_types : Tuple[str, ...]
+            The argument types with spaces removed
+
+        Returns
+        -------
+        bool
+            True if the constructor should be excluded
+        """
+        # Exclude sub class (e.g. iterator) constructors such as:
+        #   class Foo {
+        #     public:
+        #       class FooIterator {
+        if ctor_decl.parent != self.class_decl:
+            return True
+
+        # Exclude compiler-added copy constructors e.g. Foo::Foo(Foo const & foo)
+        if ctor_decl.is_copy_constructor and ctor_decl.is_artificial:
+            return True
+
+        for arg_type in arg_types:
+            # Exclude constructors with "iterator" in args
+            if "iterator" in arg_type.lower():
+                return True
+
+            # Exclude constructors with args matching patterns in calldef_excludes
+            if arg_type in self.calldef_excludes:
+                return True
+
+            # Exclude constructors with args matching patterns in
+            # constructor_arg_type_excludes
+            if self.constructor_arg_type_matcher and (
+                self.constructor_arg_type_matcher.search(arg_type)
+            ):
+                return True
+
+        # Exclude constructors matching a signature in constructor_signature_excludes
+        for exclude_types in self.constructor_signature_excludes:
+            if len(exclude_types) != len(arg_types):
+                continue
+
+            if all(
+                exclude_type in arg_type
+                for arg_type, exclude_type in zip(arg_types, exclude_types)
+            ):
+                return True
+
+        return False
+
+    def default_value(self, default_value: str, integer: bool) -> str:
+        """
+        Convert a default argument value for the wrapper code.
+
+        Numeric literals are simplified and template parameters are replaced
+        with the instantiation's arguments. Default values repeat across
+        members, so the converted values are memoized.
+
+        Parameters
+        ----------
+        default_value : str
+            The default value e.g. "(-1)" or "Foo::DIM_A"
+        integer : bool
+            Whether the argument has an integer type
+
+        Returns
+        -------
+        str
+            The converted default value e.g. "-1" or "2"
+        """
+        key = (default_value, integer)
+        converted = self._default_values.get(key)
+        if converted is not None:
+            return converted
+
+        # Try to convert "(-1)" to "-1" etc.
+        converted = default_value
+        value = utils.str_to_num(converted, integer=integer)
+        if value is not None:
+            converted = str(value)
+
+        # Check for template params in default value
+        for pattern in self.default_value_patterns:
+            if pattern.param in converted:
+                # Replace e.g. Foo::DIM_A -> 2
+                converted = pattern.qualified_regex.sub(pattern.arg, converted)
+
+                # Replace e.g. <DIM_A> -> <2>
+                converted = pattern.regex.sub(pattern.arg, converted)
+
+        self._default_values[key] = converted
+        return converted
+
+    @staticmethod
+    def _arg_signature(calldef_decl: CppCalldefDecl) -> str:
+        """
+        Get the argument types for a wrapper signature e.g. "int, bool".
+
+        Parameters
+        ----------
+        calldef_decl : CppCalldefDecl
+            The method or constructor declaration
+
+        Returns
+        -------
+        str
+            The argument types, separated by commas
+        """
+        return ", ".join(arg.decl_type.decl_string for arg in calldef_decl.arguments)
+
+    def _keyword_args(self, calldef_decl: CppCalldefDecl, is_constructor: bool) -> str:
+        """
+        Get the keyword args with default values e.g. ', py::arg("i") = 1'.
+
+        Parameters
+        ----------
+        calldef_decl : CppCalldefDecl
+            The method or constructor declaration
+        is_constructor : bool
+            Whether the declaration is a constructor
+
+        Returns
+        -------
+        str
+            The keyword args
+        """
+        keyword_args: List[str] = []
+        for arg in calldef_decl.arguments:
+            keyword_args.append(f', py::arg("{arg.name}")')
+
+            if arg.default_value is None or self.exclude_default_args:
+                continue
+
+            default_value = self.default_value(
+                str(arg.default_value), "int" in str(arg.decl_type)
+            )
+
+            # Add type if default value is an empty initializer list
+            # Example:
+            # `Foo(std::vector<Bar*> laminas = {})` is equivalent to
+            # `Foo(std::vector<Bar*> laminas = std::vector<Bar*>{})`
+            # which generates `py::arg("laminas") = std::vector<Bar*>{}`
+            if is_constructor and default_value.replace(" ", "") == "{}":
+                default_value = arg.decl_type.nonconst_decl_string + " {}"
+
+            keyword_args.append(f" = {default_value}")
+
+        return "".join(keyword_args)
@@ -1,12 +1,9 @@
 """Wrapper code writer for C++ methods."""
 
-import re
-from typing import Dict
+from typing import Dict, Optional
 
-from pygccxml.declarations import type_traits
-
-from cppwg.utils import utils
 from cppwg.writers.base_writer import CppBaseWrapperWriter
+from cppwg.writers.member_table import CppMemberTable
 
 
 class CppMethodWrapperWriter(CppBaseWrapperWriter):
@@ -19,42 +16,39 @@ class CppMethodWrapperWriter(CppBaseWrapperWriter):
         The class information for the class containing the method
     template_idx: int
         The index of the template in class_info
-    method_decl : [pygccxml.declarations.member_function_t]
-        The pygccxml declaration object for the method
-    class_decl : [pygccxml.declarations.class_t]
+    method_decl : CppMemberFunctionDecl
+        The declaration object for the method
+    class_decl : CppClassDecl
         The class declaration for the class containing the method
     wrapper_templates : Dict[str, str]
         String templates with placeholders for generating wrapper code
     class_py_name : Optional[str]
         The Python name of the class e.g. 'Foo_2_2'
-    template_params: Optional[List[str]]
-        The template params for the class e.g. ['DIM_A', 'DIM_B']
-    template_args: Optional[List[str]]
-        The template args for the class e.g. ['2', '2']
+    member_table : CppMemberTable
+        Wrapper data for the members of the class
     """
 
     def __init__(
         self,
         class_info: "CppClassInfo",  # noqa: F821
         template_idx: int,
-        method_decl: "member_function_t",  # noqa: F821
+        method_decl: "CppMemberFunctionDecl",  # noqa: F821
         wrapper_templates: Dict[str, str],
+        member_table: Optional[CppMemberTable] = None,
     ) -> None:
         super().__init__(wrapper_templates)
 
         self.class_info: "CppClassInfo" = class_info  # noqa: F821
-        self.method_decl: "member_function_t" = method_decl  # noqa: F821
-        self.class_decl: "class_t" = class_info.decls[template_idx]  # noqa: F821
+        self.method_decl: "CppMemberFunctionDecl" = method_decl  # noqa: F821
+        self.class_decl: "CppClassDecl" = class_info.decls[template_idx]  # noqa: F821
 
         self.class_py_name = class_info.py_names[template_idx]
         if self.class_py_name is None:
             self.class_py_name = self.class_decl.name
 
-        self.template_params = class_info.template_params
-
-        self.template_args = None
-        if class_info.template_arg_lists:
-            self.template_args = class_info.template_arg_lists[template_idx]
+        self.member_table: CppMemberTable = member_table
+        if self.member_table is None:
+            self.member_table = CppMemberTable(class_info, template_idx)
 
     def exclude(self) -> bool:
         """
@@ -65,50 +59,7 @@ class CppMethodWrapperWriter(CppBaseWrapperWriter):
         bool
             True if the method should be excluded, False otherwise
         """
-        # Skip methods marked for exclusion
-        if self.class_info.excluded_methods:
-            if self.method_decl.name in self.class_info.excluded_methods:
-                return True
-
-        # Exclude private methods
-        if self.method_decl.access_type == "private":
-            return True
-
-        # Exclude sub class (e.g. iterator) methods such as:
-        #   class Foo {
-        #     public:
-        #       class FooIterator {
-        if self.method_decl.parent != self.class_decl:
-            return True
-
-        # Check for excluded return types
-        calldef_excludes = [
-            x.replace(" ", "")
-            for x in self.class_info.hierarchy_attribute_gather("calldef_excludes")
-        ]
-
-        return_type_excludes = [
-            x.replace(" ", "")
-            for x in self.class_info.hierarchy_attribute_gather("return_type_excludes")
-        ]
-
-        return_type = self.method_decl.return_type.decl_string.replace(" ", "")
-        if return_type in calldef_excludes or return_type in return_type_excludes:
-            return True
-
-        # Check for excluded argument patterns
-        for argument_type in self.method_decl.argument_types:
-            # e.g. ::std::vector<unsigned int> const & -> ::std::vector<unsigned
-            arg_type_short = argument_type.decl_string.split()[0].replace(" ", "")
-            if arg_type_short in calldef_excludes:
-                return True
-
-            # e.g. ::std::vector<unsigned int> const & -> ::std::vector<unsignedint>const&
-            arg_type_full = argument_type.decl_string.replace(" ", "")
-            if arg_type_full in calldef_excludes:
-                return True
-
-        return False
+        return self.member_table.method(self.method_decl).excluded
 
     def generate_wrapper(self) -> str:
         """
@@ -122,8 +73,10 @@ class CppMethodWrapperWriter(CppBaseWrapperWriter):
         str
             The method wrapper code.
         """
+        entry = self.member_table.method(self.method_decl)
+
         # Skip excluded methods
-        if self.exclude():
+        if entry.excluded:
             return ""
 
         # Pybind11 def type e.g. "_static" for def_static()
@@ -143,68 +96,17 @@ class CppMethodWrapperWriter(CppBaseWrapperWriter):
         if self.method_decl.has_const:
             const_adorn = " const"
 
-        # Get the arg signature e.g. "int, bool"
-        arg_types = [t.decl_string for t in self.method_decl.argument_types]
-        arg_signature = ", ".join(arg_types)
-
-        # Keyword args with default values e.g. py::arg("i") = 1
-        keyword_args = ""
-        for arg in self.method_decl.arguments:
-            keyword_args += f', py::arg("{arg.name}")'
-
-            if not (
-                arg.default_value is None
-                or self.class_info.hierarchy_attribute("exclude_default_args")
-            ):
-                # Try to convert "(-1)" to "-1" etc.
-                default_value = str(arg.default_value)
-                value = utils.str_to_num(
-                    default_value, integer="int" in str(arg.decl_type)
-                )
-                if value is not None:
-                    default_value = str(value)
-
-                # Check for template params in default value
-                if self.template_params:
-                    for param, val in zip(self.template_params, self.template_args):
-                        if param in default_value:
-                            # Replace e.g. Foo::DIM_A -> 2
-                            default_value = re.sub(
-                                f"\\b{self.class_info.name}::{param}\\b",
-                                str(val),
-                                default_value,
-                            )
-
-                            # Replace e.g. <DIM_A> -> <2>
-                            default_value = re.sub(
-                                f"\\b{param}\\b", f"{val}", default_value
-                            )
-
-                keyword_args += f" = {default_value}"
-
-        # Call policy, e.g. "py::return_value_policy::reference"
-        call_policy = ""
-        if type_traits.is_pointer(self.method_decl.return_type):
-            ptr_policy = self.class_info.hierarchy_attribute("pointer_call_policy")
-            if ptr_policy:
-                call_policy = f", py::return_value_policy::{ptr_policy}"
-
-        elif type_traits.is_reference(self.method_decl.return_type):
-            ref_policy = self.class_info.hierarchy_attribute("reference_call_policy")
-            if ref_policy:
-                call_policy = f", py::return_value_policy::{ref_policy}"
-
         method_dict = {
             "def_adorn": def_adorn,
             "method_name": self.method_decl.name,
             "return_type": self.method_decl.return_type.decl_string,
             "self_ptr": self_ptr,
-            "arg_signature": arg_signature,
+            "arg_signature": entry.arg_signature,
             "const_adorn": const_adorn,
             "class_py_name": self.class_py_name,
             "method_docs": '" "',
-            "default_args": keyword_args,
-            "call_policy": call_policy,
+            "default_args": entry.keyword_args,
+            "call_policy": entry.call_policy,
         }
         class_method_template = self.wrapper_templates["class_method"]
         wrapper_string = class_method_template.format(**method_dict)
@@ -2,9 +2,11 @@
 
 import logging
 import os
-from typing import Dict
+from typing import Dict, List, Optional
 
+from cppwg.ir.hierarchy import CppClassHierarchy
 from cppwg.utils.constants import CPPWG_EXT, CPPWG_HEADER_COLLECTION_FILENAME
+from cppwg.utils.output_manifest import OutputManifest, write_output
 from cppwg.writers.class_writer import CppClassWrapperWriter
 from cppwg.writers.free_function_writer import CppFreeFunctionWrapperWriter
 
@@ -26,8 +28,12 @@ class CppModuleWrapperWriter:
         String templates with placeholders for generating wrapper code
     wrapper_root : str
         The output directory for the generated wrapper code
+    class_hierarchy : CppClassHierarchy
+        Hierarchy data for the classes being wrapped
+    output_manifest : Optional[OutputManifest]
+        The manifest to record generated files in
 
-    classes : Dict[pygccxml.declarations.class_t, str]
+    classes : Dict[CppClassDecl, str]
         A dictionary of decls and names for all classes to be wrapped in the module
     """
 
@@ -36,14 +42,21 @@ class CppModuleWrapperWriter:
         module_info: "ModuleInfo",  # noqa: F821
         wrapper_templates: Dict[str, str],
         wrapper_root: str,
+        class_hierarchy: Optional[CppClassHierarchy] = None,
+        output_manifest: Optional[OutputManifest] = None,
     ):
         self.module_info: "ModuleInfo" = module_info  # noqa: F821
         self.wrapper_templates: Dict[str, str] = wrapper_templates
         self.wrapper_root: str = wrapper_root
+        self.output_manifest: Optional[OutputManifest] = output_manifest
+
+        self.class_hierarchy: CppClassHierarchy = class_hierarchy
+        if self.class_hierarchy is None:
+            self.class_hierarchy = CppClassHierarchy()
 
         # For convenience, store a dictionary of decl->name pairs for all
         # classes to be wrapped in the module
-        self.classes: Dict["class_t", str] = {}  # noqa: F821
+        self.classes: Dict["CppClassDecl", str] = {}  # noqa: F821
 
         for class_info in self.module_info.class_collection:
             # Skip excluded classes
@@ -75,22 +88,22 @@ class CppModuleWrapperWriter:
         }
         ```
         """
-        cpp_string = ""
+        cpp_parts: List[str] = []
 
         # Add the top prefix text
         prefix_text = self.module_info.hierarchy_attribute("prefix_text")
         if prefix_text:
-            cpp_string += prefix_text + "\n"
+            cpp_parts.append(prefix_text + "\n")
 
         # Add top level includes
-        cpp_string += "#include <pybind11/pybind11.h>\n"
+        cpp_parts.append("#include <pybind11/pybind11.h>\n")
 
         if self.module_info.package_info.common_include_file:
-            cpp_string += f'#include "{CPPWG_HEADER_COLLECTION_FILENAME}"\n'
+            cpp_parts.append(f'#include "{CPPWG_HEADER_COLLECTION_FILENAME}"\n')
 
         # Add outputs from running custom generator code
         if self.module_info.custom_generator_instance:
-            cpp_string += (
+            cpp_parts.append(
                 self.module_info.custom_generator_instance.get_module_pre_code()
             )
 
@@ -102,7 +115,7 @@ class CppModuleWrapperWriter:
 
             for py_name in class_info.py_names:
                 # Example: #include "Foo_2_2.cppwg.hpp"
-                cpp_string += f'#include "{py_name}.{CPPWG_EXT}.hpp"\n'
+                cpp_parts.append(f'#include "{py_name}.{CPPWG_EXT}.hpp"\n')
 
         # Format module name as _packagename_modulename
         full_module_name = (
@@ -110,16 +123,16 @@ class CppModuleWrapperWriter:
         )
 
         # Create the pybind11 module
-        cpp_string += "\nnamespace py = pybind11;\n"
-        cpp_string += f"\nPYBIND11_MODULE({full_module_name}, m)\n"
-        cpp_string += "{\n"
+        cpp_parts.append("\nnamespace py = pybind11;\n")
+        cpp_parts.append(f"\nPYBIND11_MODULE({full_module_name}, m)\n")
+        cpp_parts.append("{\n")
 
         # Add free functions
         for free_function_info in self.module_info.free_function_collection:
             function_writer = CppFreeFunctionWrapperWriter(
                 free_function_info, self.wrapper_templates
             )
-            cpp_string += function_writer.generate_wrapper()
+            cpp_parts.append(function_writer.generate_wrapper())
 
         # Add classes
         for class_info in self.module_info.class_collection:
@@ -129,13 +142,15 @@ class CppModuleWrapperWriter:
 
             for py_name in class_info.py_names:
                 # Example: register_Foo_2_2_class(m);"
-                cpp_string += f"    register_{py_name}_class(m);\n"
+                cpp_parts.append(f"    register_{py_name}_class(m);\n")
 
         # Add code from the module's custom generator
         if self.module_info.custom_generator_instance:
-            cpp_string += self.module_info.custom_generator_instance.get_module_code()
+            cpp_parts.append(
+                self.module_info.custom_generator_instance.get_module_code()
+            )
 
-        cpp_string += "}\n"  # End of the pybind11 module
+        cpp_parts.append("}\n")  # End of the pybind11 module
 
         # Write to /path/to/wrapper_root/modulename/modulename.main.cpp
         module_dir = os.path.join(self.wrapper_root, self.module_info.name)
@@ -146,8 +161,7 @@ class CppModuleWrapperWriter:
             module_dir, f"{full_module_name}.main.{CPPWG_EXT}.cpp"
         )
 
-        with open(module_cpp_file, "w") as out_file:
-            out_file.write(cpp_string)
+        write_output(module_cpp_file, cpp_parts, self.output_manifest)
 
     def write_class_wrappers(self) -> None:
         """Write wrappers for classes in the module."""
@@ -165,6 +179,8 @@ class CppModuleWrapperWriter:
                 class_info,
                 self.wrapper_templates,
                 self.classes,
+                self.class_hierarchy,
+                self.output_manifest,
             )
 
             # Write the class wrappers into /path/to/wrapper_root/modulename/
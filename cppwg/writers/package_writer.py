@@ -1,9 +1,79 @@
 """Wrapper code writer for the package."""
 
-from typing import Dict
+import logging
+import os
+import pickle
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
+from cppwg.ir.hierarchy import CppClassHierarchy
+from cppwg.parsers.parse_cache import PICKLE_RECURSION_LIMIT
+from cppwg.utils.output_manifest import OutputManifest
+from cppwg.writers.class_writer import CppClassWrapperWriter
 from cppwg.writers.module_writer import CppModuleWrapperWriter
 
+# Package state held by each worker process, set by _init_worker
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(package_data: bytes) -> None:
+    """
+    Load the package to write wrappers for in a worker process.
+
+    Parameters
+    ----------
+    package_data : bytes
+        The pickled (package info, wrapper templates) pair
+    """
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), PICKLE_RECURSION_LIMIT))
+
+    package_info, wrapper_templates = pickle.loads(package_data)
+
+    _worker_state["package_info"] = package_info
+    _worker_state["wrapper_templates"] = wrapper_templates
+    _worker_state["class_hierarchy"] = CppClassHierarchy()
+    _worker_state["module_writers"] = {}
+
+
+def _generate_class_wrapper(task: Tuple[int, int, int]) -> Optional[Tuple[str, str]]:
+    """
+    Generate the wrapper code for a class instantiation in a worker process.
+
+    Parameters
+    ----------
+    task : Tuple[int, int, int]
+        The indices of the module, the class in the module and the
+        instantiation in the class
+
+    Returns
+    -------
+    Optional[Tuple[str, str]]
+        The hpp and cpp wrapper code, or None if there is no wrapper
+    """
+    module_idx, class_idx, idx = task
+
+    # The module writer holds the classes wrapped in the module
+    module_writers = _worker_state["module_writers"]
+    if module_idx not in module_writers:
+        module_writers[module_idx] = CppModuleWrapperWriter(
+            _worker_state["package_info"].module_collection[module_idx],
+            _worker_state["wrapper_templates"],
+            "",
+            _worker_state["class_hierarchy"],
+        )
+    module_writer = module_writers[module_idx]
+
+    class_writer = CppClassWrapperWriter(
+        module_writer.module_info.class_collection[class_idx],
+        module_writer.wrapper_templates,
+        module_writer.classes,
+        module_writer.class_hierarchy,
+    )
+    if not class_writer.generate(idx):
+        return None
+    return class_writer.hpp_string, class_writer.cpp_string
+
 
 class CppPackageWrapperWriter:
     """
@@ -17,6 +87,14 @@ class CppPackageWrapperWriter:
         String templates with placeholders for generating wrapper code
     wrapper_root : str
         The output directory for the generated wrapper code
+    class_hierarchy : CppClassHierarchy
+        Hierarchy data for the classes being wrapped
+    jobs : int
+        The number of processes to generate class wrappers with
+    output_manifest : Optional[OutputManifest]
+        The manifest to record generated files in
+    module_names : Optional[List[str]]
+        The names of the modules to write wrappers for; all modules if None
     """
 
     def __init__(
@@ -24,19 +102,140 @@ class CppPackageWrapperWriter:
         package_info: "PackageInfo",  # noqa: F821
         wrapper_templates: Dict[str, str],
         wrapper_root: str,
+        class_hierarchy: Optional[CppClassHierarchy] = None,
+        jobs: int = 1,
+        output_manifest: Optional[OutputManifest] = None,
+        module_names: Optional[List[str]] = None,
     ):
         self.package_info = package_info
         self.wrapper_templates = wrapper_templates
         self.wrapper_root = wrapper_root
+        self.jobs = max(1, jobs)
+        self.output_manifest = output_manifest
+        self.module_names = module_names
+
+        self.class_hierarchy = class_hierarchy
+        if self.class_hierarchy is None:
+            self.class_hierarchy = CppClassHierarchy()
+            self.class_hierarchy.add_package(self.package_info)
+
+    def is_selected(self, module_info: "ModuleInfo") -> bool:  # noqa: F821
+        """
+        Check if wrappers are to be written for a module.
+
+        Parameters
+        ----------
+        module_info : ModuleInfo
+            The module info
+
+        Returns
+        -------
+        bool
+            True if there is no module filter or the module is in it
+        """
+        return self.module_names is None or module_info.name in self.module_names
 
     def write(self) -> None:
         """
         Write all the wrappers required for the package.
         """
+        if self.jobs > 1:
+            self.write_parallel()
+            return
+
         for module_info in self.package_info.module_collection:
+            if not self.is_selected(module_info):
+                continue
+
             module_writer = CppModuleWrapperWriter(
                 module_info,
                 self.wrapper_templates,
                 self.wrapper_root,
+                self.class_hierarchy,
+                self.output_manifest,
             )
             module_writer.write()
+
+    def write_parallel(self) -> None:
+        """
+        Write all the wrappers, generating class wrappers in a process pool.
+
+        The module wrappers are written in this process. Each class template
+        instantiation is a task for the pool; the package is pickled once and
+        loaded by each worker, so tasks and results are just indices and
+        wrapper code. Results are gathered in task order and written here, so
+        the output is the same as for a serial run.
+        """
+        logger = logging.getLogger()
+
+        tasks: List[Tuple[int, int, int]] = []
+        task_writers: List[Tuple[CppClassWrapperWriter, str, str]] = []
+
+        for module_idx, module_info in enumerate(self.package_info.module_collection):
+            if not self.is_selected(module_info):
+                continue
+
+            logger.info(f"Generating wrappers for module {module_info.name}")
+
+            module_writer = CppModuleWrapperWriter(
+                module_info,
+                self.wrapper_templates,
+                self.wrapper_root,
+                self.class_hierarchy,
+                self.output_manifest,
+            )
+            module_writer.write_module_wrapper()
+
+            module_dir = os.path.join(self.wrapper_root, module_info.name)
+            for class_idx, class_info in enumerate(module_info.class_collection):
+                # Skip excluded classes
+                if class_info.excluded:
+                    logger.info(f"Skipping class {class_info.name}")
+                    continue
+
+                logger.info(f"Generating wrappers for class {class_info.name}")
+
+                class_writer = CppClassWrapperWriter(
+                    class_info,
+                    self.wrapper_templates,
+                    module_writer.classes,
+                    self.class_hierarchy,
+                    self.output_manifest,
+                )
+                for idx, class_py_name in enumerate(class_info.py_names):
+                    tasks.append((module_idx, class_idx, idx))
+                    task_writers.append((class_writer, module_dir, class_py_name))
+
+        if not tasks:
+            return
+
+        recursion_limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(recursion_limit, PICKLE_RECURSION_LIMIT))
+        try:
+            package_data = pickle.dumps(
+                (self.package_info, self.wrapper_templates),
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        finally:
+            sys.setrecursionlimit(recursion_limit)
+
+        max_workers = min(self.jobs, len(tasks))
+        chunksize = max(1, len(tasks) // (max_workers * 4))
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(package_data,),
+        ) as executor:
+            results = executor.map(_generate_class_wrapper, tasks, chunksize=chunksize)
+
+            for (class_writer, work_dir, class_py_name), result in zip(
+                task_writers, results
+            ):
+                if result is None:
+                    continue
+
+                hpp_string, cpp_string = result
+                class_writer.hpp_parts = [hpp_string]
+                class_writer.cpp_parts = [cpp_string]
+                class_writer.write_files(work_dir, class_py_name)